@@ -353,11 +353,11 @@ end
 local function BuildItemList()
     currentItems = {}
     
-    if not TierListAddonData or not selectedClass or not selectedSpec then
+    if not selectedClass or not selectedSpec then
         return
     end
     
-    local classData = TierListAddonData[selectedClass]
+    local classData = ADDON_NS.WOWRN:LoadClassData(selectedClass)
     if not classData then return end
     
     local specData = classData[selectedSpec]
@@ -414,8 +414,9 @@ end
 
 local function GetSpecsForClass(classKey)
     local specs = {}
-    if TierListAddonData and TierListAddonData[classKey] then
-        for specKey, _ in pairs(TierListAddonData[classKey]) do
+    local classData = ADDON_NS.WOWRN:LoadClassData(classKey)
+    if classData then
+        for specKey, _ in pairs(classData) do
             table.insert(specs, specKey)
         end
     end
@@ -837,7 +838,7 @@ function CatalogUI:UpdateClassButtons()
     local sortedClasses = {}
     
     for classKey, _ in pairs(CLASS_INFO) do
-        if TierListAddonData and TierListAddonData[classKey] then
+        if ADDON_NS.WOWRN:HasClassData(classKey) then
             table.insert(sortedClasses, classKey)
         end
     end
@@ -1046,9 +1047,10 @@ function CatalogUI:Show()
     
     if not selectedClass and ADDON_NS.WOWRN then
         local playerClass, playerSpec = ADDON_NS.WOWRN:GetPlayerClassSpec()
-        if playerClass and TierListAddonData and TierListAddonData[playerClass] then
+        local classData = ADDON_NS.WOWRN:LoadClassData(playerClass)
+        if classData then
             selectedClass = playerClass
-            if playerSpec and TierListAddonData[playerClass][playerSpec] then
+            if playerSpec and classData[playerSpec] then
                 selectedSpec = playerSpec
             end
         end
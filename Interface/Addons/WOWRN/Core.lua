@@ -101,17 +101,43 @@ function WOWRN:GetPlayerClassSpec()
     return playerClass, playerSpec
 end
 
+function WOWRN:HasClassData(classKey)
+    if TierListAddonData and TierListAddonData[classKey] then
+        return true
+    end
+    return TierListAddonManifest ~= nil and TierListAddonManifest[classKey] ~= nil
+end
+
+function WOWRN:LoadClassData(classKey)
+    if not classKey then return nil end
+    if TierListAddonData and TierListAddonData[classKey] then
+        return TierListAddonData[classKey]
+    end
+
+    local entry = TierListAddonManifest and TierListAddonManifest[classKey]
+    if not entry then return nil end
+
+    local loadAddOn = (C_AddOns and C_AddOns.LoadAddOn) or LoadAddOn
+    loadAddOn(entry.addon)
+
+    return TierListAddonData and TierListAddonData[classKey]
+end
+
 function WOWRN:GetBisInfo(itemId)
-    if not TierListAddonData or not playerClass or not playerSpec then
+    if not playerClass or not playerSpec then
         return nil
     end
 
-    local classData = TierListAddonData[playerClass]
+    local classData = self:LoadClassData(playerClass)
     if not classData then return nil end
 
     local specData = classData[playerSpec]
     if not specData then return nil end
 
+    if specData.item_index then
+        return specData.item_index[itemId]
+    end
+
     local bisInfo = {}
 
     if specData.bis then
@@ -270,7 +296,7 @@ SLASH_WOWRN2 = "/rn"
 SlashCmdList["WOWRN"] = HandleSlashCommand
 
 local function OnPlayerLogin()
-    WOWRN:GetPlayerClassSpec()
+    WOWRN:LoadClassData(WOWRN:GetPlayerClassSpec())
     WOWRNSettings = WOWRNSettings or {}
     WOWRNSettings.enableTooltips = WOWRNSettings.enableTooltips ~= false
     if ADDON_NS.MinimapButton then
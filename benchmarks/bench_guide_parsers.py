@@ -0,0 +1,57 @@
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from benchmarks.legacy_parsers import LegacyRegexParsers
+from benchmarks.synthetic import generate_spec
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+
+def _time_per_spec(parse: Callable[[str, dict], object], specs, repeat: int) -> float:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for markup, mapping in specs:
+            parse(markup, mapping)
+        samples.append((time.perf_counter() - start) / len(specs))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark guide markup parsers.")
+    parser.add_argument("--specs", type=int, default=39)
+    parser.add_argument("--filler", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    specs = [
+        generate_spec(seed, filler_paragraphs=args.filler) for seed in range(args.specs)
+    ]
+    store = ItemStore(":memory:")
+    current = WowheadScraper(item_store=store)
+    legacy = LegacyRegexParsers(item_store=store)
+
+    def parse_current(markup, mapping):
+        current._parse_bis_items(markup, mapping)
+        current._parse_cartel_chips(markup, mapping)
+        current._parse_trinkets(markup, mapping)
+
+    def parse_legacy(markup, mapping):
+        legacy._parse_bis_items(markup, mapping)
+        legacy._parse_cartel_chips(markup, mapping)
+        legacy._parse_trinkets(markup, mapping)
+
+    size = sum(len(markup) for markup, _ in specs) / len(specs)
+    legacy_time = _time_per_spec(parse_legacy, specs, args.repeat)
+    current_time = _time_per_spec(parse_current, specs, args.repeat)
+
+    print(f"{args.specs} specs, {size / 1024:.0f} KiB markup per spec")
+    print(f"  legacy parsers:  {legacy_time * 1000:8.2f} ms/spec")
+    print(f"  precompiled:     {current_time * 1000:8.2f} ms/spec")
+    print(f"  speedup:         {legacy_time / current_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from benchmarks import corpus
+from benchmarks.legacy_parsers import LegacyRegexParsers
+from benchmarks.synthetic import generate_guide_page, generate_spec
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+
+def _time_per_page(extract: Callable[[str], object], pages, repeat: int) -> float:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            extract(html)
+        samples.append((time.perf_counter() - start) / len(pages))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark guide page extraction (markup and item names)."
+    )
+    parser.add_argument("--source", choices=("synthetic", "corpus"), default="corpus")
+    parser.add_argument("--corpus", default=corpus.CORPUS_DIR)
+    parser.add_argument("--specs", type=int, default=39)
+    parser.add_argument("--filler", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    recorded = corpus.load(args.corpus) if args.source == "corpus" else None
+    if recorded:
+        pages = list(recorded[0].values())
+        source = f"recorded corpus {args.corpus}"
+    else:
+        if args.source == "corpus":
+            print(f"No corpus at {args.corpus}, using synthetic pages.")
+        pages = [
+            generate_guide_page(*generate_spec(seed, filler_paragraphs=args.filler))
+            for seed in range(args.specs)
+        ]
+        source = "synthetic pages"
+
+    store = ItemStore(":memory:")
+    scanner = WowheadScraper(item_store=store)
+    legacy = LegacyRegexParsers(item_store=store)
+    mismatches = sum(
+        scanner._scan_page(html) != legacy._scan_page(html) for html in pages
+    )
+
+    size = sum(len(html) for html in pages) / len(pages)
+    legacy_time = _time_per_page(legacy._scan_page, pages, args.repeat)
+    scanner_time = _time_per_page(scanner._scan_page, pages, args.repeat)
+
+    print(f"{len(pages)} {source}, {size / 1024:.0f} KiB per page")
+    print(f"  regex passes:    {legacy_time * 1000:8.2f} ms/page")
+    print(f"  single scanner:  {scanner_time * 1000:8.2f} ms/page")
+    print(f"  speedup:         {legacy_time / scanner_time:8.2f}x")
+    print(f"  differing pages: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from wowrn_scraper.config import WOW_CLASSES
+from wowrn_scraper.infrastructure.http_client import HttpClient
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+from wowrn_scraper.infrastructure.wowhead_scraper import (
+    ITEM_LINK_PATTERN,
+    WowheadScraper,
+)
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+MANIFEST = "manifest.json"
+
+Pages = Dict[str, str]
+
+
+def _store_page(directory: str, path: str, body: str) -> str:
+    name = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16] + ".html.gz"
+    with gzip.open(os.path.join(directory, name), "wt", encoding="utf-8") as f:
+        f.write(body)
+    return name
+
+
+def record(
+    class_specs: Dict[str, List[str]],
+    http_client: HttpClient,
+    directory: str = CORPUS_DIR,
+    item_limit: int = 200,
+) -> Dict:
+    os.makedirs(directory, exist_ok=True)
+    wowhead = WowheadScraper(http_client=http_client, item_store=ItemStore(":memory:"))
+    wowdb = WowdbScraper(item_store=ItemStore(":memory:"), http_client=http_client)
+    manifest: Dict = {"recorded_at": time.time(), "guides": {}, "items": {}}
+    item_ids: Dict[str, None] = {}
+
+    for class_name, specs in class_specs.items():
+        for spec_name in specs:
+            url = f"{wowhead.BASE_URL}/{class_name}/{spec_name}/bis-gear"
+            html = wowhead._get_html(url)
+            if not html:
+                continue
+            path = urlsplit(url).path
+            manifest["guides"][path] = _store_page(directory, path, html)
+            markup = wowhead._extract_guide_markup(html) or ""
+            item_ids.update(dict.fromkeys(ITEM_LINK_PATTERN.findall(markup)))
+            print(f"Recorded {path}")
+
+    for item_id in list(item_ids)[:item_limit]:
+        try:
+            html = wowdb._fetch_item_page(item_id)
+        except requests.RequestException as e:
+            print(f"Skipped item {item_id}: {e}")
+            continue
+        if html:
+            path = f"/items/{item_id}"
+            manifest["items"][path] = _store_page(directory, path, html)
+
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(
+        f"Recorded {len(manifest['guides'])} guides and "
+        f"{len(manifest['items'])} item pages to {directory}"
+    )
+    return manifest
+
+
+def load(directory: str = CORPUS_DIR) -> Optional[Tuple[Pages, Pages, List[str]]]:
+    manifest_path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    def read(entries: Dict[str, str]) -> Pages:
+        pages: Pages = {}
+        for path, name in entries.items():
+            with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as f:
+                pages[path] = f.read()
+        return pages
+
+    items = read(manifest["items"])
+    return read(manifest["guides"]), items, [p.rsplit("/", 1)[1] for p in items]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record a benchmark page corpus.")
+    parser.add_argument("--classes", nargs="*", default=list(WOW_CLASSES))
+    parser.add_argument("--item-limit", type=int, default=200)
+    parser.add_argument("--output", default=CORPUS_DIR)
+    args = parser.parse_args()
+
+    http_client = HttpClient(
+        headers=WowheadScraper.HEADERS,
+        rate_limiter=HostRateLimiter(min_interval=1.0),
+    )
+    class_specs = {name: WOW_CLASSES[name] for name in args.classes}
+    record(class_specs, http_client, args.output, args.item_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import corpus
+from benchmarks.stand_in_server import StandInServer
+from benchmarks.synthetic import generate_site
+from wowrn_scraper.config import WOW_CLASSES
+from wowrn_scraper.domain.models import ScrapingResult, SpecData
+from wowrn_scraper.infrastructure.http_client import HttpClient
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.json_adapter import JsonStorageAdapter
+from wowrn_scraper.infrastructure.lua_adapter import LuaStorageAdapter
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+from wowrn_scraper.infrastructure.wowhead_scraper import (
+    WowheadScraper,
+    parse_guide_page,
+)
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+
+def _median_time(stage: Callable[[], object], repeat: int) -> float:
+    samples: List[float] = []
+    for _ in range(repeat):
+        with redirect_stdout(StringIO()):
+            start = time.perf_counter()
+            stage()
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_suite(
+    guides: Dict[str, str],
+    items: Dict[str, str],
+    item_ids: List[str],
+    latency: float = 0.0,
+    throttle_rate: float = 0.0,
+    repeat: int = 3,
+    workers: int = 4,
+) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    with StandInServer({**guides, **items}, latency, throttle_rate) as server:
+        http_client = HttpClient(rate_limiter=HostRateLimiter(min_interval=0.0))
+        wowhead = WowheadScraper(
+            http_client=http_client, item_store=ItemStore(":memory:")
+        )
+        wowhead.BASE_URL = f"{server.url}/guide/classes"
+        urls = [f"{server.url}{path}" for path in guides]
+        pages: List[str] = []
+
+        def fetch() -> None:
+            pages[:] = [html for html in map(wowhead._get_html, urls) if html]
+
+        timings["fetch"] = _median_time(fetch, repeat)
+
+        parsed: List[SpecData] = []
+
+        def parse() -> None:
+            parsed.clear()
+            for path, html in zip(guides, pages):
+                _, _, _, class_name, spec_name, _ = path.split("/")
+                markup = wowhead._extract_guide_markup(html) or ""
+                mapping = wowhead._extract_item_mapping(html)
+                parsed.append(
+                    SpecData(
+                        class_name=class_name,
+                        spec_name=spec_name,
+                        bis_lists=wowhead._parse_bis_items(markup, mapping),
+                        cartel_chips=wowhead._parse_cartel_chips(markup, mapping),
+                        trinket_tier_list=wowhead._parse_trinkets(markup, mapping),
+                    )
+                )
+
+        timings["parse"] = _median_time(parse, repeat)
+        timings["parse_per_spec"] = timings["parse"] / max(len(pages), 1)
+
+        jobs = [path.split("/")[3:5] for path in guides]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(abs, range(workers)))
+
+            def parse_processes() -> None:
+                list(
+                    pool.map(
+                        parse_guide_page,
+                        [class_name for class_name, _ in jobs],
+                        [spec_name for _, spec_name in jobs],
+                        urls,
+                        pages,
+                    )
+                )
+
+            timings["parse_processes"] = _median_time(parse_processes, repeat)
+
+        known_ids = set(item_ids)
+        enrich_items = [
+            item
+            for spec_data in parsed
+            for item in spec_data.iter_items()
+            if item.id in known_ids
+        ]
+
+        def enrich() -> None:
+            wowdb = WowdbScraper(
+                item_store=ItemStore(":memory:"),
+                batch_size=workers,
+                batch_delay=0.0,
+                http_client=http_client,
+            )
+            wowdb.BASE_URL = f"{server.url}/items"
+            wowdb.enrich_items_batch(enrich_items)
+
+        timings["enrich"] = _median_time(enrich, repeat)
+        http_client.close()
+
+    result = ScrapingResult()
+    for spec_data in parsed:
+        result.add_spec_data(spec_data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        adapters = {
+            "serialize_json": (JsonStorageAdapter(), "pve_data.json"),
+            "serialize_lua": (
+                LuaStorageAdapter(compact=True, item_index=True, normalized=True),
+                "Data.lua",
+            ),
+        }
+        for name, (adapter, filename) in adapters.items():
+            path = os.path.join(directory, filename)
+            timings[name] = _median_time(lambda: adapter.save(result, path), repeat)
+    print(describe_lua_sizes(lua_layout_sizes(result)))
+
+    return timings
+
+
+def lua_layout_sizes(result: ScrapingResult) -> Dict[str, int]:
+    adapter = LuaStorageAdapter(compact=True, item_index=True)
+    data_dict = result.to_dict()
+    sizes: Dict[str, int] = {}
+    for name, normalized in (("nested", False), ("normalized", True)):
+        chunks: List[str] = []
+        adapter._write_document(chunks.append, data_dict, normalized)
+        sizes[name] = len("".join(chunks).encode("utf-8"))
+    return sizes
+
+
+def describe_lua_sizes(sizes: Dict[str, int]) -> str:
+    nested, normalized = sizes["nested"], sizes["normalized"]
+    change = 100.0 * abs(nested - normalized) / nested if nested else 0.0
+    direction = "smaller" if normalized <= nested else "larger"
+    return (
+        f"Lua output: {normalized} bytes normalized vs {nested} bytes nested "
+        f"({change:.1f}% {direction})"
+    )
+
+
+def find_regressions(
+    timings: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> Dict[str, float]:
+    return {
+        name: timings[name] / previous
+        for name, previous in baseline.items()
+        if name in timings and previous > 0 and timings[name] / previous > tolerance
+    }
+
+
+def load_baseline(path: str) -> Optional[Dict[str, float]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the offline scraper benchmarks.")
+    parser.add_argument(
+        "--source", choices=["synthetic", "corpus"], default="synthetic"
+    )
+    parser.add_argument("--pool", type=int, default=2000)
+    parser.add_argument("--bis-rows", type=int, default=16)
+    parser.add_argument("--filler", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    if args.source == "corpus":
+        recorded = corpus.load()
+        if not recorded:
+            sys.exit("No recorded corpus found, run: python -m benchmarks.corpus")
+        guides, items, item_ids = recorded
+    else:
+        guides, items, item_ids = generate_site(
+            WOW_CLASSES,
+            pool=args.pool,
+            bis_rows=args.bis_rows,
+            filler_paragraphs=args.filler,
+        )
+
+    print(f"{len(guides)} guide pages, {len(items)} item pages ({args.source})")
+    timings = run_suite(
+        guides, items, item_ids, args.latency, args.throttle_rate, args.repeat
+    )
+    baseline = load_baseline(args.baseline)
+
+    for name, seconds in timings.items():
+        line = f"  {name:<16} {seconds * 1000:10.2f} ms"
+        if baseline and baseline.get(name):
+            line += f"  ({seconds / baseline[name]:5.2f}x baseline)"
+        print(line)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(timings, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if baseline is None:
+        print("No baseline recorded yet, run again with --save-baseline")
+        return
+
+    regressions = find_regressions(timings, baseline, args.tolerance)
+    for name, ratio in regressions.items():
+        print(f"REGRESSION {name}: {ratio:.2f}x slower than baseline")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import json
+import random
+from typing import Dict, List, Optional, Tuple
+
+SLOTS = [
+    "Head",
+    "Neck",
+    "Shoulders",
+    "Back",
+    "Chest",
+    "Wrists",
+    "Hands",
+    "Waist",
+    "Legs",
+    "Feet",
+    "Ring",
+    "Ring",
+    "Trinket",
+    "Trinket",
+    "Main Hand",
+    "Off Hand",
+]
+TIERS = ["S", "A", "B", "C", "D"]
+WORDS = [
+    "crown",
+    "of",
+    "the",
+    "void",
+    "titan",
+    "gloom",
+    "reaver",
+    "spire",
+    "band",
+    "ember",
+    "frost",
+    "whisper",
+]
+
+
+def item_name(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 4)))
+
+
+def item_ids(rng: random.Random, count: int, pool: int) -> List[str]:
+    return [str(200000 + rng.randrange(pool)) for _ in range(count)]
+
+
+def _bis_table(rng: random.Random, rows: int, pool: int) -> str:
+    lines = ["[table][tr][td header]Slot[/td][td header]Item[/td][/tr]"]
+    for slot, iid in zip(rng.choices(SLOTS, k=rows), item_ids(rng, rows, pool)):
+        if rng.random() < 0.8:
+            slot_cell = f"[b]{slot}[/b]"
+        else:
+            slot_cell = f"[color=q5]{slot}[/color]"
+        lines.append(
+            f"[tr][td]{slot_cell}[/td][td][item={iid} bonus=1] "
+            f"[url=item={iid}/x]link[/url][/td][td]Source text[/td][/tr]"
+        )
+    lines.append("[/table]")
+    return "\n".join(lines)
+
+
+def generate_guide_markup(
+    rng: random.Random,
+    bis_rows: int = 16,
+    trinkets_per_tier: int = 5,
+    chips: int = 6,
+    pool: int = 400,
+    filler_paragraphs: int = 20,
+    cartel_style: Optional[str] = "toc",
+) -> str:
+    filler = "\n".join(
+        f"[p]Paragraph {n} about [b]stat priority[/b] and [item={iid}].[/p]"
+        for n, iid in enumerate(item_ids(rng, filler_paragraphs, pool))
+    )
+    parts = [
+        '[h2 toc="Overview"]Overview[/h2]',
+        filler,
+        '[h2 toc="Best in Slot"]Best in Slot Gear[/h2]',
+        "[tabs name=bis_items]",
+    ]
+    for context in ["Overall", "Raid", "Mythic+", "Delves"]:
+        parts.append(f'[tab name="{context}" icon=x]')
+        parts.append(_bis_table(rng, bis_rows, pool))
+        parts.append("[/tab]")
+    parts.append("[/tabs]")
+
+    if cartel_style:
+        list_tag = rng.choice(["ol", "ul"])
+        entries = "\n".join(
+            f"[li][item={iid}] - great for [b]burst[/b][/li]"
+            for iid in item_ids(rng, chips, pool)
+        )
+        heading = {
+            "toc": '[h2 toc="Puzzling Cartel Chips"]Puzzling Cartel Chips[/h2]',
+            "title": "[h2]Puzzling Cartel Chips[/h2]",
+            "text": "[h3]Choosing a Cartel Chip[/h3]",
+        }[cartel_style]
+        parts.append(heading)
+        parts.append(f"Pick these chips:\n[{list_tag}]\n{entries}\n[/{list_tag}]")
+
+    parts.append('[h2 toc="Trinkets"]Trinkets[/h2]')
+    parts.append("[tier-list=rows]")
+    for tier in TIERS:
+        icons = "".join(
+            f"[icon-badge=q4][item={iid}][/icon-badge]"
+            for iid in item_ids(rng, trinkets_per_tier, pool)
+        )
+        parts.append(
+            f"[tier][tier-label bg=q{TIERS.index(tier)}]{tier}[/tier-label]"
+            f"[tier-content]{icons}[/tier-content][/tier]"
+        )
+    parts.append("[/tier-list]")
+    parts.append('[h2 toc="Enchants"]Enchants[/h2]')
+    parts.append(filler)
+    return "\n".join(parts)
+
+
+def generate_item_mapping(markup: str, rng: random.Random) -> Dict[str, str]:
+    mapping: Dict[str, str] = {}
+    start = markup.find("[item=")
+    while start >= 0:
+        end = start + 6
+        while end < len(markup) and markup[end].isdigit():
+            end += 1
+        mapping.setdefault(markup[start + 6 : end], item_name(rng))
+        start = markup.find("[item=", end)
+    return mapping
+
+
+def generate_spec(seed: int, **options) -> Tuple[str, Dict[str, str]]:
+    rng = random.Random(seed)
+    markup = generate_guide_markup(rng, **options)
+    return markup, generate_item_mapping(markup, rng)
+
+
+BOSSES = ["Vexie", "Stix", "Gallywix", "Mug'Zee", "Rik Reverb", "Sprocketmonger"]
+LOCATIONS = ["Liberation of Undermine", "Operation: Floodgate", "The Rookery"]
+
+
+def generate_guide_page(markup: str, mapping: Dict[str, str]) -> str:
+    gatherer = json.dumps({iid: {"name_enus": name} for iid, name in mapping.items()})
+    body = markup.replace('"', '\\"').replace("/", "\\/").replace("\n", "\\n")
+    return (
+        "<html><head><title>BiS Gear</title></head><body>\n"
+        f"<script>WH.Gatherer.addData(3, 1, {gatherer});</script>\n"
+        f'<script>WH.markup.printHtml("{body}", "guide-body", {{}});</script>\n'
+        "</body></html>"
+    )
+
+
+def generate_item_page(item_id: str, rng: random.Random) -> str:
+    if rng.random() < 0.8:
+        extra = (
+            f'<dd class="item-extra">Dropped by <b>{rng.choice(BOSSES)}</b> - '
+            f"{rng.choice(LOCATIONS)}.</dd>"
+        )
+    else:
+        extra = '<dd class="item-extra">Sold by a vendor.</dd>'
+    return (
+        f"<html><body><h1>Item {item_id}</h1><dl>{extra}</dl>"
+        f"<p>{' '.join(rng.choices(WORDS, k=200))}</p></body></html>"
+    )
+
+
+def generate_site(
+    class_specs: Dict[str, List[str]], seed: int = 0, **options
+) -> Tuple[Dict[str, str], Dict[str, str], List[str]]:
+    rng = random.Random(seed)
+    guides: Dict[str, str] = {}
+    items: Dict[str, str] = {}
+    for class_name, specs in class_specs.items():
+        for spec_name in specs:
+            markup = generate_guide_markup(rng, **options)
+            mapping = generate_item_mapping(markup, rng)
+            path = f"/guide/classes/{class_name}/{spec_name}/bis-gear"
+            guides[path] = generate_guide_page(markup, mapping)
+            for item_id in mapping:
+                if f"/items/{item_id}" not in items:
+                    items[f"/items/{item_id}"] = generate_item_page(item_id, rng)
+    return guides, items, sorted(path.rsplit("/", 1)[1] for path in items)
@@ -0,0 +1,4 @@
+from wowrn_scraper.run_scrapers import main
+
+if __name__ == "__main__":
+    main()
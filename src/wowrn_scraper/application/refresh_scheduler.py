@@ -0,0 +1,208 @@
+import hashlib
+import json
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.domain.models import ItemRecord, ScrapingResult, SpecData
+from wowrn_scraper.domain.ports import (
+    ItemRefresherPort,
+    RefreshStatePort,
+    RequestBudgetPort,
+)
+
+HOUR = 60 * 60
+
+
+class RefreshPolicy:
+    def __init__(self, min_age: float, max_age: float) -> None:
+        self.min_age = min_age
+        self.max_age = max(min_age, max_age)
+
+    def target_age(self, checks: int, changes: int) -> float:
+        volatility = (changes + 1) / (checks + 2)
+        return max(self.min_age, self.max_age * (1 - volatility))
+
+    def priority(
+        self, last_success: Optional[float], checks: int, changes: int, now: float
+    ) -> float:
+        if last_success is None:
+            return math.inf
+        return (now - last_success) / self.target_age(checks, changes)
+
+
+def spec_digest(spec_data: SpecData) -> str:
+    if spec_data.markup_hash:
+        return spec_data.markup_hash
+    payload = json.dumps(spec_data.to_dict(), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        service: ScraperService,
+        class_specs: Dict[str, List[str]],
+        output_paths: List[str],
+        state: RefreshStatePort,
+        result: Optional[ScrapingResult] = None,
+        policy: Optional[RefreshPolicy] = None,
+        item_refresher: Optional[ItemRefresherPort] = None,
+        item_policy: Optional[RefreshPolicy] = None,
+        item_batch: int = 10,
+        budget: Optional[RequestBudgetPort] = None,
+        idle_interval: float = 60.0,
+        on_spec: Optional[Callable[[SpecData], None]] = None,
+        on_unit: Optional[Callable[[], None]] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.service = service
+        self.class_specs = class_specs
+        self.output_paths = output_paths
+        self.state = state
+        self.result = result or ScrapingResult()
+        self.policy = policy or RefreshPolicy(min_age=0.5 * HOUR, max_age=12 * HOUR)
+        self.item_refresher = item_refresher
+        self.item_policy = item_policy or RefreshPolicy(
+            min_age=6 * HOUR, max_age=7 * 24 * HOUR
+        )
+        self.item_batch = max(1, item_batch)
+        self.budget = budget
+        self.idle_interval = idle_interval
+        self.on_spec = on_spec
+        self.on_unit = on_unit
+        self.clock = clock
+        self.sleep = sleep
+        self._item_attempts: Dict[str, float] = {}
+
+    def due_specs(self, now: float) -> List[Tuple[str, str]]:
+        ranked = []
+        for class_name, spec_names in self.class_specs.items():
+            for spec_name in spec_names:
+                state = self.state.get(f"{class_name}/{spec_name}")
+                last_attempt = state["last_attempt"]
+                if last_attempt is not None and (
+                    now - last_attempt < self.policy.min_age
+                ):
+                    continue
+                priority = self.policy.priority(
+                    state["last_success"], state["checks"], state["changes"], now
+                )
+                if priority >= 1:
+                    ranked.append((priority, class_name, spec_name))
+        ranked.sort(key=lambda entry: entry[0], reverse=True)
+        return [(class_name, spec_name) for _, class_name, spec_name in ranked]
+
+    def due_items(self, now: float) -> List[str]:
+        if self.item_refresher is None:
+            return []
+        min_age = self.item_policy.min_age
+        item_ids = [
+            item_id
+            for item_id in self._records()
+            if now - self._item_attempts.get(item_id, -math.inf) >= min_age
+        ]
+        history = self.item_refresher.loot_history(item_ids)
+        ranked = []
+        for item_id in item_ids:
+            checked_at, checks, changes = history.get(item_id, (None, 0, 0))
+            priority = self.item_policy.priority(checked_at, checks, changes, now)
+            if priority >= 1:
+                ranked.append((priority, item_id))
+        ranked.sort(key=lambda entry: entry[0], reverse=True)
+        return [item_id for _, item_id in ranked[: self.item_batch]]
+
+    def run_once(self) -> float:
+        if self.budget is not None:
+            wait = self.budget.wait_time()
+            if wait > 0:
+                print(f"Hourly request budget spent, waiting {wait:.0f}s.")
+                return wait
+
+        now = self.clock()
+        specs = self.due_specs(now)
+        if specs:
+            self.refresh_spec(*specs[0])
+            return 0.0
+        item_ids = self.due_items(now)
+        if item_ids:
+            self.refresh_items(item_ids)
+            return 0.0
+        return self.idle_interval
+
+    def run(self, max_units: Optional[int] = None) -> int:
+        units = 0
+        while max_units is None or units < max_units:
+            wait = self.run_once()
+            if wait > 0:
+                self.sleep(wait)
+            else:
+                units += 1
+        return units
+
+    def refresh_spec(self, class_name: str, spec_name: str) -> Optional[SpecData]:
+        key = f"{class_name}/{spec_name}"
+        print(f"\nRefreshing {key}...")
+        now = self.clock()
+        try:
+            partial = self.service.collect({class_name: [spec_name]})
+        except Exception as e:
+            print(f"Refreshing {key} failed: {e}")
+            self.state.record_failure(key, now)
+            self.state.save()
+            return None
+
+        spec_data = partial.specs[class_name][spec_name]
+        if spec_data.error:
+            self.state.record_failure(key, now)
+        else:
+            if self.state.record_success(key, spec_digest(spec_data), now):
+                print(f"{key} changed since its last refresh.")
+            if self.on_spec is not None and not spec_data.reused:
+                self.on_spec(spec_data)
+        self.result.merge(partial)
+        self._save()
+        return spec_data
+
+    def refresh_items(self, item_ids: List[str]) -> Dict[str, Dict]:
+        print(f"\nRefreshing {len(item_ids)} cached items...")
+        now = self.clock()
+        for item_id in item_ids:
+            self._item_attempts[item_id] = now
+        refreshed = self.item_refresher.refresh_items(item_ids)
+
+        records = self._records()
+        for item_id, info in refreshed.items():
+            for record in records.get(item_id, []):
+                record.update_loot(info)
+        self._save()
+        return refreshed
+
+    def _records(self) -> Dict[str, List[ItemRecord]]:
+        records: Dict[str, Dict[int, ItemRecord]] = {}
+        for specs in self.result.specs.values():
+            for spec_data in specs.values():
+                for record in spec_data.iter_records():
+                    records.setdefault(record.id, {})[id(record)] = record
+        return {item_id: list(found.values()) for item_id, found in records.items()}
+
+    def ordered_result(self) -> ScrapingResult:
+        ordered = ScrapingResult()
+        class_names = list(self.class_specs)
+        class_names += [name for name in self.result.specs if name not in class_names]
+        for class_name in class_names:
+            specs = self.result.specs.get(class_name, {})
+            spec_names = list(self.class_specs.get(class_name, []))
+            spec_names += [name for name in specs if name not in spec_names]
+            for spec_name in spec_names:
+                if spec_name in specs:
+                    ordered.add_spec_data(specs[spec_name])
+        return ordered
+
+    def _save(self) -> None:
+        self.service.save(self.ordered_result(), self.output_paths)
+        self.state.save()
+        if self.on_unit is not None:
+            self.on_unit()
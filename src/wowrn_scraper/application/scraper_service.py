@@ -1,31 +1,221 @@
-from typing import Dict, List
+import io
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext, redirect_stdout
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple, TypeVar
 
-from wowrn_scraper.domain.models import ScrapingResult
-from wowrn_scraper.domain.ports import ScraperPort, StoragePort
+from wowrn_scraper.application.source_registry import SourceRegistry
+from wowrn_scraper.domain.models import ScrapingResult, SpecData
+from wowrn_scraper.domain.ports import (
+    EnricherPort,
+    MetricsPort,
+    ScraperPort,
+    StoragePort,
+)
+
+T = TypeVar("T")
+SourceJob = Tuple[str, str, str]
+
+
+class _PerThreadOutput(io.TextIOBase):
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self.buffers: Dict[int, io.StringIO] = {}
+
+    def write(self, text: str) -> int:
+        return self.buffers.get(threading.get_ident(), self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
 
 
 class ScraperService:
     def __init__(
         self,
-        scraper: ScraperPort,
+        scraper: Optional[ScraperPort],
         storage_adapters: List[StoragePort],
+        max_workers: int = 1,
+        metrics: Optional[MetricsPort] = None,
+        enricher: Optional[EnricherPort] = None,
+        parallel_writes: bool = False,
+        streaming: bool = False,
+        queue_size: int = 8,
+        sources: Optional[SourceRegistry] = None,
     ) -> None:
-        self.scraper = scraper
+        if sources is None:
+            if scraper is None:
+                raise ValueError("Either a scraper or a source registry is required")
+            sources = SourceRegistry().register(
+                getattr(scraper, "SOURCE", "default"), scraper
+            )
+        self.sources = sources
         self.storage_adapters = storage_adapters
+        self.max_workers = max(1, max_workers)
+        self.metrics = metrics
+        self.enricher = enricher
+        self.parallel_writes = parallel_writes
+        self.streaming = streaming
+        self.queue_size = max(1, queue_size)
+
+    def _timer(self, name: str, **labels: object) -> ContextManager:
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.timer(name, **labels)
 
     def run(
         self,
         class_specs: Dict[str, List[str]],
         output_paths: List[str],
     ) -> ScrapingResult:
-        result = ScrapingResult()
+        result = self.collect(class_specs)
+        self.save(result, output_paths)
+        return result
 
-        for class_name, specs in class_specs.items():
-            for spec_name in specs:
-                spec_data = self.scraper.scrape_spec(class_name, spec_name)
+    def collect(self, class_specs: Dict[str, List[str]]) -> ScrapingResult:
+        if self.streaming and self.enricher is not None:
+            return self.scrape_and_enrich(class_specs)
+        result = self.scrape(class_specs)
+        self.enrich(result)
+        return result
+
+    def scrape(self, class_specs: Dict[str, List[str]]) -> ScrapingResult:
+        result = ScrapingResult()
+        with self._timer("scrape_seconds"):
+            for spec_data in self._scrape_all(class_specs):
                 result.add_spec_data(spec_data)
+        total_specs = sum(len(specs) for specs in result.specs.values())
+        print(f"\nScraping complete. Processed {total_specs} specializations.")
+        return result
+
+    def enrich(self, result: ScrapingResult) -> None:
+        if self.enricher is None:
+            return
+        print("\nEnriching items...")
+        with self._timer("enrich_stage_seconds"):
+            self.enricher.enrich_result(result)
+
+    def scrape_and_enrich(self, class_specs: Dict[str, List[str]]) -> ScrapingResult:
+        jobs = self._source_jobs(class_specs)
+        completed: Dict[int, SpecData] = {}
+        enrich_queue: "queue.Queue[Optional[Tuple[int, SpecData]]]" = queue.Queue(
+            self.queue_size
+        )
+        consumer_errors: List[BaseException] = []
+
+        def consume() -> None:
+            while True:
+                entry = enrich_queue.get()
+                if entry is None:
+                    return
+                index, spec_data = entry
+                completed[index] = spec_data
+                if consumer_errors:
+                    continue
+                try:
+                    with self._timer("enrich_spec_seconds"):
+                        self.enricher.enrich_spec(spec_data)
+                except BaseException as e:
+                    consumer_errors.append(e)
 
-        for adapter, path in zip(self.storage_adapters, output_paths):
-            adapter.save(result, path)
+        indexes = {job: index for index, job in enumerate(jobs)}
 
+        def produce(source: str, class_name: str, spec_name: str) -> None:
+            spec_data = self._scrape_spec(source, class_name, spec_name)
+            enrich_queue.put((indexes[(source, class_name, spec_name)], spec_data))
+
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        try:
+            with self._timer("scrape_seconds"):
+                self._run_jobs(jobs, produce)
+        finally:
+            enrich_queue.put(None)
+            consumer.join()
+
+        if consumer_errors:
+            raise consumer_errors[0]
+
+        result = ScrapingResult()
+        for index in range(len(jobs)):
+            result.add_spec_data(completed[index])
+        print(f"\nScraped and enriched {len(jobs)} specializations.")
         return result
+
+    def save(self, result: ScrapingResult, output_paths: List[str]) -> Optional[Dict]:
+        if not self.storage_adapters:
+            return None
+        print("\nSaving data...")
+        with self._timer("serialize_seconds"):
+            data = result.to_dict()
+
+        jobs = list(zip(self.storage_adapters, output_paths))
+        if not self.parallel_writes or len(jobs) <= 1:
+            for adapter, path in jobs:
+                self._write(adapter, data, path)
+            return data
+
+        output = _PerThreadOutput(sys.stdout)
+        with redirect_stdout(output), ThreadPoolExecutor(len(jobs)) as executor:
+            futures = [
+                executor.submit(self._buffered_write, output, adapter, data, path)
+                for adapter, path in jobs
+            ]
+            for future in futures:
+                output.stream.write(future.result())
+        return data
+
+    def _write(self, adapter: StoragePort, data: Dict, path: str) -> None:
+        with self._timer("write_seconds", adapter=type(adapter).__name__):
+            adapter.write(data, path)
+
+    def _buffered_write(
+        self, output: _PerThreadOutput, adapter: StoragePort, data: Dict, path: str
+    ) -> str:
+        buffer = output.buffers[threading.get_ident()] = io.StringIO()
+        try:
+            self._write(adapter, data, path)
+        finally:
+            del output.buffers[threading.get_ident()]
+        return buffer.getvalue()
+
+    @staticmethod
+    def _jobs(class_specs: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+        return [
+            (class_name, spec_name)
+            for class_name, specs in class_specs.items()
+            for spec_name in specs
+        ]
+
+    def _source_jobs(self, class_specs: Dict[str, List[str]]) -> List[SourceJob]:
+        jobs = self._jobs(class_specs)
+        return [
+            (source, class_name, spec_name)
+            for source in self.sources.names()
+            for class_name, spec_name in jobs
+        ]
+
+    def _scrape_spec(self, source: str, class_name: str, spec_name: str) -> SpecData:
+        spec_data = self.sources.get(source).scrape_spec(class_name, spec_name)
+        spec_data.source = spec_data.source or source
+        return spec_data
+
+    def _run_jobs(
+        self, jobs: List[SourceJob], task: Callable[[str, str, str], T]
+    ) -> List[T]:
+        names = self.sources.names()
+        workers = {name: self.sources.workers(name, self.max_workers) for name in names}
+        if len(names) == 1 and (workers[names[0]] == 1 or len(jobs) <= 1):
+            return [task(*job) for job in jobs]
+
+        with ExitStack() as stack:
+            executors = {
+                name: stack.enter_context(ThreadPoolExecutor(max_workers=count))
+                for name, count in workers.items()
+            }
+            futures = [executors[job[0]].submit(task, *job) for job in jobs]
+            return [future.result() for future in futures]
+
+    def _scrape_all(self, class_specs: Dict[str, List[str]]) -> List[SpecData]:
+        return self._run_jobs(self._source_jobs(class_specs), self._scrape_spec)
@@ -0,0 +1,31 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from wowrn_scraper.domain.ports import ScraperPort
+
+
+class SourceRegistry:
+    def __init__(self) -> None:
+        self._sources: Dict[str, Tuple[ScraperPort, Optional[int]]] = {}
+
+    def register(
+        self, name: str, scraper: ScraperPort, max_workers: Optional[int] = None
+    ) -> "SourceRegistry":
+        if name in self._sources:
+            raise ValueError(f"Source {name!r} is already registered")
+        self._sources[name] = (scraper, max_workers)
+        return self
+
+    def get(self, name: str) -> ScraperPort:
+        return self._sources[name][0]
+
+    def workers(self, name: str, default: int) -> int:
+        return max(1, self._sources[name][1] or default)
+
+    def names(self) -> List[str]:
+        return list(self._sources)
+
+    def __iter__(self) -> Iterator[Tuple[str, ScraperPort]]:
+        return ((name, entry[0]) for name, entry in self._sources.items())
+
+    def __len__(self) -> int:
+        return len(self._sources)
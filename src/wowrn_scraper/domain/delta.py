@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional
+
+
+def _by_id(entries: List[Dict]) -> Dict[str, Dict]:
+    by_id: Dict[str, Dict] = {}
+    for entry in entries:
+        by_id.setdefault(entry["id"], entry)
+    return by_id
+
+
+def _updated(before: Dict[str, Dict], after: Dict[str, Dict]) -> List[str]:
+    return [i for i, entry in after.items() if i in before and before[i] != entry]
+
+
+def _list_delta(previous: List[Dict], current: List[Dict]) -> Dict[str, List[str]]:
+    before, after = _by_id(previous), _by_id(current)
+    delta: Dict[str, List[str]] = {}
+    added = [item_id for item_id in after if item_id not in before]
+    removed = [item_id for item_id in before if item_id not in after]
+    updated = _updated(before, after)
+    if added:
+        delta["added"] = added
+    if removed:
+        delta["removed"] = removed
+    if updated:
+        delta["updated"] = updated
+    return delta
+
+
+def _tiers(trinkets: Dict[str, List[Dict]]) -> Dict[str, str]:
+    tiers: Dict[str, str] = {}
+    for tier, items in trinkets.items():
+        for item in items:
+            tiers.setdefault(item["id"], tier)
+    return tiers
+
+
+def _trinket_delta(previous: Dict, current: Dict) -> Dict[str, List]:
+    before, after = _tiers(previous), _tiers(current)
+    entries_before = _by_id([i for items in previous.values() for i in items])
+    entries_after = _by_id([i for items in current.values() for i in items])
+    delta: Dict[str, List] = {}
+    added = [{"id": i, "tier": t} for i, t in after.items() if i not in before]
+    removed = [{"id": i, "tier": t} for i, t in before.items() if i not in after]
+    moved = [
+        {"id": i, "from": before[i], "to": t}
+        for i, t in after.items()
+        if i in before and before[i] != t
+    ]
+    if added:
+        delta["added"] = added
+    if removed:
+        delta["removed"] = removed
+    updated = _updated(entries_before, entries_after)
+    if moved:
+        delta["moved"] = moved
+    if updated:
+        delta["updated"] = updated
+    return delta
+
+
+def diff_spec(previous: Dict, current: Dict) -> Dict:
+    if "error" in current or "error" in previous:
+        if current.get("error") == previous.get("error"):
+            return {}
+        return {"error": {"from": previous.get("error"), "to": current.get("error")}}
+
+    delta: Dict = {}
+    bis: Dict[str, Dict] = {}
+    previous_bis, current_bis = previous.get("bis", {}), current.get("bis", {})
+    for context in dict.fromkeys([*previous_bis, *current_bis]):
+        changes = _list_delta(
+            previous_bis.get(context, []), current_bis.get(context, [])
+        )
+        if changes:
+            bis[context] = changes
+    if bis:
+        delta["bis"] = bis
+
+    trinkets = _trinket_delta(previous.get("trinkets", {}), current.get("trinkets", {}))
+    if trinkets:
+        delta["trinkets"] = trinkets
+
+    chips = _list_delta(
+        previous.get("cartel_chips", []), current.get("cartel_chips", [])
+    )
+    if chips:
+        delta["cartel_chips"] = chips
+    return delta
+
+
+def diff_results(previous: Optional[Dict], current: Dict) -> Dict:
+    previous = previous or {}
+    added: List[str] = []
+    removed: List[str] = []
+    specs: Dict[str, Dict] = {}
+
+    for class_name in dict.fromkeys([*previous, *current]):
+        before = previous.get(class_name, {})
+        after = current.get(class_name, {})
+        for spec_name in dict.fromkeys([*before, *after]):
+            key = f"{class_name}/{spec_name}"
+            if spec_name not in before:
+                added.append(key)
+            elif spec_name not in after:
+                removed.append(key)
+            else:
+                changes = diff_spec(before[spec_name], after[spec_name])
+                if changes:
+                    specs[key] = changes
+
+    delta: Dict = {"changed": bool(added or removed or specs)}
+    if added:
+        delta["specs_added"] = added
+    if removed:
+        delta["specs_removed"] = removed
+    if specs:
+        delta["specs"] = specs
+    return delta
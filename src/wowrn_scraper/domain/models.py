@@ -1,29 +1,184 @@
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
+LOOT_FIELDS = ("source_type", "boss_name", "location_name")
 
-@dataclass(frozen=True)
-class Item:
+# Lower ranks win: a guide page's own mapping, then the item store, then names
+# loaded from saved output, then the "Item N" placeholder. Page and store ranks
+# carry the spec key so conflicting names settle the same way in any order.
+PAGE_NAME, STORE_NAME, LOADED_NAME, PLACEHOLDER_NAME = range(4)
+
+
+def placeholder_name(item_id: str) -> str:
+    return f"Item {item_id}"
+
+
+@dataclass(slots=True)
+class ItemRecord:
     id: str
     name: str
-    source_type: Optional[str] = None 
+    source_type: Optional[str] = None
     boss_name: Optional[str] = None
     location_name: Optional[str] = None
 
+    def update_loot(self, info: Dict[str, Optional[str]]) -> None:
+        self.source_type = info.get("source_type")
+        self.boss_name = info.get("boss_name")
+        self.location_name = info.get("location_name")
+
+
+class ItemRegistry:
+    def __init__(self) -> None:
+        self._records: Dict[str, ItemRecord] = {}
+        self._ranks: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, item_id: str) -> Optional[ItemRecord]:
+        return self._records.get(item_id)
+
+    def record(
+        self,
+        item_id: str,
+        name: str,
+        rank: Optional[Tuple] = None,
+        **loot: Optional[str],
+    ) -> ItemRecord:
+        if name == placeholder_name(item_id):
+            rank = (PLACEHOLDER_NAME,)
+        elif rank is None:
+            rank = (LOADED_NAME,)
+        with self._lock:
+            record = self._records.get(item_id)
+            if record is None:
+                record = ItemRecord(item_id, name, **loot)
+                self._records[item_id] = record
+                self._ranks[item_id] = rank
+            else:
+                if rank < self._ranks[item_id]:
+                    record.name = name
+                    self._ranks[item_id] = rank
+                for key, value in loot.items():
+                    if value is not None and getattr(record, key) is None:
+                        setattr(record, key, value)
+            return record
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._records
+
+    def __iter__(self) -> Iterator[ItemRecord]:
+        return iter(list(self._records.values()))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class Item:
+    __slots__ = ("record",)
+    _placement_fields: tuple = ()
+
+    def __init__(
+        self,
+        id: str = "",
+        name: str = "",
+        source_type: Optional[str] = None,
+        boss_name: Optional[str] = None,
+        location_name: Optional[str] = None,
+        record: Optional[ItemRecord] = None,
+    ) -> None:
+        if record is None:
+            record = ItemRecord(id, name, source_type, boss_name, location_name)
+        self.record = record
+
+    @property
+    def id(self) -> str:
+        return self.record.id
+
+    @property
+    def name(self) -> str:
+        return self.record.name
+
+    @property
+    def source_type(self) -> Optional[str]:
+        return self.record.source_type
+
+    @property
+    def boss_name(self) -> Optional[str]:
+        return self.record.boss_name
+
+    @property
+    def location_name(self) -> Optional[str]:
+        return self.record.location_name
+
+    def _key(self) -> tuple:
+        placement = tuple(getattr(self, name) for name in self._placement_fields)
+        return (type(self), self.record, placement)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Item):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = [f"id={self.id!r}", f"name={self.name!r}"]
+        fields += [f"{name}={getattr(self, name)!r}" for name in self._placement_fields]
+        return f"{type(self).__name__}({', '.join(fields)})"
+
 
-@dataclass(frozen=True)
 class TrinketItem(Item):
-    tier: str = "Unknown"
+    __slots__ = ("tier",)
+    _placement_fields = ("tier",)
+
+    def __init__(
+        self,
+        id: str = "",
+        name: str = "",
+        source_type: Optional[str] = None,
+        boss_name: Optional[str] = None,
+        location_name: Optional[str] = None,
+        tier: str = "Unknown",
+        record: Optional[ItemRecord] = None,
+    ) -> None:
+        super().__init__(id, name, source_type, boss_name, location_name, record)
+        self.tier = tier
 
 
-@dataclass(frozen=True)
 class CartelChipItem(Item):
-    details: str = ""
+    __slots__ = ("details",)
+    _placement_fields = ("details",)
+
+    def __init__(
+        self,
+        id: str = "",
+        name: str = "",
+        source_type: Optional[str] = None,
+        boss_name: Optional[str] = None,
+        location_name: Optional[str] = None,
+        details: str = "",
+        record: Optional[ItemRecord] = None,
+    ) -> None:
+        super().__init__(id, name, source_type, boss_name, location_name, record)
+        self.details = details
 
 
-@dataclass(frozen=True)
 class SlotItem(Item):
-    slot: str = "Unknown"
+    __slots__ = ("slot",)
+    _placement_fields = ("slot",)
+
+    def __init__(
+        self,
+        id: str = "",
+        name: str = "",
+        source_type: Optional[str] = None,
+        boss_name: Optional[str] = None,
+        location_name: Optional[str] = None,
+        slot: str = "Unknown",
+        record: Optional[ItemRecord] = None,
+    ) -> None:
+        super().__init__(id, name, source_type, boss_name, location_name, record)
+        self.slot = slot
 
 
 @dataclass
@@ -46,60 +201,179 @@ class SpecData:
     cartel_chips: List[CartelChipItem] = field(default_factory=list)
     trinket_tier_list: Optional[TrinketTierList] = None
     error: Optional[str] = None
+    markup_hash: Optional[str] = None
+    reused: bool = False
+    source: Optional[str] = None
+
+    def iter_items(self) -> Iterator[Item]:
+        for bis in self.bis_lists.values():
+            yield from bis.items
+        yield from self.cartel_chips
+        if self.trinket_tier_list:
+            for items in self.trinket_tier_list.tiers.values():
+                yield from items
+
+    def iter_records(self) -> Iterator[ItemRecord]:
+        seen: Dict[int, None] = {}
+        for item in self.iter_items():
+            if id(item.record) not in seen:
+                seen[id(item.record)] = None
+                yield item.record
+
+    def to_dict(self) -> Dict:
+        tag = {"source": self.source} if self.source else {}
+        if self.error:
+            return {"error": self.error, **tag}
+        return {
+            **tag,
+            "url": self.url,
+            "bis": {
+                ctx: [
+                    {
+                        "slot": item.slot,
+                        "id": item.id,
+                        "name": item.name,
+                        "source_type": item.source_type,
+                        "boss_name": item.boss_name,
+                        "location_name": item.location_name,
+                    }
+                    for item in bis.items
+                ]
+                for ctx, bis in self.bis_lists.items()
+            },
+            "cartel_chips": [
+                {"id": c.id, "name": c.name, "details": c.details}
+                for c in self.cartel_chips
+            ],
+            "trinkets": (
+                {
+                    tier: [
+                        {
+                            "id": t.id,
+                            "name": t.name,
+                            "source_type": t.source_type,
+                            "boss_name": t.boss_name,
+                            "location_name": t.location_name,
+                        }
+                        for t in items
+                    ]
+                    for tier, items in self.trinket_tier_list.tiers.items()
+                }
+                if self.trinket_tier_list
+                else {}
+            ),
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        class_name: str,
+        spec_name: str,
+        data: Dict,
+        registry: Optional[ItemRegistry] = None,
+    ) -> "SpecData":
+        if "error" in data:
+            return cls(
+                class_name=class_name,
+                spec_name=spec_name,
+                url=data.get("url", ""),
+                error=data["error"],
+                source=data.get("source"),
+            )
+
+        def record(item: Dict) -> ItemRecord:
+            loot = {key: item.get(key) for key in LOOT_FIELDS}
+            if registry is None:
+                return ItemRecord(item["id"], item["name"], **loot)
+            return registry.record(
+                item["id"],
+                item["name"],
+                rank=(LOADED_NAME, class_name, spec_name),
+                **loot,
+            )
+
+        bis_lists = {
+            ctx: BisList(
+                context=ctx,
+                items=[SlotItem(slot=i["slot"], record=record(i)) for i in items],
+            )
+            for ctx, items in data.get("bis", {}).items()
+        }
+        cartel_chips = [
+            CartelChipItem(details=chip["details"], record=record(chip))
+            for chip in data.get("cartel_chips", [])
+        ]
+        trinkets = data.get("trinkets", {})
+        return cls(
+            class_name=class_name,
+            spec_name=spec_name,
+            url=data.get("url", ""),
+            bis_lists=bis_lists,
+            cartel_chips=cartel_chips,
+            trinket_tier_list=TrinketTierList(
+                tiers={
+                    tier: [TrinketItem(tier=tier, record=record(i)) for i in items]
+                    for tier, items in trinkets.items()
+                }
+            ),
+            source=data.get("source"),
+        )
 
 
 @dataclass
 class ScrapingResult:
     specs: Dict[str, Dict[str, SpecData]] = field(default_factory=dict)
+    by_source: Dict[str, Dict[str, Dict[str, SpecData]]] = field(default_factory=dict)
+
     def add_spec_data(self, spec_data: SpecData) -> None:
-        if spec_data.class_name not in self.specs:
-            self.specs[spec_data.class_name] = {}
-        self.specs[spec_data.class_name][spec_data.spec_name] = spec_data
+        class_name, spec_name = spec_data.class_name, spec_data.spec_name
+        if spec_data.source:
+            source_specs = self.by_source.setdefault(spec_data.source, {})
+            source_specs.setdefault(class_name, {})[spec_name] = spec_data
 
-    def to_dict(self) -> Dict:
-        result: Dict = {}
-        for class_name, specs in self.specs.items():
-            result[class_name] = {}
+        if class_name not in self.specs:
+            self.specs[class_name] = {}
+        current = self.specs[class_name].get(spec_name)
+        if (
+            current is None
+            or current.source == spec_data.source
+            or (current.error and not spec_data.error)
+        ):
+            self.specs[class_name][spec_name] = spec_data
+
+    def source_spec(
+        self, source: str, class_name: str, spec_name: str
+    ) -> Optional[SpecData]:
+        return self.by_source.get(source, {}).get(class_name, {}).get(spec_name)
+
+    def merge(self, other: "ScrapingResult") -> None:
+        for class_name, specs in other.specs.items():
             for spec_name, spec_data in specs.items():
-                if spec_data.error:
-                    result[class_name][spec_name] = {"error": spec_data.error}
-                else:
-                    result[class_name][spec_name] = {
-                        "url": spec_data.url,
-                        "bis": {
-                            ctx: [
-                                {
-                                    "slot": item.slot,
-                                    "id": item.id,
-                                    "name": item.name,
-                                    "source_type": item.source_type,
-                                    "boss_name": item.boss_name,
-                                    "location_name": item.location_name,
-                                }
-                                for item in bis.items
-                            ]
-                            for ctx, bis in spec_data.bis_lists.items()
-                        },
-                        "cartel_chips": [
-                            {"id": c.id, "name": c.name, "details": c.details}
-                            for c in spec_data.cartel_chips
-                        ],
-                        "trinkets": (
-                            {
-                                tier: [
-                                    {
-                                        "id": t.id,
-                                        "name": t.name,
-                                        "source_type": t.source_type,
-                                        "boss_name": t.boss_name,
-                                        "location_name": t.location_name,
-                                    }
-                                    for t in items
-                                ]
-                                for tier, items in spec_data.trinket_tier_list.tiers.items()
-                            }
-                            if spec_data.trinket_tier_list
-                            else {}
-                        ),
-                    }
+                current = self.specs.get(class_name, {}).get(spec_name)
+                if spec_data.error and current is not None and not current.error:
+                    continue
+                self.specs.setdefault(class_name, {})[spec_name] = spec_data
+        for source, classes in other.by_source.items():
+            for class_name, specs in classes.items():
+                source_specs = self.by_source.setdefault(source, {})
+                source_specs.setdefault(class_name, {}).update(specs)
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict, registry: Optional[ItemRegistry] = None
+    ) -> "ScrapingResult":
+        result = cls()
+        for class_name, specs in data.items():
+            for spec_name, spec in specs.items():
+                result.add_spec_data(
+                    SpecData.from_dict(class_name, spec_name, spec, registry)
+                )
         return result
+
+    def to_dict(self) -> Dict:
+        return {
+            class_name: {
+                spec_name: spec_data.to_dict() for spec_name, spec_data in specs.items()
+            }
+            for class_name, specs in self.specs.items()
+        }
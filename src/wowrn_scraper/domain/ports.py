@@ -1,13 +1,45 @@
-from typing import Protocol
+from typing import ContextManager, Dict, List, Optional, Protocol, Tuple
 
 from wowrn_scraper.domain.models import ScrapingResult, SpecData
 
 
 class ScraperPort(Protocol):
-    def scrape_spec(self, class_name: str, spec_name: str) -> SpecData:
-        ...
+    def scrape_spec(self, class_name: str, spec_name: str) -> SpecData: ...
 
 
 class StoragePort(Protocol):
-    def save(self, result: ScrapingResult, output_path: str) -> None:
-        ...
+    def save(self, result: ScrapingResult, output_path: str) -> None: ...
+
+    def write(self, data: Dict, output_path: str) -> None: ...
+
+
+class EnricherPort(Protocol):
+    def enrich_result(self, result: ScrapingResult) -> None: ...
+
+    def enrich_spec(self, spec_data: SpecData) -> None: ...
+
+
+class MetricsPort(Protocol):
+    def timer(self, name: str, **labels: object) -> ContextManager: ...
+
+
+class RefreshStatePort(Protocol):
+    def get(self, key: str) -> Dict: ...
+
+    def record_success(self, key: str, digest: Optional[str], now: float) -> bool: ...
+
+    def record_failure(self, key: str, now: float) -> None: ...
+
+    def save(self) -> None: ...
+
+
+class ItemRefresherPort(Protocol):
+    def loot_history(
+        self, item_ids: List[str]
+    ) -> Dict[str, Tuple[Optional[float], int, int]]: ...
+
+    def refresh_items(self, item_ids: List[str]) -> Dict[str, Dict]: ...
+
+
+class RequestBudgetPort(Protocol):
+    def wait_time(self, host: Optional[str] = None) -> float: ...
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import stat
+import tempfile
+from typing import IO, Optional
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+UMASK = _read_umask()
+
+
+def file_digest(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+class atomic_open:
+    def __init__(
+        self,
+        path: str,
+        mode: str = "w",
+        encoding: Optional[str] = "utf-8",
+        skip_unchanged: bool = False,
+    ) -> None:
+        self.path = path
+        self.mode = mode
+        self.encoding = None if "b" in mode else encoding
+        self.skip_unchanged = skip_unchanged
+        self.changed = True
+        self._file: Optional[IO] = None
+        self._tmp_path = ""
+
+    def __enter__(self) -> IO:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".tmp"
+        )
+        self._file = os.fdopen(fd, self.mode, encoding=self.encoding)
+        return self._file
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            self._file.close()
+            if exc_type is None:
+                self.changed = not (self.skip_unchanged and self._same_as_existing())
+                if self.changed:
+                    os.chmod(self._tmp_path, self._target_mode())
+                    os.replace(self._tmp_path, self.path)
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+    def _same_as_existing(self) -> bool:
+        try:
+            if os.path.getsize(self._tmp_path) != os.path.getsize(self.path):
+                return False
+        except FileNotFoundError:
+            return False
+        return file_digest(self._tmp_path) == file_digest(self.path)
+
+    def _target_mode(self) -> int:
+        try:
+            return stat.S_IMODE(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            return 0o666 & ~UMASK
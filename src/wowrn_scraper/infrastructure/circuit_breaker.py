@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Dict
+
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._state(host)
+
+    def _state(self, host: str) -> str:
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return "closed"
+        if time.monotonic() - opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_request(self, host: str) -> None:
+        with self._lock:
+            state = self._state(host)
+            if state == "open":
+                raise CircuitOpenError(f"Circuit open for {host}")
+            if state == "half_open":
+                self._opened_at[host] = time.monotonic()
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str) -> bool:
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold:
+                opened = host not in self._opened_at
+                self._opened_at[host] = time.monotonic()
+                return opened
+            return False
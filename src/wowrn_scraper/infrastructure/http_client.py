@@ -0,0 +1,301 @@
+import gzip
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+from wowrn_scraper.infrastructure.circuit_breaker import CircuitBreaker
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+from wowrn_scraper.infrastructure.page_archive import PageArchive
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+from wowrn_scraper.infrastructure.request_budget import HourlyRequestBudget
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    ),
+    "Accept-Encoding": "gzip, deflate",
+}
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    url: str
+    status_code: int
+    text: str
+    not_modified: bool = False
+
+
+class ValidatorStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.html.gz"
+
+    def get_validators(self, url: str) -> Dict[str, str]:
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(meta_path) or not os.path.exists(body_path):
+            return {}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+        headers: Dict[str, str] = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[str]:
+        _, body_path = self._paths(url)
+        try:
+            with gzip.open(body_path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except (IOError, EOFError):
+            return None
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        meta_path, body_path = self._paths(url)
+        with atomic_open(body_path, "wb") as f:
+            f.write(gzip.compress(body.encode("utf-8")))
+        with atomic_open(meta_path) as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified}, f)
+
+
+class HttpClient:
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        validator_store: Optional[ValidatorStore] = None,
+        pool_size: int = 10,
+        timeout: float = 30.0,
+        metrics: Optional[RunMetrics] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        archive: Optional[PageArchive] = None,
+        budget: Optional[HourlyRequestBudget] = None,
+    ) -> None:
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.budget = budget
+        self.validator_store = validator_store
+        self.archive = archive
+        self.timeout = timeout
+        self.metrics = metrics or RunMetrics()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(
+        self,
+        url: str,
+        revalidate: bool = False,
+        allow_redirects: bool = True,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        response = self._fetch(url, revalidate, allow_redirects, timeout)
+        if self.archive is not None:
+            self.archive.store(url, response.url, response.text)
+        return response
+
+    def _fetch(
+        self,
+        url: str,
+        revalidate: bool,
+        allow_redirects: bool,
+        timeout: Optional[float],
+    ) -> HttpResponse:
+        store = self.validator_store if revalidate else None
+        conditional_headers = store.get_validators(url) if store else {}
+
+        response = self._send(
+            url, conditional_headers, allow_redirects, timeout or self.timeout
+        )
+
+        if response.status_code == 304 and store:
+            body = store.load_body(url)
+            if body is not None:
+                self.metrics.record_cache("http_validators", True)
+                return HttpResponse(
+                    url=response.url, status_code=304, text=body, not_modified=True
+                )
+            response = self._send(url, {}, allow_redirects, timeout or self.timeout)
+
+        if store:
+            self.metrics.record_cache("http_validators", False)
+        response.raise_for_status()
+        text = response.text
+
+        if store:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                store.store(url, text, etag, last_modified)
+
+        return HttpResponse(
+            url=response.url, status_code=response.status_code, text=text
+        )
+
+    def _send(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        allow_redirects: bool,
+        timeout: float,
+    ) -> requests.Response:
+        host = self.rate_limiter.host_of(url)
+        attempt = 0
+        while True:
+            try:
+                response = self._attempt(url, host, headers, allow_redirects, timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.metrics.increment(
+                    "http_errors_total", host=host, error=type(e).__name__
+                )
+                self._record_failure(host)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.rate_limiter.record_success(host)
+                    self.circuit_breaker.record_success(host)
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self.rate_limiter.record_throttle(host, retry_after)
+                if retry_after is not None and retry_after > self.backoff_max:
+                    self.metrics.increment(
+                        "http_errors_total", host=host, error="RetryAfterTooLong"
+                    )
+                    self._record_failure(host)
+                    return response
+                if response.status_code != 429:
+                    self._record_failure(host)
+                if attempt >= self.max_retries:
+                    return response
+                delay = 0.0 if retry_after is not None else self._backoff(attempt)
+
+            attempt += 1
+            self.metrics.increment("http_retries_total", host=host)
+            if delay > 0:
+                time.sleep(delay)
+                self.metrics.increment("sleep_seconds_total", delay, reason="retry")
+
+    def _attempt(
+        self,
+        url: str,
+        host: str,
+        headers: Dict[str, str],
+        allow_redirects: bool,
+        timeout: float,
+    ) -> requests.Response:
+        try:
+            self.circuit_breaker.before_request(host)
+        except requests.RequestException:
+            self.metrics.increment("http_rejected_total", host=host)
+            raise
+
+        if self.budget is not None:
+            waited = self.budget.acquire(host)
+            if waited > 0:
+                self.metrics.increment("sleep_seconds_total", waited, reason="budget")
+
+        waited = self.rate_limiter.acquire(url)
+        if waited > 0:
+            self.metrics.increment("sleep_seconds_total", waited, reason="rate_limit")
+
+        with self.metrics.timer("http_request_seconds", host=host):
+            response = self.session.get(
+                url, headers=headers, allow_redirects=allow_redirects, timeout=timeout
+            )
+
+        self.metrics.increment(
+            "http_requests_total", host=host, status=response.status_code
+        )
+        self.metrics.increment(
+            "http_response_bytes_total", len(response.content), host=host
+        )
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _record_failure(self, host: str) -> None:
+        if self.circuit_breaker.record_failure(host):
+            print(f"Circuit opened for {host}, failing fast for a while.")
+            self.metrics.increment("circuit_opened_total", host=host)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class ArchiveHttpClient:
+    def __init__(
+        self, archive: PageArchive, metrics: Optional[RunMetrics] = None
+    ) -> None:
+        self.archive = archive
+        self.metrics = metrics or RunMetrics()
+
+    def get(
+        self,
+        url: str,
+        revalidate: bool = False,
+        allow_redirects: bool = True,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        page = self.archive.load(url)
+        self.metrics.record_cache("page_archive", page is not None)
+        if page is None:
+            raise requests.RequestException(f"{url} is not in the page archive")
+        final_url, text = page
+        return HttpResponse(url=final_url, status_code=200, text=text)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,244 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+
+DAY = 24 * 60 * 60
+
+FALLBACK_LOOT_INFO: Dict[str, Optional[str]] = {
+    "source_type": "quest, vendor or crafted",
+    "boss_name": None,
+    "location_name": None,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    name TEXT,
+    name_expires_at REAL,
+    source_type TEXT,
+    boss_name TEXT,
+    location_name TEXT,
+    loot_failed INTEGER NOT NULL DEFAULT 0,
+    loot_expires_at REAL,
+    loot_checked_at REAL,
+    loot_checks INTEGER NOT NULL DEFAULT 0,
+    loot_changes INTEGER NOT NULL DEFAULT 0
+)
+"""
+HISTORY_COLUMNS = {
+    "loot_checked_at": "REAL",
+    "loot_checks": "INTEGER NOT NULL DEFAULT 0",
+    "loot_changes": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class ItemStore:
+    def __init__(
+        self,
+        path: str,
+        name_ttl: float = 30 * DAY,
+        loot_ttl: float = 7 * DAY,
+        negative_ttl: float = 0.25 * DAY,
+        legacy_cache_path: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
+        read_only: bool = False,
+    ) -> None:
+        self.path = path
+        self.read_only = read_only and path != ":memory:"
+        self.name_ttl = name_ttl
+        self.loot_ttl = loot_ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.metrics = metrics or RunMetrics()
+        self._lock = threading.Lock()
+
+        if self.read_only:
+            self._conn = sqlite3.connect(
+                f"file:{path}?mode=ro",
+                uri=True,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            return
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._add_history_columns()
+
+        if legacy_cache_path:
+            self._import_legacy_cache(legacy_cache_path)
+
+    def _add_history_columns(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(items)")}
+        for name, definition in HISTORY_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE items ADD COLUMN {name} {definition}")
+
+    def _import_legacy_cache(self, legacy_cache_path: str) -> None:
+        if not os.path.exists(legacy_cache_path):
+            return
+        try:
+            with open(legacy_cache_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+
+        self._conn.execute("BEGIN")
+        for item_id, info in legacy.items():
+            negative = info.get("source_type") == FALLBACK_LOOT_INFO["source_type"]
+            self.put_loot_info(item_id, info, negative=negative)
+        self._conn.execute("COMMIT")
+        os.replace(legacy_cache_path, f"{legacy_cache_path}.migrated")
+        print(f"Imported {len(legacy)} entries from {legacy_cache_path}")
+
+    def _record(self, found: bool) -> None:
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.metrics.record_cache("item_names", found)
+
+    def _valid_after(self) -> float:
+        return -math.inf if self.read_only else time.time()
+
+    def get_name(self, item_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name FROM items WHERE item_id = ? AND name_expires_at > ?",
+                (item_id, self._valid_after()),
+            ).fetchone()
+            self._record(row is not None)
+        return row[0] if row else None
+
+    def put_name(self, item_id: str, name: str) -> None:
+        if self.read_only:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO items (item_id, name, name_expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(item_id) DO UPDATE SET "
+                "name = excluded.name, name_expires_at = excluded.name_expires_at",
+                (item_id, name, time.time() + self.name_ttl),
+            )
+
+    def get_loot_info(self, item_id: str) -> Optional[Dict[str, Optional[str]]]:
+        return self.get_many_loot_info([item_id]).get(item_id)
+
+    def get_many_loot_info(
+        self, item_ids: Iterable[str]
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        ids = list(dict.fromkeys(item_ids))
+        found: Dict[str, Dict[str, Optional[str]]] = {}
+        now = self._valid_after()
+
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT item_id, source_type, boss_name, location_name "
+                    f"FROM items WHERE item_id IN ({placeholders}) "
+                    "AND loot_expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                for item_id, source_type, boss_name, location_name in rows:
+                    found[item_id] = {
+                        "source_type": source_type,
+                        "boss_name": boss_name,
+                        "location_name": location_name,
+                    }
+            self.hits += len(found)
+            self.misses += len(ids) - len(found)
+        self.metrics.record_cache("loot_info", True, len(found))
+        self.metrics.record_cache("loot_info", False, len(ids) - len(found))
+
+        return found
+
+    def put_loot_info(
+        self,
+        item_id: str,
+        info: Dict[str, Optional[str]],
+        negative: bool = False,
+    ) -> None:
+        if self.read_only:
+            return
+        ttl = self.negative_ttl if negative else self.loot_ttl
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO items (item_id, source_type, boss_name, location_name, "
+                "loot_failed, loot_expires_at, loot_checked_at, loot_checks) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT(item_id) DO UPDATE SET "
+                "source_type = excluded.source_type, "
+                "boss_name = excluded.boss_name, "
+                "location_name = excluded.location_name, "
+                "loot_failed = excluded.loot_failed, "
+                "loot_expires_at = excluded.loot_expires_at, "
+                "loot_checked_at = excluded.loot_checked_at, "
+                "loot_checks = loot_checks + 1, "
+                "loot_changes = loot_changes + ("
+                "loot_checked_at IS NOT NULL AND ("
+                "source_type IS NOT excluded.source_type "
+                "OR boss_name IS NOT excluded.boss_name "
+                "OR location_name IS NOT excluded.location_name))",
+                (
+                    item_id,
+                    info.get("source_type"),
+                    info.get("boss_name"),
+                    info.get("location_name"),
+                    int(negative),
+                    now + ttl,
+                    now,
+                ),
+            )
+
+    def loot_history(
+        self, item_ids: Iterable[str]
+    ) -> Dict[str, Tuple[Optional[float], int, int]]:
+        ids = list(dict.fromkeys(item_ids))
+        history: Dict[str, Tuple[Optional[float], int, int]] = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT item_id, loot_checked_at, loot_checks, loot_changes "
+                    f"FROM items WHERE item_id IN ({placeholders}) "
+                    "AND source_type IS NOT NULL",
+                    chunk,
+                ).fetchall()
+                for item_id, checked_at, checks, changes in rows:
+                    history[item_id] = (checked_at, checks, changes)
+        return history
+
+    def purge_expired(self) -> int:
+        if self.read_only:
+            return 0
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM items WHERE COALESCE(name_expires_at, 0) <= ? "
+                "AND COALESCE(loot_expires_at, 0) <= ?",
+                (now, now),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
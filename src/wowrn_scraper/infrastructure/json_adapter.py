@@ -1,14 +1,39 @@
 import json
 import os
+from typing import Dict, Optional
 
-from wowrn_scraper.domain.models import ScrapingResult
+from wowrn_scraper.domain.models import ItemRegistry, ScrapingResult
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
 
 
 class JsonStorageAdapter:
     def save(self, result: ScrapingResult, output_path: str) -> None:
-        data_dict = result.to_dict()
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data_dict, f, indent=2)
+        self.write(result.to_dict(), output_path)
 
-        print(f"Successfully saved JSON to {output_path}")
+    def write(self, data: Dict, output_path: str) -> None:
+        target = atomic_open(output_path, skip_unchanged=True)
+        with target as f:
+            json.dump(data, f, indent=2)
+
+        if target.changed:
+            print(f"Successfully saved JSON to {output_path}")
+        else:
+            print(f"{output_path} is unchanged, left untouched")
+
+    def read(self, output_path: str) -> Optional[Dict]:
+        if not os.path.exists(output_path):
+            return None
+        try:
+            with open(output_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Could not read {output_path}: {e}")
+            return None
+
+    def load(
+        self, output_path: str, registry: Optional[ItemRegistry] = None
+    ) -> Optional[ScrapingResult]:
+        data = self.read(output_path)
+        if data is None:
+            return None
+        return ScrapingResult.from_dict(data, registry)
@@ -1,51 +1,299 @@
-from typing import Any, List
+import os
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
 from wowrn_scraper.domain.models import ScrapingResult
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+
+LUA_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+LUA_KEYWORDS = frozenset(
+    {
+        "and",
+        "break",
+        "do",
+        "else",
+        "elseif",
+        "end",
+        "false",
+        "for",
+        "function",
+        "goto",
+        "if",
+        "in",
+        "local",
+        "nil",
+        "not",
+        "or",
+        "repeat",
+        "return",
+        "then",
+        "true",
+        "until",
+        "while",
+    }
+)
+
+LOOT_FIELDS = ("source_type", "boss_name", "location_name")
+SHARED_FIELDS = ("name",) + LOOT_FIELDS
+
+NORMALIZED_PRELUDE = (
+    "local ref = {__index = function(entry, key) "
+    'local item = items[rawget(entry, "id")] '
+    "return item and item[key] end}\n"
+    "local function r(entry) return setmetatable(entry, ref) end\n"
+)
+
+
+class LuaExpression(str):
+    pass
+
+
+class ItemRef(dict):
+    pass
+
+
+def build_item_index(spec_dict: Dict) -> Dict[str, List[Dict]]:
+    index: Dict[str, List[Dict]] = {}
+
+    for context, items in spec_dict.get("bis", {}).items():
+        for item in items:
+            entry = {"type": "bis", "context": context, "slot": item["slot"]}
+            entry.update((key, item.get(key)) for key in LOOT_FIELDS)
+            index.setdefault(item["id"], []).append(entry)
+
+    for tier, items in spec_dict.get("trinkets", {}).items():
+        for item in items:
+            entry = {"type": "trinket", "tier": tier}
+            entry.update((key, item.get(key)) for key in LOOT_FIELDS)
+            index.setdefault(item["id"], []).append(entry)
+
+    for chip in spec_dict.get("cartel_chips", []):
+        index.setdefault(chip["id"], []).append(
+            {"type": "cartel", "details": chip.get("details")}
+        )
+
+    return index
+
+
+def with_item_index(data: Dict) -> Dict:
+    return {
+        class_name: {
+            spec_name: (
+                spec_dict
+                if "error" in spec_dict
+                else {**spec_dict, "item_index": build_item_index(spec_dict)}
+            )
+            for spec_name, spec_dict in specs.items()
+        }
+        for class_name, specs in data.items()
+    }
+
+
+def _iter_occurrences(data: Dict) -> Iterator[Dict]:
+    for specs in data.values():
+        for spec_dict in specs.values():
+            for items in spec_dict.get("bis", {}).values():
+                yield from items
+            for items in spec_dict.get("trinkets", {}).values():
+                yield from items
+            yield from spec_dict.get("cartel_chips", [])
+
+
+def build_item_table(data: Dict) -> Dict[str, Dict]:
+    values: Dict[str, Dict[str, set]] = {}
+    for item in _iter_occurrences(data):
+        fields = values.setdefault(item["id"], {key: set() for key in SHARED_FIELDS})
+        for key in SHARED_FIELDS:
+            fields[key].add(item.get(key))
+
+    table: Dict[str, Dict] = {}
+    for item_id, fields in values.items():
+        table[item_id] = {
+            key: next(iter(seen))
+            for key, seen in fields.items()
+            if len(seen) == 1 and None not in seen
+        }
+    return table
+
+
+def _reference(entry: Dict, record: Dict) -> ItemRef:
+    ref = ItemRef(id=entry["id"])
+    for key, value in entry.items():
+        if key not in ref and value is not None and record.get(key) != value:
+            ref[key] = value
+    return ref
+
+
+def _normalize_value(value: Any, items: Dict[str, Dict]) -> Any:
+    if isinstance(value, dict):
+        if "id" in value and value["id"] in items:
+            return _reference(value, items[value["id"]])
+        return {k: _normalize_value(v, items) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize_value(v, items) for v in value]
+    return value
+
+
+def _normalize_index(spec_dict: Dict, items: Dict[str, Dict]) -> Dict:
+    return {
+        item_id: [
+            _reference({"id": item_id, **entry}, items[item_id]) for entry in entries
+        ]
+        for item_id, entries in build_item_index(spec_dict).items()
+    }
+
+
+def intern_strings(items: Dict[str, Dict]) -> Tuple[List[str], Dict[str, Dict]]:
+    counts = Counter(
+        value
+        for record in items.values()
+        for key, value in record.items()
+        if key in LOOT_FIELDS
+    )
+    pool = [value for value, count in counts.items() if count > 1]
+    slots = {value: LuaExpression(f"s[{i}]") for i, value in enumerate(pool, 1)}
+    interned = {
+        item_id: {
+            key: slots.get(value, value) if key in LOOT_FIELDS else value
+            for key, value in record.items()
+        }
+        for item_id, record in items.items()
+    }
+    return pool, interned
+
+
+def normalize(data: Dict, item_index: bool = False) -> Tuple[Dict, Dict]:
+    items = build_item_table(data)
+    specs: Dict[str, Dict] = {}
+    for class_name, class_specs in data.items():
+        specs[class_name] = {}
+        for spec_name, spec_dict in class_specs.items():
+            normalized = _normalize_value(spec_dict, items)
+            if item_index and "error" not in spec_dict:
+                normalized["item_index"] = _normalize_index(spec_dict, items)
+            specs[class_name][spec_name] = normalized
+    return items, specs
 
 
 class LuaStorageAdapter:
-    def __init__(self, variable_name: str = "TierListAddonData") -> None:
+    def __init__(
+        self,
+        variable_name: str = "TierListAddonData",
+        compact: bool = False,
+        item_index: bool = False,
+        normalized: bool = False,
+    ) -> None:
         self.variable_name = variable_name
+        self.compact = compact
+        self.item_index = item_index
+        self.normalized = normalized
 
     def save(self, result: ScrapingResult, output_path: str) -> None:
-        import os
+        self.write(result.to_dict(), output_path)
+
+    def write(self, data_dict: Dict, output_path: str) -> None:
+        target = atomic_open(output_path, skip_unchanged=True)
+        with target as f:
+            self._write_document(f.write, data_dict, self.normalized)
+
+        if target.changed:
+            print(f"Successfully generated {output_path}")
+        else:
+            print(f"{output_path} is unchanged, left untouched")
+
+    def _write_body(self, write: Callable[[str], Any], value: Any) -> None:
+        if self.compact:
+            self._write_compact(write, value)
+        else:
+            self._write_value(write, value)
 
-        data_dict = result.to_dict()
-        lua_content = f"{self.variable_name} = {self._to_lua_value(data_dict)}"
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    def _write_document(
+        self,
+        write: Callable[[str], Any],
+        data_dict: Dict,
+        normalized: bool,
+        merge: bool = False,
+    ) -> None:
+        if normalized:
+            items, data_dict = normalize(data_dict, item_index=self.item_index)
+            pool, items = intern_strings(items)
+            write("local s = ")
+            self._write_body(write, pool)
+            write("\nlocal items = ")
+            self._write_body(write, items)
+            write(f"\n{NORMALIZED_PRELUDE}")
+        elif self.item_index:
+            data_dict = with_item_index(data_dict)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(lua_content)
+        if not merge:
+            write(f"{self.variable_name} = ")
+            self._write_body(write, data_dict)
+            return
 
-        print(f"Successfully generated {output_path}")
+        write(f"{self.variable_name} = {self.variable_name} or {{}}\n")
+        for class_name, specs in data_dict.items():
+            write(f'{self.variable_name}["{self._escape(class_name)}"] = ')
+            self._write_body(write, specs)
+            write("\n")
 
-    def _to_lua_value(self, value: Any, indent: int = 0) -> str:
+    def _write_value(
+        self, write: Callable[[str], Any], value: Any, indent: int = 0
+    ) -> None:
         indent_str = "    " * indent
 
-        if isinstance(value, dict):
-            items: List[str] = []
-            for k, v in value.items():
-                key_str = f'["{k}"]'
-                val_str = self._to_lua_value(v, indent + 1)
-                items.append(f"{indent_str}    {key_str} = {val_str}")
-            return "{\n" + ",\n".join(items) + "\n" + indent_str + "}"
+        if isinstance(value, (dict, list)):
+            if isinstance(value, ItemRef):
+                write("r")
+            write("{\n")
+            entries = value.items() if isinstance(value, dict) else enumerate(value)
+            for position, (k, v) in enumerate(entries):
+                if position:
+                    write(",\n")
+                write(f"{indent_str}    ")
+                if isinstance(value, dict):
+                    write(f'["{k}"] = ')
+                self._write_value(write, v, indent + 1)
+            write("\n" + indent_str + "}")
+        else:
+            write(self._scalar(value))
 
+    def _write_compact(self, write: Callable[[str], Any], value: Any) -> None:
+        if isinstance(value, dict):
+            write("r{" if isinstance(value, ItemRef) else "{")
+            for position, (k, v) in enumerate(value.items()):
+                if position:
+                    write(",")
+                write(self._compact_key(k))
+                self._write_compact(write, v)
+            write("}")
         elif isinstance(value, list):
-            items = [self._to_lua_value(v, indent + 1) for v in value]
-            return (
-                "{\n"
-                + ",\n".join([f"{indent_str}    {item}" for item in items])
-                + "\n"
-                + indent_str
-                + "}"
-            )
+            write("{")
+            for position, v in enumerate(value):
+                if position:
+                    write(",")
+                self._write_compact(write, v)
+            write("}")
+        else:
+            write(self._scalar(value))
+
+    @staticmethod
+    def _compact_key(key: Any) -> str:
+        key = str(key)
+        if LUA_IDENTIFIER.match(key) and key not in LUA_KEYWORDS:
+            return f"{key}="
+        return f'["{LuaStorageAdapter._escape(key)}"]='
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def _scalar(self, value: Any) -> str:
+        if isinstance(value, LuaExpression):
+            return value
 
         elif isinstance(value, str):
-            safe_str = (
-                value.replace("\\", "\\\\")
-                .replace('"', '\\"')
-                .replace("\n", "\\n")
-            )
-            return f'"{safe_str}"'
+            return f'"{self._escape(value)}"'
 
         elif isinstance(value, (int, float)):
             return str(value)
@@ -55,3 +303,99 @@ class LuaStorageAdapter:
 
         else:
             return f'"{str(value)}"'
+
+
+class LoadOnDemandLuaAdapter(LuaStorageAdapter):
+    TOC_TEMPLATE = (
+        "## Interface: {interface}\n"
+        "## Title: WOWRN - {title} Data\n"
+        "## Dependencies: {parent}\n"
+        "## LoadOnDemand: 1\n"
+        "\n"
+        "Data.lua\n"
+    )
+
+    def __init__(
+        self,
+        variable_name: str = "TierListAddonData",
+        manifest_name: str = "TierListAddonManifest",
+        parent_addon: str = "WOWRN",
+        default_interface: str = "120000, 120001",
+        **options: Any,
+    ) -> None:
+        super().__init__(variable_name=variable_name, **options)
+        self.manifest_name = manifest_name
+        self.parent_addon = parent_addon
+        self.default_interface = default_interface
+        self.class_report: Dict[str, Dict[str, int]] = {}
+
+    def addon_name(self, class_name: str) -> str:
+        parts = class_name.split("-")
+        return f"{self.parent_addon}_" + "".join(part.capitalize() for part in parts)
+
+    def _interface_version(self, parent_dir: str) -> str:
+        toc_path = os.path.join(parent_dir, f"{self.parent_addon}.toc")
+        try:
+            with open(toc_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("## Interface:"):
+                        return line.split(":", 1)[1].strip()
+        except IOError:
+            pass
+        return self.default_interface
+
+    def write(self, data_dict: Dict, output_path: str) -> None:
+        parent_dir = os.path.dirname(os.path.abspath(output_path))
+        addons_dir = os.path.dirname(parent_dir)
+        interface = self._interface_version(parent_dir)
+
+        manifest: Dict[str, Dict[str, str]] = {}
+        self.class_report = {}
+        for class_name, specs in data_dict.items():
+            addon = self.addon_name(class_name)
+            addon_dir = os.path.join(addons_dir, addon)
+            data_path = os.path.join(addon_dir, "Data.lua")
+            class_data = {class_name: specs}
+
+            target = atomic_open(data_path, skip_unchanged=True)
+            with target as f:
+                self._write_document(f.write, class_data, self.normalized, merge=True)
+            with atomic_open(
+                os.path.join(addon_dir, f"{addon}.toc"), skip_unchanged=True
+            ) as f:
+                f.write(
+                    self.TOC_TEMPLATE.format(
+                        interface=interface,
+                        title=" ".join(p.capitalize() for p in class_name.split("-")),
+                        parent=self.parent_addon,
+                    )
+                )
+
+            manifest[class_name] = {"addon": addon}
+            self.class_report[class_name] = {
+                "specs": len(specs),
+                "entries": sum(1 for _ in _iter_occurrences(class_data)),
+                "bytes": os.path.getsize(data_path),
+                "changed": int(target.changed),
+            }
+
+        with atomic_open(output_path, skip_unchanged=True) as f:
+            f.write(f"{self.variable_name} = {self.variable_name} or {{}}\n")
+            f.write(f"{self.manifest_name} = ")
+            self._write_body(f.write, manifest)
+            f.write("\n")
+
+        self._print_class_report(output_path)
+
+    def _print_class_report(self, output_path: str) -> None:
+        print(f"{'Class':<14} {'Specs':>5} {'Entries':>8} {'Bytes':>10} Changed")
+        for class_name, report in self.class_report.items():
+            print(
+                f"{class_name:<14} {report['specs']:>5} "
+                f"{report['entries']:>8} {report['bytes']:>10} "
+                f"{'yes' if report['changed'] else 'no'}"
+            )
+        print(
+            f"Manifest {os.path.basename(output_path)}: "
+            f"{os.path.getsize(output_path)} bytes always loaded"
+        )
@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)},
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class RunMetrics:
+    def __init__(self, prefix: str = "wowrn") -> None:
+        self.prefix = prefix
+        self.started_at = time.time()
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: Dict[str, object]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels: object) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: object) -> None:
+        with self._lock:
+            self.gauges.setdefault(name, {})[self._labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_cache(self, cache: str, hit: bool, count: int = 1) -> None:
+        name = "cache_hits_total" if hit else "cache_misses_total"
+        if count:
+            self.increment(name, count, cache=cache)
+
+    def value(self, name: str, **labels: object) -> float:
+        return self.counters.get(name, {}).get(self._labels(labels), 0)
+
+    def cache_ratios(self) -> Dict[str, Dict[str, float]]:
+        caches = {
+            dict(labels)["cache"]
+            for name in ("cache_hits_total", "cache_misses_total")
+            for labels in self.counters.get(name, {})
+        }
+        ratios: Dict[str, Dict[str, float]] = {}
+        for cache in sorted(caches):
+            hits = self.value("cache_hits_total", cache=cache)
+            misses = self.value("cache_misses_total", cache=cache)
+            total = hits + misses
+            ratios[cache] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / total if total else 0.0,
+            }
+        return ratios
+
+    def to_dict(self) -> Dict:
+        def series(metrics: Dict[str, Dict[Labels, object]]) -> Dict[str, List]:
+            return {
+                name: [
+                    {
+                        "labels": dict(labels),
+                        "value": v.to_dict() if isinstance(v, Histogram) else v,
+                    }
+                    for labels, v in sorted(values.items())
+                ]
+                for name, values in sorted(metrics.items())
+            }
+
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": time.time() - self.started_at,
+                "counters": series(self.counters),
+                "gauges": series(self.gauges),
+                "histograms": series(self.histograms),
+                "caches": self.cache_ratios(),
+            }
+
+    @staticmethod
+    def _escape_label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @classmethod
+    def _format_labels(
+        cls, labels: Labels, extra: Optional[Tuple[str, str]] = None
+    ) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{cls._escape_label(v)}"' for k, v in pairs) + "}"
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+                for name, values in sorted(metrics.items()):
+                    full_name = f"{self.prefix}_{name}"
+                    lines.append(f"# TYPE {full_name} {kind}")
+                    for labels, value in sorted(values.items()):
+                        labels_text = self._format_labels(labels)
+                        lines.append(f"{full_name}{labels_text} {value}")
+
+            for name, values in sorted(self.histograms.items()):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                for labels, histogram in sorted(values.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        le = self._format_labels(labels, ("le", str(bound)))
+                        lines.append(f"{full_name}_bucket{le} {count}")
+                    le = self._format_labels(labels, ("le", "+Inf"))
+                    lines.append(f"{full_name}_bucket{le} {histogram.count}")
+                    plain = self._format_labels(labels)
+                    lines.append(f"{full_name}_sum{plain} {histogram.sum}")
+                    lines.append(f"{full_name}_count{plain} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        with atomic_open(path) as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        with atomic_open(path) as f:
+            f.write(self.to_prometheus())
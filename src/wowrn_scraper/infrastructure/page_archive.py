@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+
+MANIFEST = "manifest.json"
+
+
+class PageArchive:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pages: Dict[str, Dict[str, str]] = self._load_manifest()
+        self._dirty = False
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+        path = os.path.join(self.directory, MANIFEST)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["pages"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return {}
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.html.gz")
+
+    def store(self, url: str, final_url: str, body: str) -> str:
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            with atomic_open(path, "wb") as f:
+                f.write(gzip.compress(data, mtime=0))
+
+        entry = {
+            "sha256": digest,
+            "final_url": final_url,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._pages[url] = entry
+            self._dirty = True
+        return digest
+
+    def load(self, url: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            entry = self._pages.get(url)
+        if entry is None:
+            return None
+        path = self._object_path(entry["sha256"])
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return entry["final_url"], f.read()
+        except (IOError, EOFError):
+            return None
+
+    def entry(self, url: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            return self._pages.get(url)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            pages = dict(sorted(self._pages.items()))
+            self._dirty = False
+        with atomic_open(os.path.join(self.directory, MANIFEST)) as f:
+            json.dump({"pages": pages}, f, indent=1)
+
+    def __len__(self) -> int:
+        return len(self._pages)
@@ -0,0 +1,92 @@
+import json
+import re
+from json.decoder import scanstring
+from typing import Dict, Optional, Tuple
+
+SCAN_PATTERN = re.compile(
+    r"WH\.(?:(?P<data>Gatherer\.addData\(3, 1,\s*)"
+    r'|(?P<markup>markup\.printHtml\(\s*"))'
+    r"|item=(?P<id>\d+)/(?P<slug>[a-zA-Z0-9-]+)"
+)
+GUIDE_BODY_PATTERN = re.compile(r'\s*,\s*"guide-body"')
+JS_STRING_PATTERN = re.compile(r'([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+JS_ESCAPE_PATTERN = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+JS_ESCAPES = {
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+    "\n": "",
+}
+
+_decoder = json.JSONDecoder()
+
+
+class PageScan:
+    __slots__ = ("markup", "names", "slugs")
+
+    def __init__(self) -> None:
+        self.markup: Optional[str] = None
+        self.names: Dict[str, str] = {}
+        self.slugs: Dict[str, str] = {}
+
+
+def _js_escape(match: "re.Match[str]") -> str:
+    escape = match.group(1)
+    if len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return JS_ESCAPES.get(escape, escape)
+
+
+def decode_js_string(html: str, start: int) -> Optional[Tuple[str, int]]:
+    try:
+        return scanstring(html, start, False)
+    except json.JSONDecodeError:
+        pass
+    literal = JS_STRING_PATTERN.match(html, start)
+    if not literal:
+        return None
+    return JS_ESCAPE_PATTERN.sub(_js_escape, literal.group(1)), literal.end()
+
+
+def _is_item_link(html: str, start: int) -> bool:
+    if html.startswith("[url=", start - 5):
+        return True
+    if html[start - 1 : start] != "/":
+        return False
+    quote = html.rfind('"', 0, start)
+    return quote >= 5 and html[quote - 5 : quote].lower() == "href="
+
+
+def scan_page(html: str) -> PageScan:
+    scan = PageScan()
+    search = SCAN_PATTERN.search
+    match = search(html)
+    while match:
+        end = match.end()
+        kind = match.lastgroup
+        if kind == "data":
+            try:
+                data, end = _decoder.raw_decode(html, end)
+            except json.JSONDecodeError as e:
+                print(f"Error decoding item mapping JSON: {e}")
+            else:
+                if isinstance(data, dict):
+                    for item_id, info in data.items():
+                        if isinstance(info, dict) and "name_enus" in info:
+                            scan.names[str(item_id)] = info["name_enus"]
+        elif kind == "markup":
+            if scan.markup is None:
+                decoded = decode_js_string(html, end)
+                if decoded and GUIDE_BODY_PATTERN.match(html, decoded[1]):
+                    markup = decoded[0]
+                    if "\r" in markup:
+                        markup = markup.replace("\r", "")
+                    scan.markup = markup
+        elif _is_item_link(html, match.start()):
+            scan.slugs.setdefault(match.group("id"), match.group("slug"))
+        match = search(html, end)
+    return scan
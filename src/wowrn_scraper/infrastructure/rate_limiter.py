@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class HostRateLimiter:
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        host_intervals: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.min_interval = min_interval
+        self.host_intervals: Dict[str, float] = dict(host_intervals or {})
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def interval_for(self, host: str) -> float:
+        return self.host_intervals.get(host, self.min_interval)
+
+    def acquire(self, url: str) -> float:
+        host = self.host_of(url)
+
+        with self._lock:
+            interval = self.interval_for(host)
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_success(self, host: str) -> None:
+        pass
+
+    def record_throttle(self, host: str, retry_after: Optional[float] = None) -> None:
+        if retry_after:
+            self.pause(host, retry_after)
+
+    def pause(self, host: str, seconds: float) -> None:
+        with self._lock:
+            resume = time.monotonic() + seconds
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), resume)
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        host_intervals: Optional[Dict[str, float]] = None,
+        floor: float = 0.1,
+        ceiling: float = 30.0,
+        step: float = 0.05,
+        backoff_factor: float = 2.0,
+    ) -> None:
+        super().__init__(min_interval, host_intervals)
+        self.floor = floor
+        self.ceiling = ceiling
+        self.step = step
+        self.backoff_factor = backoff_factor
+        self._current: Dict[str, float] = {}
+
+    def interval_for(self, host: str) -> float:
+        if host in self._current:
+            return self._current[host]
+        return super().interval_for(host)
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            interval = self.interval_for(host)
+            self._current[host] = max(min(self.floor, interval), interval - self.step)
+
+    def record_throttle(self, host: str, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            interval = max(self.interval_for(host), self.floor)
+            self._current[host] = min(self.ceiling, interval * self.backoff_factor)
+        super().record_throttle(host, retry_after)
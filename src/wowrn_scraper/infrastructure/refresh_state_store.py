@@ -0,0 +1,59 @@
+import json
+import threading
+from typing import Dict, Optional
+
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+
+EMPTY_STATE = {
+    "last_success": None,
+    "last_attempt": None,
+    "checks": 0,
+    "changes": 0,
+    "failures": 0,
+    "digest": None,
+}
+
+
+class RefreshStateStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._specs: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)["specs"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return {}
+
+    def get(self, key: str) -> Dict:
+        with self._lock:
+            return {**EMPTY_STATE, **self._specs.get(key, {})}
+
+    def record_success(self, key: str, digest: Optional[str], now: float) -> bool:
+        with self._lock:
+            state = {**EMPTY_STATE, **self._specs.get(key, {})}
+            changed = state["digest"] is not None and state["digest"] != digest
+            state.update(
+                last_success=now,
+                last_attempt=now,
+                checks=state["checks"] + 1,
+                changes=state["changes"] + int(changed),
+                failures=0,
+                digest=digest,
+            )
+            self._specs[key] = state
+        return changed
+
+    def record_failure(self, key: str, now: float) -> None:
+        with self._lock:
+            state = {**EMPTY_STATE, **self._specs.get(key, {})}
+            state.update(last_attempt=now, failures=state["failures"] + 1)
+            self._specs[key] = state
+
+    def save(self) -> None:
+        with self._lock:
+            specs = dict(sorted(self._specs.items()))
+        with atomic_open(self.path) as f:
+            json.dump({"specs": specs}, f, indent=1)
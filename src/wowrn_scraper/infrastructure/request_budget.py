@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+HOUR = 60 * 60
+
+
+class HourlyRequestBudget:
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, int]] = None,
+        default_limit: Optional[int] = None,
+        window: float = HOUR,
+    ) -> None:
+        self.host_limits: Dict[str, int] = dict(host_limits or {})
+        self.default_limit = default_limit
+        self.window = window
+        self._sent: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, host: str) -> Optional[int]:
+        return self.host_limits.get(host, self.default_limit)
+
+    def _recent(self, host: str, now: float) -> Deque[float]:
+        sent = self._sent.setdefault(host, deque())
+        while sent and sent[0] <= now - self.window:
+            sent.popleft()
+        return sent
+
+    def _wait(self, host: str, now: float) -> float:
+        limit = self.limit_for(host)
+        if limit is None:
+            return 0.0
+        sent = self._recent(host, now)
+        if len(sent) < limit:
+            return 0.0
+        if limit <= 0:
+            return self.window
+        return sent[len(sent) - limit] + self.window - now
+
+    def remaining(self, host: str) -> Optional[int]:
+        limit = self.limit_for(host)
+        if limit is None:
+            return None
+        with self._lock:
+            return max(0, limit - len(self._recent(host, time.monotonic())))
+
+    def wait_time(self, host: Optional[str] = None) -> float:
+        with self._lock:
+            now = time.monotonic()
+            hosts = [host] if host is not None else list(self.host_limits)
+            return max((self._wait(name, now) for name in hosts), default=0.0)
+
+    def acquire(self, host: str) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait(host, now)
+                if wait <= 0:
+                    if self.limit_for(host) is not None:
+                        self._sent[host].append(now)
+                    return waited
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from wowrn_scraper.domain.models import LOOT_FIELDS, ItemRegistry, SpecData
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+
+
+class SpecSnapshotStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    @staticmethod
+    def hash_markup(markup: str) -> str:
+        return hashlib.sha256(markup.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _without_loot(spec: Dict) -> Dict:
+        placements = list(spec.get("bis", {}).values())
+        placements += list(spec.get("trinkets", {}).values())
+        for items in placements:
+            for item in items:
+                for key in LOOT_FIELDS:
+                    item.pop(key, None)
+        return spec
+
+    def _path(self, class_name: str, spec_name: str) -> str:
+        return os.path.join(self.directory, class_name, f"{spec_name}.json")
+
+    def _read(self, class_name: str, spec_name: str) -> Optional[Dict]:
+        path = self._path(class_name, spec_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+
+    def stored_hash(self, class_name: str, spec_name: str) -> Optional[str]:
+        snapshot = self._read(class_name, spec_name)
+        return snapshot.get("markup_hash") if snapshot else None
+
+    def load(
+        self,
+        class_name: str,
+        spec_name: str,
+        markup_hash: str,
+        registry: Optional[ItemRegistry] = None,
+    ) -> Optional[SpecData]:
+        snapshot = self._read(class_name, spec_name)
+        if not snapshot or snapshot.get("markup_hash") != markup_hash:
+            return None
+
+        spec_data = SpecData.from_dict(
+            class_name, spec_name, self._without_loot(snapshot["spec"]), registry
+        )
+        spec_data.markup_hash = markup_hash
+        spec_data.reused = True
+        return spec_data
+
+    def save(self, spec_data: SpecData) -> None:
+        if spec_data.error or not spec_data.markup_hash:
+            return
+
+        path = self._path(spec_data.class_name, spec_data.spec_name)
+        snapshot = {
+            "markup_hash": spec_data.markup_hash,
+            "spec": self._without_loot(spec_data.to_dict()),
+        }
+        with atomic_open(path) as f:
+            json.dump(snapshot, f, ensure_ascii=False)
@@ -0,0 +1,143 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Dict, List, Optional
+
+from wowrn_scraper.domain.models import LOOT_FIELDS, ScrapingResult
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+
+SCHEMA = """
+CREATE TABLE items (
+    item_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    source_type TEXT,
+    boss_name TEXT,
+    location_name TEXT
+);
+CREATE TABLE specs (
+    spec_id INTEGER PRIMARY KEY,
+    class_name TEXT NOT NULL,
+    spec_name TEXT NOT NULL,
+    source TEXT,
+    url TEXT,
+    error TEXT,
+    UNIQUE (class_name, spec_name)
+);
+CREATE TABLE bis_placements (
+    spec_id INTEGER NOT NULL REFERENCES specs (spec_id),
+    context TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    slot TEXT,
+    item_id TEXT NOT NULL REFERENCES items (item_id),
+    PRIMARY KEY (spec_id, context, position)
+);
+CREATE TABLE trinket_tiers (
+    spec_id INTEGER NOT NULL REFERENCES specs (spec_id),
+    tier TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_id TEXT NOT NULL REFERENCES items (item_id),
+    PRIMARY KEY (spec_id, tier, position)
+);
+CREATE TABLE cartel_chips (
+    spec_id INTEGER NOT NULL REFERENCES specs (spec_id),
+    position INTEGER NOT NULL,
+    item_id TEXT NOT NULL REFERENCES items (item_id),
+    details TEXT,
+    PRIMARY KEY (spec_id, position)
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_items_boss ON items (boss_name);
+CREATE INDEX idx_items_location ON items (location_name);
+CREATE INDEX idx_bis_item ON bis_placements (item_id);
+CREATE INDEX idx_trinket_item ON trinket_tiers (item_id);
+CREATE INDEX idx_trinket_tier ON trinket_tiers (tier, item_id);
+CREATE INDEX idx_cartel_item ON cartel_chips (item_id);
+"""
+
+
+class SqliteStorageAdapter:
+    def save(self, result: ScrapingResult, output_path: str) -> None:
+        self.write(result.to_dict(), output_path)
+
+    def write(self, data: Dict, output_path: str) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            build_path = os.path.join(directory, "export.sqlite3")
+            conn = sqlite3.connect(build_path, isolation_level=None)
+            try:
+                self._populate(conn, data)
+            finally:
+                conn.close()
+
+            target = atomic_open(output_path, "wb", skip_unchanged=True)
+            with target as f, open(build_path, "rb") as build:
+                shutil.copyfileobj(build, f)
+
+        if target.changed:
+            print(f"Successfully exported SQLite database to {output_path}")
+        else:
+            print(f"{output_path} is unchanged, left untouched")
+
+    def _populate(self, conn: sqlite3.Connection, data: Dict) -> None:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+
+        items: Dict[str, List[Optional[str]]] = {}
+        specs = []
+        placements = []
+        trinkets = []
+        chips = []
+
+        def item_id(item: Dict) -> str:
+            row = items.get(item["id"])
+            if row is None:
+                items[item["id"]] = [item["name"]] + [
+                    item.get(key) for key in LOOT_FIELDS
+                ]
+            else:
+                for index, key in enumerate(LOOT_FIELDS, start=1):
+                    if row[index] is None:
+                        row[index] = item.get(key)
+            return item["id"]
+
+        for class_name, class_specs in data.items():
+            for spec_name, spec in class_specs.items():
+                spec_id = len(specs) + 1
+                specs.append(
+                    (
+                        spec_id,
+                        class_name,
+                        spec_name,
+                        spec.get("source"),
+                        spec.get("url"),
+                        spec.get("error"),
+                    )
+                )
+                for context, bis_items in spec.get("bis", {}).items():
+                    for position, item in enumerate(bis_items):
+                        placements.append(
+                            (spec_id, context, position, item["slot"], item_id(item))
+                        )
+                for tier, tier_items in spec.get("trinkets", {}).items():
+                    for position, item in enumerate(tier_items):
+                        trinkets.append((spec_id, tier, position, item_id(item)))
+                for position, chip in enumerate(spec.get("cartel_chips", [])):
+                    chips.append((spec_id, position, item_id(chip), chip["details"]))
+
+        conn.executescript(SCHEMA)
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?, ?)",
+            [(key, *row) for key, row in items.items()],
+        )
+        conn.executemany("INSERT INTO specs VALUES (?, ?, ?, ?, ?, ?)", specs)
+        conn.executemany(
+            "INSERT INTO bis_placements VALUES (?, ?, ?, ?, ?)", placements
+        )
+        conn.executemany("INSERT INTO trinket_tiers VALUES (?, ?, ?, ?)", trinkets)
+        conn.executemany("INSERT INTO cartel_chips VALUES (?, ?, ?, ?)", chips)
+        for statement in INDEXES.strip().splitlines():
+            conn.execute(statement)
+        conn.execute("COMMIT")
@@ -1,12 +1,17 @@
-import json
 import os
 import re
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, TypeVar
 
 import requests
 
-from wowrn_scraper.domain.models import Item, SlotItem, TrinketItem
+from wowrn_scraper.domain.models import Item, ItemRecord, ScrapingResult, SpecData
+from wowrn_scraper.infrastructure.http_client import HttpClient
+from wowrn_scraper.infrastructure.item_store import FALLBACK_LOOT_INFO, ItemStore
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+from wowrn_scraper.infrastructure.rate_limiter import AdaptiveRateLimiter
+
+ItemT = TypeVar("ItemT", bound=Item)
 
 
 class WowdbScraper:
@@ -18,41 +23,45 @@ class WowdbScraper:
             "Chrome/91.0.4472.124 Safari/537.36"
         )
     }
-
-    def __init__(self, cache_path: Optional[str] = None, batch_size: int = 10, batch_delay: float = 1.5) -> None:
+    REQUEST_INTERVAL = 0.15
+
+    def __init__(
+        self,
+        item_store: Optional[ItemStore] = None,
+        batch_size: int = 10,
+        batch_delay: float = 0.0,
+        http_client: Optional[HttpClient] = None,
+        metrics: Optional[RunMetrics] = None,
+    ) -> None:
         self.batch_size = batch_size
         self.batch_delay = batch_delay
-        
-        if cache_path is None:
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            cache_path = os.path.join(base_dir, "wowrn_scraper/data", "wowdb_item_cache.json")
-        
-        self.cache_path = cache_path
-        self.cache: Dict[str, Dict] = self._load_cache()
-
-    def _load_cache(self) -> Dict[str, Dict]:
-        if os.path.exists(self.cache_path):
-            try:
-                with open(self.cache_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
+        self.http_client = http_client or HttpClient(
+            headers=self.HEADERS,
+            rate_limiter=AdaptiveRateLimiter(
+                min_interval=self.REQUEST_INTERVAL, floor=self.REQUEST_INTERVAL
+            ),
+        )
 
-    def _save_cache(self) -> None:
-        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
-        with open(self.cache_path, "w", encoding="utf-8") as f:
-            json.dump(self.cache, f, indent=2, ensure_ascii=False)
+        if item_store is None:
+            data_dir = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+            )
+            item_store = ItemStore(
+                os.path.join(data_dir, "item_store.sqlite3"),
+                legacy_cache_path=os.path.join(data_dir, "wowdb_item_cache.json"),
+            )
+
+        self.item_store = item_store
+        self.metrics = metrics or RunMetrics()
 
     def _fetch_item_page(self, item_id: str) -> Optional[str]:
         url = f"{self.BASE_URL}/{item_id}"
         try:
-            response = requests.get(url, headers=self.HEADERS, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            print(f"  Failed to fetch item {item_id}: {e}")
-            return None
+            return self.http_client.get(url, timeout=10).text
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
 
     def _parse_drop_info(self, html: str) -> Dict[str, Optional[str]]:
         pattern = r'<dd class="item-extra">Dropped by <b>(.+?)</b> - (.+?)\.</dd>'
@@ -73,75 +82,132 @@ class WowdbScraper:
                 "location_name": location_name,
             }
 
-        return {
-            "source_type": "quest, vendor or crafted",
-            "boss_name": None,
-            "location_name": None,
-        }
+        return dict(FALLBACK_LOOT_INFO)
 
     def get_item_loot_info(self, item_id: str) -> Dict[str, Optional[str]]:
-        if item_id in self.cache:
-            return self.cache[item_id]
+        cached = self.item_store.get_loot_info(item_id)
+        if cached:
+            return cached
+        return self._fetch_loot_info(item_id)
 
-        html = self._fetch_item_page(item_id)
+    def _fetch_loot_info(self, item_id: str) -> Dict[str, Optional[str]]:
+        try:
+            html = self._fetch_item_page(item_id)
+        except requests.RequestException as e:
+            print(f"  Failed to fetch item {item_id}, will retry next run: {e}")
+            self.metrics.increment("items_unresolved_total")
+            return dict(FALLBACK_LOOT_INFO)
+        return self._store_loot_info(item_id, html)
+
+    def _store_loot_info(
+        self, item_id: str, html: Optional[str]
+    ) -> Dict[str, Optional[str]]:
         if not html:
-            info = {
-                "source_type": "quest, vendor or crafted",
-                "boss_name": None,
-                "location_name": None,
-            }
-        else:
-            info = self._parse_drop_info(html)
+            info = dict(FALLBACK_LOOT_INFO)
+            self.item_store.put_loot_info(item_id, info, negative=True)
+            return info
 
-        self.cache[item_id] = info
+        info = self._parse_drop_info(html)
+        self.item_store.put_loot_info(item_id, info)
         return info
 
-    def enrich_items_batch(self, items: List[Item]) -> List[Item]:
-        enriched = []
-        total_items = len(items)
+    def loot_history(
+        self, item_ids: List[str]
+    ) -> Dict[str, Tuple[Optional[float], int, int]]:
+        return self.item_store.loot_history(item_ids)
+
+    def refresh_items(self, item_ids: List[str]) -> Dict[str, Dict]:
+        refreshed: Dict[str, Dict] = {}
+        for item_id in item_ids:
+            try:
+                html = self._fetch_item_page(item_id)
+            except requests.RequestException as e:
+                print(f"  Failed to refresh item {item_id}: {e}")
+                continue
+            refreshed[item_id] = self._store_loot_info(item_id, html)
+        return refreshed
+
+    def _resolve_loot_info(self, item_ids: List[str]) -> Dict[str, Dict]:
+        resolved = self.item_store.get_many_loot_info(item_ids)
+        pending = [item_id for item_id in item_ids if item_id not in resolved]
+        total_batches = (len(pending) + self.batch_size - 1) // self.batch_size
+        print(
+            f"  {len(item_ids)} unique items, {len(item_ids) - len(pending)} cached, "
+            f"{len(pending)} to fetch."
+        )
 
-        for batch_idx in range(0, len(items), self.batch_size):
-            batch = items[batch_idx : batch_idx + self.batch_size]
+        for batch_idx in range(0, len(pending), self.batch_size):
+            batch = pending[batch_idx : batch_idx + self.batch_size]
             batch_num = batch_idx // self.batch_size + 1
-            total_batches = (len(items) + self.batch_size - 1) // self.batch_size
-
-            print(f"    Processing batch {batch_num}/{total_batches} ({len(batch)} items)...")
-
-            for item in batch:
-                loot_info = self.get_item_loot_info(item.id)
-                if isinstance(item, SlotItem):
-                    enriched_item = SlotItem(
-                        id=item.id,
-                        name=item.name,
-                        slot=item.slot,
-                        source_type=loot_info["source_type"],
-                        boss_name=loot_info["boss_name"],
-                        location_name=loot_info["location_name"],
-                    )
-                elif isinstance(item, TrinketItem):
-                    enriched_item = TrinketItem(
-                        id=item.id,
-                        name=item.name,
-                        tier=item.tier,
-                        source_type=loot_info["source_type"],
-                        boss_name=loot_info["boss_name"],
-                        location_name=loot_info["location_name"],
-                    )
-                else:
-                    enriched_item = Item(
-                        id=item.id,
-                        name=item.name,
-                        source_type=loot_info["source_type"],
-                        boss_name=loot_info["boss_name"],
-                        location_name=loot_info["location_name"],
-                    )
-
-                enriched.append(enriched_item)
-
-            if batch_idx + self.batch_size < len(items):
+            done = batch_idx + len(batch)
+
+            print(
+                f"    Processing batch {batch_num}/{total_batches} "
+                f"({done}/{len(pending)} items)..."
+            )
+            for item_id in batch:
+                resolved[item_id] = self._fetch_loot_info(item_id)
+
+            if self.batch_delay and done < len(pending):
                 print(f"    Waiting {self.batch_delay}s before next batch...")
                 time.sleep(self.batch_delay)
+                self.metrics.increment(
+                    "sleep_seconds_total", self.batch_delay, reason="batch_delay"
+                )
+
+        return resolved
+
+    def _enrich_records(self, records: List[ItemRecord]) -> int:
+        fallback = FALLBACK_LOOT_INFO["source_type"]
+        records = [
+            record
+            for record in records
+            if record.source_type is None or record.source_type == fallback
+        ]
+        item_ids = list(dict.fromkeys(record.id for record in records))
+        with self.metrics.timer("enrich_seconds"):
+            resolved = self._resolve_loot_info(item_ids)
+        for record in records:
+            record.update_loot(resolved[record.id])
+        return len(item_ids)
+
+    def enrich_items_batch(self, items: List[ItemT]) -> List[ItemT]:
+        self._enrich_records(list({id(i.record): i.record for i in items}.values()))
+        print(f"  Enriched {len(items)} items.")
+        return list(items)
+
+    @staticmethod
+    def _spec_records(spec_data: SpecData) -> Iterator[ItemRecord]:
+        for bis_list in spec_data.bis_lists.values():
+            for item in bis_list.items:
+                yield item.record
+        if spec_data.trinket_tier_list:
+            for items in spec_data.trinket_tier_list.tiers.values():
+                for item in items:
+                    yield item.record
+
+    def enrich_spec(self, spec_data: SpecData) -> None:
+        if spec_data.error:
+            return
+        records = {id(r): r for r in self._spec_records(spec_data)}
+        unique_items = self._enrich_records(list(records.values()))
+        print(
+            f"  Enriched {spec_data.spec_name} {spec_data.class_name} "
+            f"from {unique_items} unique items."
+        )
 
-        self._save_cache()
-        print(f"  Enriched {total_items} items. Cache saved.")
-        return enriched
+    def enrich_result(self, result: ScrapingResult) -> None:
+        specs = [
+            spec_data
+            for class_specs in result.specs.values()
+            for spec_data in class_specs.values()
+            if not spec_data.error
+        ]
+
+        records: Dict[int, ItemRecord] = {}
+        for spec_data in specs:
+            for record in self._spec_records(spec_data):
+                records.setdefault(id(record), record)
+
+        unique_items = self._enrich_records(list(records.values()))
+        print(f"  Enriched {len(specs)} specs from {unique_items} unique items.")
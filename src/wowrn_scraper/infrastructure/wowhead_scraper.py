@@ -1,21 +1,70 @@
-import json
 import re
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import requests
 
 from wowrn_scraper.domain.models import (
+    PAGE_NAME,
+    STORE_NAME,
     BisList,
     CartelChipItem,
+    ItemRecord,
+    ItemRegistry,
     SlotItem,
     SpecData,
     TrinketItem,
     TrinketTierList,
+    placeholder_name,
 )
+from wowrn_scraper.infrastructure.http_client import HttpClient, HttpResponse
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+from wowrn_scraper.infrastructure.page_scanner import scan_page
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+from wowrn_scraper.infrastructure.spec_snapshot_store import SpecSnapshotStore
+
+BIS_BLOCK_PATTERN = re.compile(r"\[tabs[^\]]*bis_items[^\]]*\]")
+BIS_CONTEXTS = ("Overall", "Raid", "Mythic+")
+BOLD_PATTERN = re.compile(r"\[b\](.*?)\[/b\]")
+CARTEL_CHIPS_TITLE = "Puzzling Cartel Chips"
+CARTEL_CHIPS_TOC = f'toc="{CARTEL_CHIPS_TITLE}"'
+# Tried in priority order on purpose: the first two are case-sensitive literals
+# that the regex engine finds with a fast substring search, and guides nearly
+# always carry the toc heading. A single case-insensitive scan that classifies
+# every "Cartel Chip" mention was measured at 1.7 ms/spec vs 0.9 ms/spec.
+CARTEL_SECTION_PATTERNS = (
+    re.compile(re.escape(CARTEL_CHIPS_TOC) + r"\]"),
+    re.compile(re.escape(CARTEL_CHIPS_TITLE) + r"\[/h2\]"),
+    re.compile(r"Cartel Chip[s]?\b", re.IGNORECASE),
+)
+CELL_PATTERN = re.compile(r"\[td.*?\](.*?)\[/td\]", re.DOTALL)
+ITEM_LINK_PATTERN = re.compile(r"\[item=(\d+)")
+ITEM_REF_PATTERN = re.compile(r"item=(\d+)")
+SECTION_END_PATTERN = re.compile(r"\[h[12]")
+STRIP_TAGS_PATTERN = re.compile(r"\[.*?\]")
+TAB_SPLIT_PATTERN = re.compile(r'\[tab name="([^"]+)"')
+TIER_LABEL_PATTERN = re.compile(r"\[tier-label.*?\](.*?)\[/tier-label\]")
+
+
+def _blocks(text: str, opening: str, closing: str) -> Iterator[str]:
+    start = text.find(opening)
+    while start >= 0:
+        inner = start + len(opening)
+        end = text.find(closing, inner)
+        if end < 0:
+            return
+        yield text[inner:end]
+        start = text.find(opening, end + len(closing))
+
+
+def _first_block(text: str, opening: str, closing: str) -> Optional[str]:
+    return next(_blocks(text, opening, closing), None)
 
 
 class WowheadScraper:
+    SOURCE = "wowhead"
     BASE_URL = "https://www.wowhead.com/guide/classes"
     ITEM_URL = "https://www.wowhead.com/item"
     HEADERS = {
@@ -26,9 +75,31 @@ class WowheadScraper:
         )
     }
 
-    def __init__(self, delay: float = 1.0) -> None:
+    def __init__(
+        self,
+        delay: float = 1.0,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        http_client: Optional[HttpClient] = None,
+        snapshot_store: Optional[SpecSnapshotStore] = None,
+        full: bool = False,
+        item_store: Optional[ItemStore] = None,
+        name_workers: int = 4,
+        metrics: Optional[RunMetrics] = None,
+        item_registry: Optional[ItemRegistry] = None,
+        parse_pool: Optional[Executor] = None,
+    ) -> None:
         self.delay = delay
-        self._item_name_cache: Dict[str, str] = {}
+        self.name_workers = max(1, name_workers)
+        self.snapshot_store = snapshot_store
+        self.full = full
+        self.http_client = http_client or HttpClient(
+            headers=self.HEADERS,
+            rate_limiter=rate_limiter or HostRateLimiter(min_interval=delay),
+        )
+        self.item_store = item_store or ItemStore(":memory:")
+        self.metrics = metrics or RunMetrics()
+        self.item_registry = item_registry
+        self.parse_pool = parse_pool
 
     def scrape_spec(self, class_name: str, spec_name: str) -> SpecData:
         url = f"{self.BASE_URL}/{class_name}/{spec_name}/bis-gear"
@@ -36,17 +107,44 @@ class WowheadScraper:
 
         html = self._get_html(url)
         if not html:
+            self.metrics.increment("specs_total", status="failed")
             return SpecData(
                 class_name=class_name,
                 spec_name=spec_name,
                 error="Failed to fetch",
             )
 
-        item_mapping = self._extract_item_mapping(html)
-        markup = self._extract_guide_markup(html)
+        parse_started = time.perf_counter()
+        if self.parse_pool is not None:
+            known_hash = self._stored_hash(class_name, spec_name)
+            spec_data = self.parse_pool.submit(
+                parse_guide_page, class_name, spec_name, url, html, known_hash
+            ).result()
+            if spec_data.error:
+                print("  No Guide Markup found.")
+                self.metrics.increment("specs_total", status="failed")
+                return spec_data
+            if known_hash is not None and spec_data.markup_hash == known_hash:
+                previous = self._load_snapshot(known_hash, class_name, spec_name)
+                if previous:
+                    return previous
+                spec_data = self.parse_pool.submit(
+                    parse_guide_page, class_name, spec_name, url, html
+                ).result()
+            known = {
+                record.id: record.name
+                for record in spec_data.iter_records()
+                if record.name != self._placeholder_name(record.id)
+            }
+            for record in spec_data.iter_records():
+                record.name = self._get_item_name(record.id, known)
+            return self._finish_parse(spec_data, parse_started, known)
+
+        markup, item_mapping = self._scan_page(html)
 
         if not markup:
             print("  No Guide Markup found.")
+            self.metrics.increment("specs_total", status="failed")
             return SpecData(
                 class_name=class_name,
                 spec_name=spec_name,
@@ -54,125 +152,191 @@ class WowheadScraper:
                 error="No markup found",
             )
 
-        bis_lists = self._parse_bis_items(markup, item_mapping)
-        cartel_chips = self._parse_cartel_chips(markup, item_mapping)
-        trinket_tier_list = self._parse_trinkets(markup, item_mapping)
-
-        time.sleep(self.delay)
+        markup_hash = SpecSnapshotStore.hash_markup(markup)
+        previous = self._load_snapshot(markup_hash, class_name, spec_name)
+        if previous:
+            return previous
 
+        spec_data = self.parse_markup(
+            class_name, spec_name, url, markup, item_mapping, markup_hash
+        )
+        return self._finish_parse(spec_data, parse_started, item_mapping)
+
+    def parse_markup(
+        self,
+        class_name: str,
+        spec_name: str,
+        url: str,
+        markup: str,
+        item_mapping: Dict[str, str],
+        markup_hash: Optional[str] = None,
+    ) -> SpecData:
         return SpecData(
             class_name=class_name,
             spec_name=spec_name,
             url=url,
-            bis_lists=bis_lists,
-            cartel_chips=cartel_chips,
-            trinket_tier_list=trinket_tier_list,
+            bis_lists=self._parse_bis_items(markup, item_mapping),
+            cartel_chips=self._parse_cartel_chips(markup, item_mapping),
+            trinket_tier_list=self._parse_trinkets(markup, item_mapping),
+            markup_hash=markup_hash or SpecSnapshotStore.hash_markup(markup),
+        )
+
+    def _stored_hash(self, class_name: str, spec_name: str) -> Optional[str]:
+        if not self.snapshot_store or self.full:
+            return None
+        return self.snapshot_store.stored_hash(class_name, spec_name)
+
+    def _load_snapshot(
+        self, markup_hash: str, class_name: str, spec_name: str
+    ) -> Optional[SpecData]:
+        if not self.snapshot_store or self.full:
+            return None
+        previous = self.snapshot_store.load(
+            class_name, spec_name, markup_hash, self.item_registry
         )
+        if previous:
+            print("  Guide unchanged, reusing previous result.")
+            self.metrics.increment("specs_total", status="reused")
+            self._resolve_unknown_names(previous)
+        return previous
+
+    def _finish_parse(
+        self,
+        spec_data: SpecData,
+        parse_started: float,
+        item_mapping: Dict[str, str],
+    ) -> SpecData:
+        parse_seconds = time.perf_counter() - parse_started
+        self.metrics.observe("parse_seconds", parse_seconds)
+        self.metrics.set(
+            "spec_parse_seconds",
+            parse_seconds,
+            class_name=spec_data.class_name,
+            spec=spec_data.spec_name,
+        )
+        self.metrics.increment("specs_total", status="parsed")
+        self._adopt_records(spec_data, item_mapping)
+        self._resolve_unknown_names(spec_data)
+        return spec_data
+
+    def _adopt_records(self, spec_data: SpecData, item_mapping: Dict[str, str]) -> None:
+        if self.item_registry is None:
+            return
+        adopted: Dict[int, ItemRecord] = {}
+        for item in spec_data.iter_items():
+            record = item.record
+            if id(record) not in adopted:
+                source = PAGE_NAME if record.id in item_mapping else STORE_NAME
+                adopted[id(record)] = self.item_registry.record(
+                    record.id,
+                    record.name,
+                    rank=(source, spec_data.class_name, spec_data.spec_name),
+                )
+            item.record = adopted[id(record)]
 
     def _get_html(self, url: str) -> Optional[str]:
         try:
-            response = requests.get(url, headers=self.HEADERS)
-            response.raise_for_status()
-            return response.text
+            return self.http_client.get(url, revalidate=True).text
         except requests.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return None
 
     def _fetch_item_name(self, item_id: str) -> Optional[str]:
-        if item_id in self._item_name_cache:
-            return self._item_name_cache[item_id]
+        cached = self.item_store.get_name(item_id)
+        if cached:
+            return cached
 
         try:
             url = f"{self.ITEM_URL}={item_id}"
-            response = requests.get(
-                url, headers=self.HEADERS, allow_redirects=True, timeout=10
-            )
+            response = self.http_client.get(url, allow_redirects=True, timeout=10)
             if response.status_code == 200:
                 final_url = response.url
                 if "/" in final_url.split("item=")[-1]:
                     slug = final_url.split("/")[-1].split("?")[0]
                     if slug and slug != str(item_id):
                         name = self._slug_to_name(slug)
-                        self._item_name_cache[item_id] = name
+                        self.item_store.put_name(item_id, name)
                         return name
         except requests.RequestException:
             pass
         return None
 
-    def _get_item_name(
-        self, item_id: str, item_mapping: Dict[str, str]
-    ) -> str:
+    @staticmethod
+    def _placeholder_name(item_id: str) -> str:
+        return placeholder_name(item_id)
+
+    def _get_item_name(self, item_id: str, item_mapping: Dict[str, str]) -> str:
         if item_id in item_mapping:
             return item_mapping[item_id]
 
-        if item_id in self._item_name_cache:
-            return self._item_name_cache[item_id]
-
-        name = self._fetch_item_name(item_id)
+        name = self.item_store.get_name(item_id)
         if name:
             return name
 
-        return f"Item {item_id}"
+        return self._placeholder_name(item_id)
 
-    def _extract_item_mapping_from_anchors(self, html: str) -> Dict[str, str]:
-        mapping: Dict[str, str] = {}
-        anchor_pattern = re.compile(
-            r'href="[^"]*?/item=(\d+)/([a-z0-9-]+)', re.IGNORECASE
-        )
-        bbcode_pattern = re.compile(
-            r'\[url=item=(\d+)/([a-z0-9-]+)', re.IGNORECASE
-        )
-        for pattern in [anchor_pattern, bbcode_pattern]:
-            for match in pattern.finditer(html):
-                item_id = match.group(1)
-                slug = match.group(2)
+    def _item_record(self, item_id: str, item_mapping: Dict[str, str]) -> ItemRecord:
+        return ItemRecord(item_id, self._get_item_name(item_id, item_mapping))
 
-                if item_id not in mapping:
-                    name = self._slug_to_name(slug)
-                    mapping[item_id] = name
+    def _resolve_item_names(self, item_ids: List[str]) -> Dict[str, str]:
+        if not item_ids:
+            return {}
 
-        return mapping
+        workers = min(self.name_workers, len(item_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            names = list(executor.map(self._fetch_item_name, item_ids))
+        return {iid: name for iid, name in zip(item_ids, names) if name}
+
+    def _resolve_unknown_names(self, spec_data: SpecData) -> None:
+        unknown = [
+            record
+            for record in spec_data.iter_records()
+            if record.name == self._placeholder_name(record.id)
+        ]
+        if not unknown:
+            return
+
+        unknown_ids = list(dict.fromkeys(record.id for record in unknown))
+        print(f"  Resolving {len(unknown_ids)} unknown item names...")
+        names = self._resolve_item_names(unknown_ids)
+        rank = (STORE_NAME, spec_data.class_name, spec_data.spec_name)
+        for record in unknown:
+            if record.id not in names:
+                continue
+            if self.item_registry is None:
+                record.name = names[record.id]
+            else:
+                self.item_registry.record(record.id, names[record.id], rank=rank)
+
+    def _scan_page(self, html: str) -> Tuple[Optional[str], Dict[str, str]]:
+        scan = scan_page(html)
+        mapping = {
+            item_id: self._slug_to_name(slug) for item_id, slug in scan.slugs.items()
+        }
+        mapping.update(scan.names)
+        return scan.markup, mapping
 
     def _extract_item_mapping(self, html: str) -> Dict[str, str]:
-        mapping: Dict[str, str] = {}
-        anchor_mapping = self._extract_item_mapping_from_anchors(html)
-        mapping.update(anchor_mapping)
-        pattern = re.compile(
-            r"WH\.Gatherer\.addData\(3, 1,\s*({.*?})\);", re.DOTALL
-        )
-        matches = pattern.findall(html)
-        for json_str in matches:
-            try:
-                data = json.loads(json_str)
-                for item_id, info in data.items():
-                    if "name_enus" in info:
-                        mapping[str(item_id)] = info["name_enus"]
-            except json.JSONDecodeError as e:
-                print(f"Error decoding item mapping JSON: {e}")
-        return mapping
+        return self._scan_page(html)[1]
 
     def _extract_guide_markup(self, html: str) -> Optional[str]:
-        pattern = re.compile(
-            r'WH\.markup\.printHtml\(\s*"(.*?)"\s*,\s*"guide-body"', re.DOTALL
-        )
-        match = pattern.search(html)
-        if match:
-            raw_content = match.group(1)
-            content = raw_content.replace(r"\"", '"')
-            content = content.replace(r"\/", "/")
-            content = content.replace(r"\r", "").replace(r"\n", "\n")
-            return content
-        return None
-
-    def _parse_item_link(self, text: str) -> Optional[str]:
-        match = re.search(r"\[item=(\d+)", text)
-        if match:
-            return match.group(1)
-        return None
+        return scan_page(html).markup
 
     def _slug_to_name(self, slug: str) -> str:
         words = slug.replace("-", " ").split()
-        small_words = {"of", "the", "a", "an", "and", "or", "for", "in", "on", "at", "to"}
+        small_words = {
+            "of",
+            "the",
+            "a",
+            "an",
+            "and",
+            "or",
+            "for",
+            "in",
+            "on",
+            "at",
+            "to",
+        }
 
         result = []
         for i, word in enumerate(words):
@@ -183,154 +347,165 @@ class WowheadScraper:
 
         return " ".join(result)
 
+    def _parse_item_link(self, text: str) -> Optional[str]:
+        match = ITEM_LINK_PATTERN.search(text)
+        if match:
+            return match.group(1)
+        return None
+
     def _parse_bis_items(
         self, markup: str, item_mapping: Dict[str, str]
     ) -> Dict[str, BisList]:
         bis_data: Dict[str, BisList] = {}
-        bis_block_match = re.search(
-            r"\[tabs[^\]]*bis_items[^\]]*\](.*?)\[/tabs\]", markup, re.DOTALL
-        )
-
+        bis_block_match = BIS_BLOCK_PATTERN.search(markup)
         if not bis_block_match:
             return bis_data
+        block_end = markup.find("[/tabs]", bis_block_match.end())
+        if block_end < 0:
+            return bis_data
 
-        block_content = bis_block_match.group(1)
-        tabs = re.split(r'\[tab name="([^"]+)"', block_content)
+        tabs = TAB_SPLIT_PATTERN.split(markup[bis_block_match.end() : block_end])
 
         for i in range(1, len(tabs), 2):
             tab_name = tabs[i]
-            content = tabs[i + 1]
-
-            if tab_name in ["Overall", "Raid", "Mythic+"]:
-                rows = re.findall(r"\[tr\](.*?)\[/tr\]", content, re.DOTALL)
-                items: List[SlotItem] = []
-
-                for row in rows:
-                    cells = re.findall(r"\[td.*?\](.*?)\[/td\]", row, re.DOTALL)
-                    if not cells:
-                        continue
-
-                    row_item_id = None
-                    slot_name = "Unknown"
-
-                    if len(cells) > 0:
-                        slot_match = re.search(r"\[b\](.*?)\[/b\]", cells[0])
-                        if slot_match:
-                            slot_name = slot_match.group(1)
-                        else:
-                            slot_name = re.sub(r"\[.*?\]", "", cells[0]).strip()
-
-                    for cell in cells:
-                        iid = self._parse_item_link(cell)
-                        if iid:
-                            row_item_id = iid
-                            break
-
-                    if row_item_id:
-                        items.append(
-                            SlotItem(
-                                id=row_item_id,
-                                name=self._get_item_name(row_item_id, item_mapping),
-                                slot=slot_name,
-                            )
+            if tab_name not in BIS_CONTEXTS:
+                continue
+
+            items: List[SlotItem] = []
+            for row in _blocks(tabs[i + 1], "[tr]", "[/tr]"):
+                cells = CELL_PATTERN.findall(row)
+                if not cells:
+                    continue
+
+                slot_match = BOLD_PATTERN.search(cells[0])
+                if slot_match:
+                    slot_name = slot_match.group(1)
+                else:
+                    slot_name = STRIP_TAGS_PATTERN.sub("", cells[0]).strip()
+
+                row_item_id = next(
+                    (iid for iid in map(self._parse_item_link, cells) if iid), None
+                )
+
+                if row_item_id:
+                    items.append(
+                        SlotItem(
+                            slot=slot_name,
+                            record=self._item_record(row_item_id, item_mapping),
                         )
+                    )
 
-                bis_data[tab_name] = BisList(context=tab_name, items=items)
+            bis_data[tab_name] = BisList(context=tab_name, items=items)
 
         return bis_data
 
+    def _find_cartel_section(self, markup: str) -> Optional[str]:
+        for pattern in CARTEL_SECTION_PATTERNS:
+            match = pattern.search(markup)
+            if match:
+                end = SECTION_END_PATTERN.search(markup, match.end())
+                section = markup[match.end() : end.start() if end else len(markup)]
+                if section:
+                    return section
+                break
+
+        toc_at = markup.find(CARTEL_CHIPS_TOC + "]")
+        if toc_at >= 0:
+            return markup[toc_at + len(CARTEL_CHIPS_TOC) + 1 :]
+        return None
+
     def _parse_cartel_chips(
         self, markup: str, item_mapping: Dict[str, str]
     ) -> List[CartelChipItem]:
         chips: List[CartelChipItem] = []
         seen_ids: set = set()
-        if "Puzzling Cartel Chips" not in markup and "Cartel Chip" not in markup:
+        if CARTEL_CHIPS_TITLE not in markup and "Cartel Chip" not in markup:
             return chips
 
-        section = None
-        section_patterns = [
-            (r'toc="Puzzling Cartel Chips"\](.*?)(?:\[h2|\[h1|$)', re.DOTALL),
-            (r'Puzzling Cartel Chips\[/h2\](.*?)(?:\[h2|\[h1|$)', re.DOTALL),
-            (r'Cartel Chip[s]?\b(.*?)(?:\[h2|\[h1|$)', re.DOTALL | re.IGNORECASE),
-        ]
-
-        for pattern, flags in section_patterns:
-            match = re.search(pattern, markup, flags)
-            if match:
-                section = match.group(1)
-                break
-
-        if not section:
-            parts = markup.split('toc="Puzzling Cartel Chips"]')
-            if len(parts) >= 2:
-                section = parts[1]
-
+        section = self._find_cartel_section(markup)
         if not section:
             return chips
 
-        for list_pattern in [r"\[ol\](.*?)\[/ol\]", r"\[ul\](.*?)\[/ul\]"]:
-            list_match = re.search(list_pattern, section, re.DOTALL)
-            if list_match:
-                list_content = list_match.group(1)
-                lis = re.findall(r"\[li\](.*?)\[/li\]", list_content, re.DOTALL)
-                for li in lis:
+        item_ids: List[str] = []
+        for list_tag in ("ol", "ul"):
+            list_content = _first_block(section, f"[{list_tag}]", f"[/{list_tag}]")
+            if list_content is not None:
+                for li in _blocks(list_content, "[li]", "[/li]"):
                     iid = self._parse_item_link(li)
-                    if iid and iid not in seen_ids:
-                        chips.append(
-                            CartelChipItem(
-                                id=iid,
-                                name=self._get_item_name(iid, item_mapping),
-                                details="Myth",
-                            )
-                        )
-                        seen_ids.add(iid)
-
-        if not chips:
-            item_ids = re.findall(r"\[item=(\d+)", section)
-            for iid in item_ids:
-                if iid not in seen_ids:
-                    chips.append(
-                        CartelChipItem(
-                            id=iid,
-                            name=self._get_item_name(iid, item_mapping),
-                            details="Myth",
-                        )
+                    if iid:
+                        item_ids.append(iid)
+        if not item_ids:
+            item_ids = ITEM_LINK_PATTERN.findall(section)
+
+        for iid in item_ids:
+            if iid not in seen_ids:
+                chips.append(
+                    CartelChipItem(
+                        details="Myth", record=self._item_record(iid, item_mapping)
                     )
-                    seen_ids.add(iid)
+                )
+                seen_ids.add(iid)
         return chips
 
     def _parse_trinkets(
         self, markup: str, item_mapping: Dict[str, str]
     ) -> TrinketTierList:
         trinkets: Dict[str, List[TrinketItem]] = {}
-        match = re.search(
-            r"\[tier-list=rows\](.*?)\[/tier-list\]", markup, re.DOTALL
-        )
-        if match:
-            content = match.group(1)
-            tiers = re.findall(r"\[tier\](.*?)\[/tier\]", content, re.DOTALL)
-            for tier in tiers:
-                rank_match = re.search(
-                    r"\[tier-label.*?\](.*?)\[/tier-label\]", tier
-                )
+        tier_list = _first_block(markup, "[tier-list=rows]", "[/tier-list]")
+        if tier_list is not None:
+            for tier in _blocks(tier_list, "[tier]", "[/tier]"):
+                rank_match = TIER_LABEL_PATTERN.search(tier)
                 rank = rank_match.group(1) if rank_match else "Unknown"
-                cnt_match = re.search(
-                    r"\[tier-content\](.*?)\[/tier-content\]", tier, re.DOTALL
-                )
+                content = _first_block(tier, "[tier-content]", "[/tier-content]")
                 items: List[TrinketItem] = []
-                if cnt_match:
-                    item_ids = re.findall(r"item=(\d+)", cnt_match.group(1))
+                if content is not None:
                     seen_ids: set = set()
-                    for iid in item_ids:
+                    for iid in ITEM_REF_PATTERN.findall(content):
                         if iid not in seen_ids:
                             items.append(
                                 TrinketItem(
-                                    id=iid,
-                                    name=self._get_item_name(iid, item_mapping),
                                     tier=rank,
+                                    record=self._item_record(iid, item_mapping),
                                 )
                             )
                             seen_ids.add(iid)
                 trinkets[rank] = items
 
         return TrinketTierList(tiers=trinkets)
+
+
+class OfflineHttpClient:
+    def get(self, url: str, **kwargs: object) -> HttpResponse:
+        raise requests.RequestException(f"{url} cannot be fetched while parsing")
+
+
+_worker_parser: Optional[WowheadScraper] = None
+
+
+def parse_guide_page(
+    class_name: str,
+    spec_name: str,
+    url: str,
+    html: str,
+    known_hash: Optional[str] = None,
+) -> SpecData:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = WowheadScraper(http_client=OfflineHttpClient())
+
+    markup, item_mapping = _worker_parser._scan_page(html)
+    if not markup:
+        return SpecData(
+            class_name=class_name,
+            spec_name=spec_name,
+            url=url,
+            error="No markup found",
+        )
+    markup_hash = SpecSnapshotStore.hash_markup(markup)
+    if markup_hash == known_hash:
+        return SpecData(
+            class_name=class_name, spec_name=spec_name, url=url, markup_hash=markup_hash
+        )
+    return _worker_parser.parse_markup(
+        class_name, spec_name, url, markup, item_mapping, markup_hash
+    )
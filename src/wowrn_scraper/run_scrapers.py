@@ -1,72 +1,443 @@
+import argparse
+import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+from wowrn_scraper.application.refresh_scheduler import (
+    HOUR,
+    RefreshPolicy,
+    RefreshScheduler,
+)
 from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.application.source_registry import SourceRegistry
 from wowrn_scraper.config import WOW_CLASSES
+from wowrn_scraper.domain.delta import diff_results
+from wowrn_scraper.domain.models import ItemRegistry, ScrapingResult
+from wowrn_scraper.infrastructure.atomic_file import atomic_open
+from wowrn_scraper.infrastructure.http_client import (
+    ArchiveHttpClient,
+    HttpClient,
+    ValidatorStore,
+)
+from wowrn_scraper.infrastructure.item_store import ItemStore
 from wowrn_scraper.infrastructure.json_adapter import JsonStorageAdapter
-from wowrn_scraper.infrastructure.lua_adapter import LuaStorageAdapter
-from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+from wowrn_scraper.infrastructure.lua_adapter import (
+    LoadOnDemandLuaAdapter,
+    LuaStorageAdapter,
+)
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+from wowrn_scraper.infrastructure.page_archive import PageArchive
+from wowrn_scraper.infrastructure.rate_limiter import (
+    AdaptiveRateLimiter,
+    HostRateLimiter,
+)
+from wowrn_scraper.infrastructure.refresh_state_store import RefreshStateStore
+from wowrn_scraper.infrastructure.request_budget import HourlyRequestBudget
+from wowrn_scraper.infrastructure.spec_snapshot_store import SpecSnapshotStore
+from wowrn_scraper.infrastructure.sqlite_adapter import SqliteStorageAdapter
 from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
-from wowrn_scraper.domain.models import SlotItem, TrinketItem
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.join(BASE_DIR, "data")
+DEFAULT_LUA_OUTPUT = os.path.join(
+    BASE_DIR, "..", "..", "Interface", "Addons", "WOWRN", "Data.lua"
+)
+
+
+def select_class_specs(
+    classes: Optional[List[str]] = None, specs: Optional[List[str]] = None
+) -> Dict[str, List[str]]:
+    if not classes and not specs:
+        return {name: list(names) for name, names in WOW_CLASSES.items()}
+
+    wanted: Dict[str, set] = {}
+    for class_name in classes or []:
+        if class_name not in WOW_CLASSES:
+            raise ValueError(f"Unknown class: {class_name}")
+        wanted[class_name] = set(WOW_CLASSES[class_name])
+    for target in specs or []:
+        class_name, _, spec_name = target.partition("/")
+        if spec_name not in WOW_CLASSES.get(class_name, []):
+            raise ValueError(f"Unknown spec: {target} (expected class/spec)")
+        wanted.setdefault(class_name, set()).add(spec_name)
+
+    return {
+        class_name: [spec for spec in names if spec in wanted[class_name]]
+        for class_name, names in WOW_CLASSES.items()
+        if class_name in wanted
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m wowrn_scraper", description="Scrape WoW gear rankings."
+    )
+    parser.add_argument(
+        "--class",
+        dest="classes",
+        action="append",
+        metavar="CLASS",
+        help="Only scrape this class, e.g. death-knight (repeatable).",
+    )
+    parser.add_argument(
+        "--spec",
+        dest="specs",
+        action="append",
+        metavar="CLASS/SPEC",
+        help="Only scrape this spec, e.g. mage/fire (repeatable).",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore stored spec snapshots and re-parse every guide.",
+    )
+    enrichment = parser.add_mutually_exclusive_group()
+    enrichment.add_argument(
+        "--skip-enrichment",
+        action="store_true",
+        help="Do not look up drop locations on WoWDB.",
+    )
+    enrichment.add_argument(
+        "--enrich-only",
+        action="store_true",
+        help="Enrich the items of the existing JSON output without scraping.",
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="Rebuild the outputs from the page archive without any network "
+        "requests.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and refresh the stalest or most volatile specs "
+        "one at a time, writing the outputs after each refresh.",
+    )
+    parser.add_argument(
+        "--max-units",
+        type=int,
+        help="Stop the daemon after this many refreshes (default: run forever).",
+    )
+    parser.add_argument(
+        "--refresh-min-age",
+        type=float,
+        default=0.5,
+        help="Hours before a spec is refreshed again, however volatile "
+        "(default: 0.5).",
+    )
+    parser.add_argument(
+        "--refresh-max-age",
+        type=float,
+        default=12.0,
+        help="Hours after which even a stable spec is refreshed (default: 12).",
+    )
+    parser.add_argument(
+        "--guide-budget",
+        type=int,
+        default=120,
+        help="Wowhead requests allowed per hour in daemon mode (default: 120).",
+    )
+    parser.add_argument(
+        "--item-budget",
+        type=int,
+        default=1200,
+        help="WoWDB requests allowed per hour in daemon mode (default: 1200).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Guides scraped in parallel (default: 4).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse guides in this many worker processes "
+        "(default: 0, parse in the scraping threads).",
+    )
+    parser.add_argument(
+        "--guide-interval",
+        type=float,
+        default=1.0,
+        help="Starting delay in seconds between Wowhead requests (default: 1.0).",
+    )
+    parser.add_argument(
+        "--item-interval",
+        type=float,
+        default=0.15,
+        help="Starting delay in seconds between WoWDB requests (default: 0.15).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries for a throttled or failed request (default: 3).",
+    )
+    parser.add_argument(
+        "--split-classes",
+        action="store_true",
+        help="Write one LoadOnDemand data addon per class next to WOWRN.",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=DEFAULT_DATA_DIR,
+        help="Directory for caches, snapshots and metrics (default: data).",
+    )
+    parser.add_argument(
+        "--json-output",
+        help="Path of the JSON output (default: <data-dir>/pve_data.json).",
+    )
+    parser.add_argument(
+        "--lua-output",
+        default=DEFAULT_LUA_OUTPUT,
+        help="Path of the addon Data.lua (default: Interface/Addons/WOWRN).",
+    )
+    parser.add_argument(
+        "--sqlite-output",
+        help="Also export the results to this normalized SQLite database.",
+    )
+    parser.add_argument(
+        "--delta-output",
+        help="Path of the JSON delta against the previous results "
+        "(default: <data-dir>/delta.json).",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        help="Directory for the JSON and Prometheus run metrics "
+        "(default: <data-dir>/metrics).",
+    )
+    args = parser.parse_args(argv)
+    if args.reparse and args.enrich_only:
+        parser.error("--reparse and --enrich-only cannot be combined")
+    if args.daemon and (args.reparse or args.enrich_only):
+        parser.error("--daemon cannot be combined with --reparse or --enrich-only")
+    try:
+        args.class_specs = select_class_specs(args.classes, args.specs)
+    except ValueError as e:
+        parser.error(str(e))
+    args.partial = args.class_specs != WOW_CLASSES
+    return args
+
+
+def subset(result: ScrapingResult, class_specs: Dict[str, List[str]]) -> ScrapingResult:
+    selected = ScrapingResult()
+    for class_name, spec_names in class_specs.items():
+        for spec_name in spec_names:
+            spec_data = result.specs.get(class_name, {}).get(spec_name)
+            if spec_data is not None:
+                selected.add_spec_data(spec_data)
+    return selected
 
 
-def main() -> None:
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    json_output = os.path.join(base_dir, "data", "pve_data.json")
-    lua_output = os.path.join(
-        base_dir, "..", "..", "Interface", "Addons", "WOWRN", "Data.lua"
+def write_delta(delta: Dict, path: str) -> None:
+    with atomic_open(path) as f:
+        json.dump(delta, f, indent=2)
+    if not delta["changed"]:
+        print("No changes since the previous results.")
+        return
+    print(
+        f"Delta: {len(delta.get('specs', {}))} specs changed, "
+        f"{len(delta.get('specs_added', []))} added, "
+        f"{len(delta.get('specs_removed', []))} removed ({path})"
     )
 
-    scraper = WowheadScraper(delay=1.0)
 
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    data_dir = args.data_dir
+    json_output = args.json_output or os.path.join(data_dir, "pve_data.json")
+    lua_output = args.lua_output
+    delta_output = args.delta_output or os.path.join(data_dir, "delta.json")
+
+    metrics_dir = args.metrics_dir or os.path.join(data_dir, "metrics")
+    metrics = RunMetrics()
+
+    archive = PageArchive(os.path.join(data_dir, "archive"))
+    budget = None
+    if args.daemon:
+        budget = HourlyRequestBudget(
+            {
+                HostRateLimiter.host_of(WowheadScraper.BASE_URL): args.guide_budget,
+                HostRateLimiter.host_of(WowdbScraper.BASE_URL): args.item_budget,
+            }
+        )
+    item_store_path = os.path.join(data_dir, "item_store.sqlite3")
+    if args.reparse:
+        http_client = ArchiveHttpClient(archive, metrics=metrics)
+        item_store = ItemStore(
+            item_store_path if os.path.exists(item_store_path) else ":memory:",
+            metrics=metrics,
+            read_only=True,
+        )
+    else:
+        http_client = HttpClient(
+            headers=WowheadScraper.HEADERS,
+            rate_limiter=AdaptiveRateLimiter(
+                min_interval=args.guide_interval,
+                host_intervals={"www.wowdb.com": args.item_interval},
+                floor=0.25,
+            ),
+            validator_store=ValidatorStore(os.path.join(data_dir, "http_cache")),
+            metrics=metrics,
+            max_retries=args.max_retries,
+            archive=archive,
+            budget=budget,
+        )
+        item_store = ItemStore(
+            item_store_path,
+            legacy_cache_path=os.path.join(data_dir, "wowdb_item_cache.json"),
+            metrics=metrics,
+        )
+    parse_pool = (
+        ProcessPoolExecutor(
+            max_workers=args.parse_workers, mp_context=get_context("spawn")
+        )
+        if args.parse_workers > 0
+        else None
+    )
+    snapshot_store = SpecSnapshotStore(os.path.join(data_dir, "spec_snapshots"))
+    scraper = WowheadScraper(
+        http_client=http_client,
+        snapshot_store=snapshot_store,
+        full=args.full or args.reparse,
+        item_store=item_store,
+        metrics=metrics,
+        item_registry=ItemRegistry(),
+        parse_pool=parse_pool,
+    )
+
+    json_adapter = JsonStorageAdapter()
+    lua_adapter_class = (
+        LoadOnDemandLuaAdapter if args.split_classes else LuaStorageAdapter
+    )
     storage_adapters = [
-        JsonStorageAdapter(),
-        LuaStorageAdapter(variable_name="TierListAddonData"),
+        json_adapter,
+        lua_adapter_class(
+            variable_name="TierListAddonData",
+            compact=True,
+            item_index=True,
+            normalized=True,
+        ),
     ]
     output_paths = [json_output, lua_output]
+    if args.sqlite_output:
+        storage_adapters.append(SqliteStorageAdapter())
+        output_paths.append(args.sqlite_output)
+
+    wowdb_scraper = WowdbScraper(
+        item_store=item_store,
+        batch_size=10,
+        http_client=http_client,
+        metrics=metrics,
+    )
+
+    sources = SourceRegistry().register(
+        WowheadScraper.SOURCE, scraper, max_workers=args.workers
+    )
 
     service = ScraperService(
-        scraper=scraper,
+        scraper=None,
+        sources=sources,
         storage_adapters=storage_adapters,
+        max_workers=args.workers,
+        metrics=metrics,
+        enricher=None if args.skip_enrichment else wowdb_scraper,
+        parallel_writes=True,
+        streaming=True,
     )
 
+    def checkpoint() -> None:
+        archive.save()
+        metrics.write_json(os.path.join(metrics_dir, "run_metrics.json"))
+        metrics.write_prometheus(os.path.join(metrics_dir, "wowrn_scraper.prom"))
+
+    total_specs = sum(len(specs) for specs in args.class_specs.values())
     print("Starting WoW gear scraper...")
-    print(f"Scraping {len(WOW_CLASSES)} classes...")
 
     try:
-        result = service.run(class_specs=WOW_CLASSES, output_paths=output_paths)
-        total_specs = sum(len(specs) for specs in result.specs.values())
-        print(f"\nScraping complete. Processed {total_specs} specializations.")
-        print("\nEnriching items with loot location data from wowdb...")
-        wowdb_scraper = WowdbScraper(batch_size=10, batch_delay=1.5)
-        
-        for class_name, specs in result.specs.items():
-            for spec_name, spec_data in specs.items():
-                if spec_data.error:
-                    continue
-                
-                print(f"  Enriching {class_name}/{spec_name}...")
-                for context, bis_list in spec_data.bis_lists.items():
-                    if bis_list.items:
-                        enriched_items = wowdb_scraper.enrich_items_batch(bis_list.items)
-                        bis_list.items = enriched_items
-                
-                if spec_data.trinket_tier_list and spec_data.trinket_tier_list.tiers:
-                    for tier, items in spec_data.trinket_tier_list.tiers.items():
-                        if items:
-                            enriched_items = wowdb_scraper.enrich_items_batch(items)
-                            spec_data.trinket_tier_list.tiers[tier] = enriched_items
-
-        print("\nSaving enriched data...")
-        for adapter, path in zip(storage_adapters, output_paths):
-            adapter.save(result, path)
+        previous = json_adapter.read(json_output)
+        if args.daemon:
+            scheduler = RefreshScheduler(
+                service,
+                args.class_specs,
+                output_paths,
+                state=RefreshStateStore(os.path.join(data_dir, "refresh_state.json")),
+                result=json_adapter.load(json_output, ItemRegistry()),
+                policy=RefreshPolicy(
+                    args.refresh_min_age * HOUR, args.refresh_max_age * HOUR
+                ),
+                item_refresher=None if args.skip_enrichment else wowdb_scraper,
+                item_policy=RefreshPolicy(
+                    args.refresh_max_age * HOUR, item_store.loot_ttl
+                ),
+                budget=budget,
+                on_spec=snapshot_store.save,
+                on_unit=checkpoint,
+            )
+            print(f"Refreshing {total_specs} specializations continuously...")
+            units = scheduler.run(args.max_units)
+            print(f"Stopping after {units} refreshes.")
+            result = scheduler.ordered_result()
+        elif args.enrich_only:
+            result = json_adapter.load(json_output, ItemRegistry())
+            if result is None:
+                raise RuntimeError(f"No existing results to enrich at {json_output}")
+            print(f"Enriching {total_specs} specializations from {json_output}...")
+            service.enrich(subset(result, args.class_specs))
+        else:
+            action = "Reparsing archived" if args.reparse else "Scraping"
+            print(f"{action} {total_specs} specializations...")
+            result = service.collect(args.class_specs)
+
+            if not args.reparse:
+                for specs in result.specs.values():
+                    for spec_data in specs.values():
+                        if not spec_data.reused:
+                            snapshot_store.save(spec_data)
+
+            if args.partial:
+                existing = json_adapter.load(json_output, ItemRegistry())
+                if existing is not None:
+                    print(f"Merging into the existing results at {json_output}")
+                    existing.merge(result)
+                    result = existing
+
+        data = service.save(result, output_paths)
+        write_delta(diff_results(previous, data), delta_output)
+        item_store.purge_expired()
 
         print("All scrapers finished successfully.")
-        sys.exit(0)
+        exit_code = 0
+    except KeyboardInterrupt:
+        if args.daemon:
+            print("Interrupted, outputs are up to date with the last refresh.")
+            exit_code = 0
+        else:
+            print("Scraping interrupted, outputs were not written.")
+            exit_code = 130
     except Exception as e:
         print(f"Scraping failed: {e}")
         import traceback
+
         traceback.print_exc()
-        sys.exit(1)
+        exit_code = 1
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+    if not args.reparse:
+        archive.save()
+    metrics.increment("runs_total", status="success" if exit_code == 0 else "failed")
+    metrics.write_json(os.path.join(metrics_dir, "run_metrics.json"))
+    metrics.write_prometheus(os.path.join(metrics_dir, "wowrn_scraper.prom"))
+    print(f"Run metrics written to {metrics_dir}")
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+import os
+import stat
+
+from wowrn_scraper.infrastructure.atomic_file import UMASK, atomic_open
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_files_get_the_default_mode(tmp_path):
+    path = tmp_path / "pve_data.json"
+    with atomic_open(str(path)) as f:
+        f.write("{}")
+
+    assert mode(path) == 0o666 & ~UMASK
+
+
+def test_replaced_files_keep_their_mode(tmp_path):
+    path = tmp_path / "Data.lua"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    with atomic_open(str(path)) as f:
+        f.write("new")
+
+    assert path.read_text() == "new"
+    assert mode(path) == 0o640
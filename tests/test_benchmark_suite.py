@@ -0,0 +1,105 @@
+import random
+
+import requests
+
+from benchmarks.stand_in_server import StandInServer
+from benchmarks.suite import (
+    describe_lua_sizes,
+    find_regressions,
+    lua_layout_sizes,
+    run_suite,
+)
+from benchmarks.synthetic import generate_item_page, generate_site
+from wowrn_scraper.domain.models import BisList, ScrapingResult, SlotItem, SpecData
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+CLASS_SPECS = {"mage": ["fire", "frost"], "druid": ["feral"]}
+
+
+def test_synthetic_guide_pages_round_trip_through_extractors():
+    guides, items, item_ids = generate_site(CLASS_SPECS, pool=50, filler_paragraphs=2)
+    scraper = WowheadScraper(item_store=ItemStore(":memory:"))
+
+    html = guides["/guide/classes/mage/fire/bis-gear"]
+    markup = scraper._extract_guide_markup(html)
+    mapping = scraper._extract_item_mapping(html)
+
+    assert markup.startswith('[h2 toc="Overview"]')
+    assert set(scraper._parse_bis_items(markup, mapping)) == {
+        "Overall",
+        "Raid",
+        "Mythic+",
+    }
+    assert len(guides) == 3
+    assert sorted(f"/items/{iid}" for iid in item_ids) == sorted(items)
+
+
+def test_item_pages_match_wowdb_drop_pattern():
+    rng = random.Random(3)
+    infos = [
+        WowdbScraper(item_store=ItemStore(":memory:"))._parse_drop_info(
+            generate_item_page("1", rng)
+        )
+        for _ in range(20)
+    ]
+
+    assert any(info["boss_name"] for info in infos)
+    assert any(info["source_type"] == "quest, vendor or crafted" for info in infos)
+
+
+def test_stand_in_server_throttles():
+    with StandInServer({"/page": "ok"}, throttle_rate=1.0, retry_after=7) as server:
+        response = requests.get(f"{server.url}/page", timeout=5)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert server.requests == server.throttled == 1
+
+
+def test_suite_times_every_stage():
+    guides, items, item_ids = generate_site(CLASS_SPECS, pool=40, filler_paragraphs=2)
+
+    timings = run_suite(guides, items, item_ids, repeat=1)
+
+    assert set(timings) == {
+        "fetch",
+        "parse",
+        "parse_per_spec",
+        "parse_processes",
+        "enrich",
+        "serialize_json",
+        "serialize_lua",
+    }
+    assert all(seconds > 0 for seconds in timings.values())
+
+
+def test_find_regressions_flags_slower_stages():
+    baseline = {"parse": 1.0, "enrich": 2.0, "fetch": 0.0}
+    timings = {"parse": 1.2, "enrich": 3.0, "fetch": 5.0}
+
+    assert find_regressions(timings, baseline, tolerance=1.25) == {"enrich": 1.5}
+
+
+def test_lua_layout_sizes_compare_both_layouts():
+    result = ScrapingResult()
+    for spec_name in ("fire", "frost"):
+        helm = SlotItem("100", "Helm of Tests", slot="Head", boss_name="Boss")
+        result.add_spec_data(
+            SpecData("mage", spec_name, bis_lists={"Raid": BisList("Raid", [helm])})
+        )
+
+    sizes = lua_layout_sizes(result)
+
+    assert set(sizes) == {"nested", "normalized"}
+    assert all(size > 0 for size in sizes.values())
+
+
+def test_lua_size_description_never_reports_negative_savings():
+    assert describe_lua_sizes({"nested": 200, "normalized": 150}).endswith(
+        "(25.0% smaller)"
+    )
+    assert describe_lua_sizes({"nested": 100, "normalized": 370}).endswith(
+        "(270.0% larger)"
+    )
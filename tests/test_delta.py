@@ -0,0 +1,88 @@
+import json
+
+from wowrn_scraper.domain.delta import diff_results
+from wowrn_scraper.infrastructure.json_adapter import JsonStorageAdapter
+
+
+def spec(bis, trinkets, chips=()):
+    return {
+        "url": "https://example.test",
+        "bis": {
+            context: [{"slot": "Head", "id": i, "name": f"Item {i}"} for i in ids]
+            for context, ids in bis.items()
+        },
+        "trinkets": {
+            tier: [{"id": i, "name": f"Item {i}"} for i in ids]
+            for tier, ids in trinkets.items()
+        },
+        "cartel_chips": [{"id": i, "name": i, "details": "Myth"} for i in chips],
+    }
+
+
+def test_unchanged_results_have_an_empty_delta():
+    data = {"mage": {"fire": spec({"Raid": ["1"]}, {"S": ["10"]})}}
+    assert diff_results(data, json.loads(json.dumps(data))) == {"changed": False}
+
+
+def test_delta_reports_items_tier_moves_and_specs():
+    previous = {
+        "mage": {
+            "fire": spec({"Raid": ["1", "2"]}, {"S": ["10"], "A": ["11", "12"]}),
+            "frost": spec({}, {}),
+        }
+    }
+    current = {
+        "mage": {
+            "fire": spec(
+                {"Raid": ["2", "3"], "Mythic+": ["4"]},
+                {"S": ["10", "11"], "B": ["13"]},
+                chips=["50"],
+            ),
+            "arcane": spec({}, {}),
+        },
+        "priest": {"shadow": {"error": "Failed to fetch"}},
+    }
+    current["mage"]["fire"]["bis"]["Raid"][0]["name"] = "Renamed"
+
+    delta = diff_results(previous, current)
+
+    assert delta["changed"]
+    assert delta["specs_added"] == ["mage/arcane", "priest/shadow"]
+    assert delta["specs_removed"] == ["mage/frost"]
+    assert delta["specs"]["mage/fire"] == {
+        "bis": {
+            "Raid": {"added": ["3"], "removed": ["1"], "updated": ["2"]},
+            "Mythic+": {"added": ["4"]},
+        },
+        "trinkets": {
+            "added": [{"id": "13", "tier": "B"}],
+            "removed": [{"id": "12", "tier": "A"}],
+            "moved": [{"id": "11", "from": "A", "to": "S"}],
+        },
+        "cartel_chips": {"added": ["50"]},
+    }
+
+
+def test_errors_are_reported_as_spec_changes():
+    previous = {"mage": {"fire": spec({"Raid": ["1"]}, {})}}
+    current = {"mage": {"fire": {"error": "No markup found"}}}
+
+    delta = diff_results(previous, current)
+
+    assert delta["specs"]["mage/fire"] == {
+        "error": {"from": None, "to": "No markup found"}
+    }
+
+
+def test_json_adapter_skips_identical_content(tmp_path):
+    path = tmp_path / "pve_data.json"
+    data = {"mage": {"fire": spec({"Raid": ["1"]}, {})}}
+    adapter = JsonStorageAdapter()
+    adapter.write(data, str(path))
+    stat = path.stat()
+
+    adapter.write(json.loads(json.dumps(data)), str(path))
+
+    assert path.stat().st_mtime_ns == stat.st_mtime_ns
+    assert path.stat().st_ino == stat.st_ino
+    assert adapter.read(str(path)) == data
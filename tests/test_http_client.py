@@ -0,0 +1,70 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from wowrn_scraper.infrastructure.http_client import HttpClient, ValidatorStore
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+
+GUIDE_BODY = '<html>WH.markup.printHtml("[b]Guide[/b]", "guide-body")</html>'
+
+
+class GuideHandler(BaseHTTPRequestHandler):
+    full_responses = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        GuideHandler.full_responses += 1
+        body = GUIDE_BODY.encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def guide_server():
+    GuideHandler.full_responses = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GuideHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/guide"
+    server.shutdown()
+    server.server_close()
+
+
+def test_unchanged_guide_is_revalidated_from_validator_store(guide_server, tmp_path):
+    store = ValidatorStore(str(tmp_path))
+    client = HttpClient(
+        rate_limiter=HostRateLimiter(min_interval=0.0), validator_store=store
+    )
+
+    first = client.get(guide_server, revalidate=True)
+    second = HttpClient(
+        rate_limiter=HostRateLimiter(min_interval=0.0), validator_store=store
+    ).get(guide_server, revalidate=True)
+
+    assert first.text == GUIDE_BODY and not first.not_modified
+    assert second.text == GUIDE_BODY and second.not_modified
+    assert GuideHandler.full_responses == 1
+
+
+def test_plain_get_ignores_validator_store(guide_server, tmp_path):
+    client = HttpClient(
+        rate_limiter=HostRateLimiter(min_interval=0.0),
+        validator_store=ValidatorStore(str(tmp_path)),
+    )
+
+    client.get(guide_server, revalidate=True)
+    response = client.get(guide_server)
+
+    assert not response.not_modified
+    assert GuideHandler.full_responses == 2
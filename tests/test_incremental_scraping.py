@@ -0,0 +1,82 @@
+from wowrn_scraper.infrastructure.http_client import HttpResponse
+from wowrn_scraper.infrastructure.item_store import FALLBACK_LOOT_INFO, ItemStore
+from wowrn_scraper.infrastructure.spec_snapshot_store import SpecSnapshotStore
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+GUIDE_MARKUP = (
+    '[tabs name=bis_items][tab name=\\"Overall\\"]'
+    "[tr][td][b]Head[/b][/td][td][item=100][/td][/tr]"
+    "[/tab][/tabs]"
+)
+GUIDE_HTML = (
+    'WH.Gatherer.addData(3, 1, {"100": {"name_enus": "Crown of Tests"}});\n'
+    f'WH.markup.printHtml("{GUIDE_MARKUP}", "guide-body");'
+)
+
+
+class StaticHttpClient:
+    def __init__(self, html=GUIDE_HTML):
+        self.html = html
+
+    def get(self, url, revalidate=False, allow_redirects=True, timeout=None):
+        return HttpResponse(url=url, status_code=200, text=self.html)
+
+
+def test_unchanged_markup_reuses_stored_spec(tmp_path, monkeypatch):
+    store = SpecSnapshotStore(str(tmp_path))
+    scraper = WowheadScraper(http_client=StaticHttpClient(), snapshot_store=store)
+
+    first = scraper.scrape_spec("mage", "frost")
+    assert not first.reused
+    assert first.bis_lists["Overall"].items[0].name == "Crown of Tests"
+    store.save(first)
+
+    def fail_parse(*args):
+        raise AssertionError("unchanged guide must not be re-parsed")
+
+    monkeypatch.setattr(scraper, "_parse_bis_items", fail_parse)
+    second = scraper.scrape_spec("mage", "frost")
+
+    assert second.reused
+    assert second.to_dict() == first.to_dict()
+
+
+def test_snapshots_do_not_keep_loot(tmp_path):
+    store = SpecSnapshotStore(str(tmp_path))
+    scraper = WowheadScraper(http_client=StaticHttpClient(), snapshot_store=store)
+    first = scraper.scrape_spec("mage", "frost")
+    first.bis_lists["Overall"].items[0].record.update_loot(FALLBACK_LOOT_INFO)
+    store.save(first)
+
+    second = scraper.scrape_spec("mage", "frost")
+
+    assert second.reused
+    assert second.bis_lists["Overall"].items[0].source_type is None
+
+
+def test_full_rebuild_ignores_stored_spec(tmp_path):
+    store = SpecSnapshotStore(str(tmp_path))
+    scraper = WowheadScraper(http_client=StaticHttpClient(), snapshot_store=store)
+    store.save(scraper.scrape_spec("mage", "frost"))
+
+    scraper.full = True
+    assert not scraper.scrape_spec("mage", "frost").reused
+
+
+def test_reused_specs_resolve_placeholder_names(tmp_path):
+    store = SpecSnapshotStore(str(tmp_path))
+    item_store = ItemStore(":memory:")
+    scraper = WowheadScraper(
+        http_client=StaticHttpClient(GUIDE_HTML.split("\n", 1)[1]),
+        snapshot_store=store,
+        item_store=item_store,
+    )
+    first = scraper.scrape_spec("mage", "frost")
+    assert first.bis_lists["Overall"].items[0].name == "Item 100"
+    store.save(first)
+
+    item_store.put_name("100", "Crown of Tests")
+    second = scraper.scrape_spec("mage", "frost")
+
+    assert second.reused
+    assert second.bis_lists["Overall"].items[0].name == "Crown of Tests"
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from wowrn_scraper.infrastructure.http_client import HttpResponse
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+ROWS = "".join(
+    f"[tr][td][b]Slot {n}[/b][/td][td][item={n}][/td][/tr]" for n in range(1, 9)
+)
+GUIDE_HTML = (
+    'WH.Gatherer.addData(3, 1, {"1": {"name_enus": "Known Helm"}});\n'
+    f'WH.markup.printHtml("[tabs name=bis_items][tab name=\\"Raid\\"]{ROWS}'
+    '[/tab][/tabs]", "guide-body");'
+)
+
+
+class SlowItemHttpClient:
+    def __init__(self) -> None:
+        self.item_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, revalidate=False, allow_redirects=True, timeout=None):
+        if "/guide/" in url:
+            return HttpResponse(url=url, status_code=200, text=GUIDE_HTML)
+
+        with self._lock:
+            self.item_requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        item_id = url.split("=")[-1]
+        return HttpResponse(
+            url=f"{url}/resolved-name-{item_id}", status_code=200, text=""
+        )
+
+
+def test_unknown_item_names_are_resolved_in_one_concurrent_pass():
+    http_client = SlowItemHttpClient()
+    scraper = WowheadScraper(http_client=http_client, name_workers=4)
+
+    spec_data = scraper.scrape_spec("mage", "fire")
+
+    names = [item.name for item in spec_data.bis_lists["Raid"].items]
+    assert names[0] == "Known Helm"
+    assert names[1:] == [f"Resolved Name {n}" for n in range(2, 9)]
+    assert http_client.item_requests == 7
+    assert http_client.max_in_flight > 1
+
+
+def test_resolved_names_are_reused_from_the_item_store():
+    http_client = SlowItemHttpClient()
+    scraper = WowheadScraper(http_client=http_client)
+
+    scraper.scrape_spec("mage", "fire")
+    scraper.scrape_spec("mage", "frost")
+
+    assert http_client.item_requests == 7
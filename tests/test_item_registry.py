@@ -0,0 +1,139 @@
+import pytest
+
+from wowrn_scraper.domain.models import (
+    BisList,
+    ItemRegistry,
+    ScrapingResult,
+    SlotItem,
+    SpecData,
+    TrinketItem,
+    TrinketTierList,
+)
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+DROP_HTML = '<dd class="item-extra">Dropped by <b>Big Boss</b> - Test Raid.</dd>'
+
+MARKUP = """
+[tabs name=bis_items][tab name="Raid"]
+[tr][td][b]Head[/b][/td][td][item=100][/td][/tr]
+[tr][td][b]Trinket[/b][/td][td][item=200][/td][/tr]
+[/tab][/tabs]
+[tier-list=rows][tier][tier-label]S[/tier-label]
+[tier-content][item=200][/tier-content][/tier][/tier-list]
+"""
+
+
+@pytest.fixture
+def scraper():
+    return WowheadScraper(
+        item_store=ItemStore(":memory:"), item_registry=ItemRegistry()
+    )
+
+
+def parse_spec(scraper, class_name, spec_name, mapping):
+    spec = SpecData(
+        class_name=class_name,
+        spec_name=spec_name,
+        bis_lists=scraper._parse_bis_items(MARKUP, mapping),
+        trinket_tier_list=scraper._parse_trinkets(MARKUP, mapping),
+    )
+    scraper._adopt_records(spec, mapping)
+    return spec
+
+
+def test_placements_share_one_record_per_item(scraper):
+    fire = parse_spec(scraper, "mage", "fire", {"100": "Helm", "200": "Idol"})
+    frost = parse_spec(scraper, "mage", "frost", {"100": "Helm", "200": "Idol"})
+
+    fire_helm, fire_idol = fire.bis_lists["Raid"].items
+    fire_trinket = fire.trinket_tier_list.tiers["S"][0]
+    assert fire_idol.record is fire_trinket.record
+    assert frost.bis_lists["Raid"].items[0].record is fire_helm.record
+    assert len(scraper.item_registry) == 2
+    assert not hasattr(fire_trinket, "__dict__")
+    assert fire_trinket.tier == "S" and fire_trinket.name == "Idol"
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_placeholder_names_are_upgraded_in_the_registry(scraper, reverse):
+    jobs = [("fire", {}), ("frost", {"100": "Helm"})]
+    specs = {
+        spec_name: parse_spec(scraper, "mage", spec_name, mapping)
+        for spec_name, mapping in (jobs[::-1] if reverse else jobs)
+    }
+
+    assert specs["fire"].bis_lists["Raid"].items[0].name == "Helm"
+    assert specs["frost"].bis_lists["Raid"].items[0].name == "Helm"
+    assert specs["fire"].bis_lists["Raid"].items[1].name == "Item 200"
+
+
+def test_conflicting_names_do_not_depend_on_parse_order():
+    jobs = [
+        ("fire", {"100": "Ashes of Bel'ore"}),
+        ("frost", {"100": "Ashes of Belore"}),
+        ("arcane", {}),
+    ]
+    outputs = []
+    for order in (jobs, jobs[::-1]):
+        store = ItemStore(":memory:")
+        store.put_name("100", "Ashes Of Belore")
+        scraper = WowheadScraper(item_store=store, item_registry=ItemRegistry())
+        result = ScrapingResult()
+        for spec_name, mapping in order:
+            result.add_spec_data(parse_spec(scraper, "mage", spec_name, mapping))
+        outputs.append(result.to_dict())
+
+    assert outputs[0] == outputs[1]
+    names = {spec["bis"]["Raid"][0]["name"] for spec in outputs[0]["mage"].values()}
+    assert names == {"Ashes of Bel'ore"}
+
+
+def test_registry_prefers_real_names_over_loaded_placeholders():
+    registry = ItemRegistry()
+    loaded = registry.record("100", "Item 100")
+
+    assert registry.record("100", "Helm") is loaded
+    assert loaded.name == "Helm"
+    registry.record("100", "Item 100")
+    assert loaded.name == "Helm"
+
+
+def test_enrichment_updates_shared_records_in_place(scraper, monkeypatch):
+    result = ScrapingResult()
+    result.add_spec_data(parse_spec(scraper, "mage", "fire", {"100": "Helm"}))
+    result.add_spec_data(parse_spec(scraper, "mage", "frost", {"100": "Helm"}))
+    wowdb = WowdbScraper(item_store=ItemStore(":memory:"), batch_delay=0)
+    fetched = []
+    monkeypatch.setattr(
+        wowdb, "_fetch_item_page", lambda item_id: fetched.append(item_id) or DROP_HTML
+    )
+    helm = result.specs["mage"]["fire"].bis_lists["Raid"].items[0]
+
+    wowdb.enrich_result(result)
+
+    assert sorted(fetched) == ["100", "200"]
+    assert result.specs["mage"]["fire"].bis_lists["Raid"].items[0] is helm
+    assert helm.boss_name == "Big Boss"
+    assert result.to_dict()["mage"]["frost"]["trinkets"]["S"][0]["boss_name"] == (
+        "Big Boss"
+    )
+
+
+def test_from_dict_reuses_registry_records():
+    registry = ItemRegistry()
+    spec = SpecData(
+        class_name="mage",
+        spec_name="fire",
+        bis_lists={"Raid": BisList("Raid", [SlotItem("1", "Ring", slot="Ring 1")])},
+        trinket_tier_list=TrinketTierList({"S": [TrinketItem("1", "Ring", tier="S")]}),
+    )
+
+    loaded = SpecData.from_dict("mage", "fire", spec.to_dict(), registry)
+
+    assert loaded.to_dict() == spec.to_dict()
+    bis_ring = loaded.bis_lists["Raid"].items[0]
+    assert bis_ring.record is loaded.trinket_tier_list.tiers["S"][0].record
+    assert bis_ring == SlotItem("1", "Ring", slot="Ring 1")
+    assert bis_ring != SlotItem("1", "Ring", slot="Ring 2")
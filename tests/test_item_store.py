@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import threading
+
+from wowrn_scraper.infrastructure.item_store import FALLBACK_LOOT_INFO, ItemStore
+
+DROP_INFO = {"source_type": "raid", "boss_name": "Boss", "location_name": "Raid"}
+
+
+def test_names_and_loot_info_persist_across_instances(tmp_path):
+    path = str(tmp_path / "items.sqlite3")
+    store = ItemStore(path)
+    store.put_name("100", "Crown of Tests")
+    store.put_loot_info("100", DROP_INFO)
+    store.close()
+
+    reopened = ItemStore(path)
+    assert reopened.get_name("100") == "Crown of Tests"
+    assert reopened.get_loot_info("100") == DROP_INFO
+    assert reopened.get_loot_info("200") is None
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+
+def test_expired_and_negative_entries_are_refetched(tmp_path):
+    store = ItemStore(str(tmp_path / "items.sqlite3"), loot_ttl=60, negative_ttl=-1)
+    store.put_loot_info("100", DROP_INFO)
+    store.put_loot_info("200", FALLBACK_LOOT_INFO, negative=True)
+
+    assert store.get_many_loot_info(["100", "200"]) == {"100": DROP_INFO}
+    assert store.purge_expired() == 1
+
+
+def test_legacy_json_cache_is_imported_once(tmp_path):
+    legacy = tmp_path / "wowdb_item_cache.json"
+    legacy.write_text(json.dumps({"100": DROP_INFO, "200": FALLBACK_LOOT_INFO}))
+
+    store = ItemStore(
+        str(tmp_path / "items.sqlite3"),
+        negative_ttl=-1,
+        legacy_cache_path=str(legacy),
+    )
+
+    assert store.get_many_loot_info(["100", "200"]) == {"100": DROP_INFO}
+    assert not legacy.exists()
+
+
+def test_concurrent_writers(tmp_path):
+    store = ItemStore(str(tmp_path / "items.sqlite3"))
+
+    def write(offset):
+        for i in range(50):
+            store.put_name(str(offset + i), f"Item {offset + i}")
+
+    threads = [threading.Thread(target=write, args=(n * 100,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.get_name("349") == "Item 349"
+
+
+def test_loot_history_counts_checks_and_changes(tmp_path):
+    path = str(tmp_path / "items.sqlite3")
+    store = ItemStore(path)
+    store.put_name("100", "Crown of Tests")
+    store.put_loot_info("100", DROP_INFO)
+    store.put_loot_info("100", DROP_INFO)
+    store.put_loot_info("100", {**DROP_INFO, "boss_name": "Other Boss"})
+    store.put_name("200", "Unchecked")
+    store.close()
+
+    history = ItemStore(path).loot_history(["100", "200"])
+
+    checked_at, checks, changes = history["100"]
+    assert checked_at is not None
+    assert (checks, changes) == (3, 1)
+    assert "200" not in history
+
+
+def test_history_columns_are_added_to_existing_stores(tmp_path):
+    path = str(tmp_path / "items.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE items (item_id TEXT PRIMARY KEY, name TEXT, "
+        "name_expires_at REAL, source_type TEXT, boss_name TEXT, "
+        "location_name TEXT, loot_failed INTEGER NOT NULL DEFAULT 0, "
+        "loot_expires_at REAL)"
+    )
+    conn.execute("INSERT INTO items (item_id, source_type) VALUES ('100', 'raid')")
+    conn.commit()
+    conn.close()
+
+    store = ItemStore(path)
+    store.put_loot_info("100", DROP_INFO)
+
+    assert store.loot_history(["100"])["100"][1:] == (1, 0)
+
+
+def test_read_only_store_serves_expired_entries_and_ignores_writes(tmp_path):
+    path = tmp_path / "items.sqlite3"
+    store = ItemStore(str(path), name_ttl=-1, loot_ttl=-1)
+    store.put_name("100", "Crown of Tests")
+    store.put_loot_info("100", DROP_INFO)
+    store.close()
+    before = path.read_bytes()
+
+    reader = ItemStore(str(path), read_only=True)
+    reader.put_name("200", "Idol of Tests")
+    reader.put_loot_info("200", DROP_INFO)
+
+    assert reader.get_name("100") == "Crown of Tests"
+    assert reader.get_many_loot_info(["100", "200"]) == {"100": DROP_INFO}
+    assert reader.purge_expired() == 0
+    reader.close()
+    assert path.read_bytes() == before
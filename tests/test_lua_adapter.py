@@ -0,0 +1,278 @@
+import os
+
+import pytest
+
+from wowrn_scraper.domain.models import (
+    BisList,
+    CartelChipItem,
+    ScrapingResult,
+    SlotItem,
+    SpecData,
+    TrinketItem,
+    TrinketTierList,
+)
+from wowrn_scraper.infrastructure.lua_adapter import (
+    ItemRef,
+    LoadOnDemandLuaAdapter,
+    LuaStorageAdapter,
+    build_item_index,
+    normalize,
+)
+
+
+@pytest.fixture
+def result():
+    result = ScrapingResult()
+    result.add_spec_data(
+        SpecData(
+            class_name="death-knight",
+            spec_name="frost",
+            url="https://example.test",
+            bis_lists={
+                "Mythic+": BisList(
+                    context="Mythic+",
+                    items=[
+                        SlotItem(
+                            id="100",
+                            name='Helm "of" Tests',
+                            slot="Head",
+                            source_type="raid",
+                            boss_name="Boss",
+                            location_name="Raid",
+                        )
+                    ],
+                )
+            },
+            cartel_chips=[CartelChipItem(id="7", name="Chip", details="Myth")],
+            trinket_tier_list=TrinketTierList(
+                tiers={"S": [TrinketItem(id="200", name="Idol", tier="S")]}
+            ),
+        )
+    )
+    result.add_spec_data(SpecData(class_name="mage", spec_name="fire", error="x"))
+    return result
+
+
+def test_indented_layout(result, tmp_path):
+    path = tmp_path / "Data.lua"
+    LuaStorageAdapter(variable_name="Data").save(result, str(path))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[:4] == [
+        "Data = {",
+        '    ["death-knight"] = {',
+        '        ["frost"] = {',
+        '            ["url"] = "https://example.test",',
+    ]
+    assert '                        ["name"] = "Helm \\"of\\" Tests",' in lines
+    assert '                        ["boss_name"] = "Boss",' in lines
+    assert '                ["S"] = {' in lines
+    assert lines[-5:] == [
+        '        ["fire"] = {',
+        '            ["error"] = "x"',
+        "        }",
+        "    }",
+        "}",
+    ]
+
+
+def test_compact_layout(result, tmp_path):
+    path = tmp_path / "Data.lua"
+    LuaStorageAdapter(variable_name="Data", compact=True).save(result, str(path))
+
+    assert path.read_text(encoding="utf-8") == (
+        'Data = {["death-knight"]={frost={url="https://example.test",'
+        'bis={["Mythic+"]={{slot="Head",id="100",name="Helm \\"of\\" Tests",'
+        'source_type="raid",boss_name="Boss",location_name="Raid"}}},'
+        'cartel_chips={{id="7",name="Chip",details="Myth"}},'
+        'trinkets={S={{id="200",name="Idol",source_type=nil,boss_name=nil,'
+        'location_name=nil}}}}},mage={fire={error="x"}}}'
+    )
+
+
+def test_failed_write_keeps_previous_file(result, tmp_path, monkeypatch):
+    path = tmp_path / "Data.lua"
+    path.write_text("previous", encoding="utf-8")
+    adapter = LuaStorageAdapter(compact=True)
+
+    def explode(write, value):
+        write("{partial")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(adapter, "_write_compact", explode)
+    with pytest.raises(RuntimeError):
+        adapter.save(result, str(path))
+
+    assert path.read_text(encoding="utf-8") == "previous"
+    assert os.listdir(tmp_path) == ["Data.lua"]
+
+
+def test_identical_output_leaves_file_untouched(result, tmp_path):
+    path = tmp_path / "Data.lua"
+    adapter = LuaStorageAdapter(compact=True)
+    adapter.save(result, str(path))
+    os.utime(path, ns=(1, 1))
+
+    adapter.save(result, str(path))
+    assert os.stat(path).st_mtime_ns == 1
+    assert os.listdir(tmp_path) == ["Data.lua"]
+
+    result.specs["death-knight"]["frost"].url = "https://example.test/changed"
+    adapter.save(result, str(path))
+    assert os.stat(path).st_mtime_ns != 1
+
+
+def nested_entries(spec_dict):
+    for context, items in spec_dict["bis"].items():
+        for item in items:
+            yield item["id"], ("bis", context, item["slot"], item["boss_name"])
+    for tier, items in spec_dict["trinkets"].items():
+        for item in items:
+            yield item["id"], ("trinket", tier, None, item["boss_name"])
+    for chip in spec_dict["cartel_chips"]:
+        yield chip["id"], ("cartel", chip["details"], None, None)
+
+
+def index_entries(index):
+    for item_id, entries in index.items():
+        for e in entries:
+            if e["type"] == "bis":
+                yield item_id, ("bis", e["context"], e["slot"], e["boss_name"])
+            elif e["type"] == "trinket":
+                yield item_id, ("trinket", e["tier"], None, e["boss_name"])
+            else:
+                yield item_id, ("cartel", e["details"], None, None)
+
+
+def test_item_index_matches_nested_data(result):
+    result.specs["death-knight"]["frost"].bis_lists["Raid"] = BisList(
+        context="Raid",
+        items=[
+            SlotItem(id="300", name="Ring", slot="Ring 1"),
+            SlotItem(id="300", name="Ring", slot="Ring 2"),
+            SlotItem(id="200", name="Idol", slot="Trinket"),
+        ],
+    )
+    spec_dict = result.to_dict()["death-knight"]["frost"]
+
+    index = build_item_index(spec_dict)
+
+    assert sorted(index_entries(index)) == sorted(nested_entries(spec_dict))
+    assert [e["type"] for e in index["200"]] == ["bis", "trinket"]
+    assert len(index["300"]) == 2
+
+
+def test_item_index_is_emitted_next_to_nested_layout(result, tmp_path):
+    path = tmp_path / "Data.lua"
+    LuaStorageAdapter(compact=True, item_index=True).save(result, str(path))
+
+    content = path.read_text(encoding="utf-8")
+    assert 'item_index={["100"]={{type="bis",context="Mythic+",slot="Head",' in content
+    assert 'cartel_chips={{id="7"' in content
+    assert 'mage={fire={error="x"}}' in content
+
+
+def resolve(value, items):
+    if isinstance(value, ItemRef):
+        record = items[value["id"]]
+        return lambda key: value[key] if key in value else record.get(key)
+    return lambda key: value.get(key)
+
+
+def assert_same_view(original, normalized, items):
+    if isinstance(original, list):
+        assert len(original) == len(normalized)
+        for a, b in zip(original, normalized):
+            assert_same_view(a, b, items)
+    elif isinstance(original, dict):
+        lookup = resolve(normalized, items)
+        for key, value in original.items():
+            if isinstance(value, (dict, list)):
+                assert_same_view(value, lookup(key), items)
+            else:
+                assert lookup(key) == value
+
+
+@pytest.fixture
+def shared_result(result):
+    helm = SlotItem(
+        id="100",
+        name='Helm "of" Tests',
+        slot="Head",
+        source_type="raid",
+        boss_name="Boss",
+        location_name="Raid",
+    )
+    result.add_spec_data(
+        SpecData(
+            class_name="death-knight",
+            spec_name="unholy",
+            bis_lists={"Raid": BisList(context="Raid", items=[helm])},
+            cartel_chips=[CartelChipItem(id="100", name=helm.name, details="x")],
+        )
+    )
+    return result
+
+
+def test_normalized_layout_resolves_to_nested_data(shared_result):
+    data = shared_result.to_dict()
+
+    items, specs = normalize(data)
+
+    assert items["100"] == {"name": 'Helm "of" Tests'}
+    assert items["200"] == {"name": "Idol"}
+    assert_same_view(data, specs, items)
+    unholy_helm = specs["death-knight"]["unholy"]["bis"]["Raid"][0]
+    assert unholy_helm == {
+        "id": "100",
+        "slot": "Head",
+        "source_type": "raid",
+        "boss_name": "Boss",
+        "location_name": "Raid",
+    }
+
+
+def test_normalized_layout_interns_shared_strings(shared_result, tmp_path):
+    path = tmp_path / "Data.lua"
+    shared_result.specs["death-knight"]["unholy"].cartel_chips = []
+    adapter = LuaStorageAdapter(variable_name="Data", compact=True, normalized=True)
+
+    adapter.save(shared_result, str(path))
+
+    content = path.read_text(encoding="utf-8")
+    assert content.startswith(
+        'local s = {}\nlocal items = {["100"]={name="Helm \\"of\\" Tests",'
+        'source_type="raid",boss_name="Boss",location_name="Raid"},'
+    )
+    assert "setmetatable(entry, ref)" in content
+    assert 'bis={Raid={r{id="100",slot="Head"}}}' in content
+
+
+def test_load_on_demand_layout(shared_result, tmp_path):
+    parent = tmp_path / "WOWRN"
+    parent.mkdir()
+    (parent / "WOWRN.toc").write_text("## Interface: 110000\n", encoding="utf-8")
+    manifest_path = parent / "Data.lua"
+    adapter = LoadOnDemandLuaAdapter(compact=True)
+
+    adapter.save(shared_result, str(manifest_path))
+
+    assert manifest_path.read_text(encoding="utf-8") == (
+        "TierListAddonData = TierListAddonData or {}\n"
+        'TierListAddonManifest = {["death-knight"]={addon="WOWRN_DeathKnight"},'
+        'mage={addon="WOWRN_Mage"}}\n'
+    )
+    toc = (tmp_path / "WOWRN_DeathKnight" / "WOWRN_DeathKnight.toc").read_text(
+        encoding="utf-8"
+    )
+    assert "## Interface: 110000\n" in toc
+    assert "## LoadOnDemand: 1\n" in toc
+    assert "## Dependencies: WOWRN\n" in toc
+    mage = (tmp_path / "WOWRN_Mage" / "Data.lua").read_text(encoding="utf-8")
+    assert mage == (
+        "TierListAddonData = TierListAddonData or {}\n"
+        'TierListAddonData["mage"] = {fire={error="x"}}\n'
+    )
+    assert adapter.class_report["death-knight"]["specs"] == 2
+    assert adapter.class_report["death-knight"]["entries"] == 5
+    assert adapter.class_report["mage"]["entries"] == 0
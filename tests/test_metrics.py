@@ -0,0 +1,86 @@
+import json
+
+from benchmarks.stand_in_server import StandInServer
+from tests.test_scraper_service import CLASS_SPECS, FakeScraper
+from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.infrastructure.http_client import HttpClient
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+
+
+class RecordingAdapter:
+    def __init__(self) -> None:
+        self.saved = []
+
+    def save(self, result, output_path):
+        self.write(result.to_dict(), output_path)
+
+    def write(self, data, output_path):
+        self.saved.append(output_path)
+
+
+def test_prometheus_textfile_format():
+    metrics = RunMetrics()
+    metrics.increment("http_requests_total", host="a.test", status=200)
+    metrics.increment("http_requests_total", host="a.test", status=200)
+    metrics.observe("parse_seconds", 0.02)
+    metrics.set("spec_parse_seconds", 0.5, class_name="mage", spec='fi"re')
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE wowrn_http_requests_total counter\n" in text
+    assert 'wowrn_http_requests_total{host="a.test",status="200"} 2\n' in text
+    assert 'wowrn_spec_parse_seconds{class_name="mage",spec="fi\\"re"} 0.5\n' in text
+    assert 'wowrn_parse_seconds_bucket{le="0.01"} 0\n' in text
+    assert 'wowrn_parse_seconds_bucket{le="0.025"} 1\n' in text
+    assert 'wowrn_parse_seconds_bucket{le="+Inf"} 1\n' in text
+    assert "wowrn_parse_seconds_count 1\n" in text
+
+
+def test_http_client_records_requests_bytes_and_latency():
+    metrics = RunMetrics()
+    client = HttpClient(rate_limiter=HostRateLimiter(min_interval=0.0), metrics=metrics)
+
+    with StandInServer({"/page": "hello"}) as server:
+        client.get(f"{server.url}/page")
+        client.get(f"{server.url}/page")
+        host = server.url.split("//", 1)[1]
+
+    assert metrics.value("http_requests_total", host=host, status=200) == 2
+    assert metrics.value("http_response_bytes_total", host=host) == 10
+    assert metrics.histograms["http_request_seconds"][(("host", host),)].count == 2
+
+
+def test_item_store_reports_both_caches(tmp_path):
+    metrics = RunMetrics()
+    store = ItemStore(":memory:", metrics=metrics)
+    store.put_name("1", "Helm")
+    store.put_loot_info("1", {"source_type": "raid"})
+
+    store.get_name("1")
+    store.get_name("2")
+    store.get_many_loot_info(["1", "2", "3"])
+
+    caches = metrics.cache_ratios()
+    assert caches["item_names"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert caches["loot_info"]["hits"] == 1
+    assert caches["loot_info"]["misses"] == 2
+
+
+def test_service_times_each_adapter_and_writes_reports(tmp_path):
+    metrics = RunMetrics()
+    adapter = RecordingAdapter()
+    service = ScraperService(FakeScraper(), [adapter], metrics=metrics)
+
+    service.run(CLASS_SPECS, ["out.json"])
+    metrics.write_json(str(tmp_path / "run.json"))
+    metrics.write_prometheus(str(tmp_path / "run.prom"))
+
+    report = json.loads((tmp_path / "run.json").read_text(encoding="utf-8"))
+    writes = report["histograms"]["write_seconds"]
+    assert writes[0]["labels"] == {"adapter": "RecordingAdapter"}
+    assert writes[0]["value"]["count"] == 1
+    assert report["histograms"]["serialize_seconds"][0]["value"]["count"] == 1
+    assert "scrape_seconds" in report["histograms"]
+    assert "wowrn_write_seconds_sum" in (tmp_path / "run.prom").read_text()
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+import requests
+
+from wowrn_scraper.infrastructure.http_client import ArchiveHttpClient
+from wowrn_scraper.infrastructure.page_archive import PageArchive
+
+
+def test_identical_pages_share_one_object(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    first = archive.store("https://a.test/1", "https://a.test/1", "<html>same</html>")
+    second = archive.store("https://a.test/2", "https://a.test/2", "<html>same</html>")
+    archive.save()
+
+    assert first == second
+    assert len(list((tmp_path / "objects").rglob("*.html.gz"))) == 1
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert set(manifest["pages"]) == {"https://a.test/1", "https://a.test/2"}
+    assert manifest["pages"]["https://a.test/1"]["sha256"] == first
+    assert manifest["pages"]["https://a.test/1"]["fetched_at"]
+
+
+def test_archive_client_replays_final_urls(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    archive.store("https://a.test/item=1", "https://a.test/item=1/helm", "helm")
+    archive.save()
+
+    client = ArchiveHttpClient(PageArchive(str(tmp_path)))
+    response = client.get("https://a.test/item=1")
+
+    assert response.url == "https://a.test/item=1/helm"
+    assert response.text == "helm"
+    with pytest.raises(requests.RequestException):
+        client.get("https://a.test/item=2")
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from benchmarks.legacy_parsers import LegacyRegexParsers
+from benchmarks.synthetic import generate_guide_page, generate_spec
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.page_scanner import decode_js_string, scan_page
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+
+@pytest.fixture(scope="module")
+def scrapers():
+    store = ItemStore(":memory:")
+    return WowheadScraper(item_store=store), LegacyRegexParsers(item_store=store)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_scanner_matches_legacy_extraction(scrapers, seed):
+    scraper, legacy = scrapers
+    markup, mapping = generate_spec(seed, filler_paragraphs=20)
+    html = generate_guide_page(markup, mapping)
+    html += '<a href="/item=999/sword-of-the-tests">x</a>'
+
+    assert scraper._scan_page(html) == legacy._scan_page(html)
+
+
+def test_anchor_and_bbcode_slugs_are_collected_in_one_pass(scrapers):
+    scraper, _ = scrapers
+    html = (
+        '<a href="https://www.wowhead.com/item=1/crown-of-the-ages">a</a>'
+        "[url=item=2/idol-of-tests] [url=item=1/other-name]"
+        'WH.Gatherer.addData(3, 1, {"2": {"name_enus": "Idol"}});'
+    )
+
+    markup, mapping = scraper._scan_page(html)
+
+    assert markup is None
+    assert mapping == {"1": "Crown of the Ages", "2": "Idol"}
+
+
+def test_embedded_json_is_decoded_exactly():
+    html = (
+        'WH.Gatherer.addData(3, 1, {"1": {"name_enus": "Odd \\"});\\" Name"}});'
+        'WH.Gatherer.addData(3, 1, {"2": {"name_enus": "Second"}});'
+    )
+
+    assert scan_page(html).names == {"1": 'Odd "});" Name', "2": "Second"}
+
+
+def test_markup_escapes_are_decoded_in_one_copy():
+    literal = r'[b]Head[\/b]\r\nSay \"hi\", \u00e9t\u00e9 \\o/ \'q\'"'
+    html = 'WH.markup.printHtml("' + literal + ', "guide-body");'
+
+    assert scan_page(html).markup == "[b]Head[/b]\nSay \"hi\", été \\o/ 'q'"
+
+
+def test_only_the_guide_body_literal_is_used():
+    html = (
+        'WH.markup.printHtml("sidebar", "sidebar-body");'
+        'WH.markup.printHtml("main \\"guide-body\\"", "guide-body");'
+    )
+
+    assert scan_page(html).markup == 'main "guide-body"'
+
+
+def test_decode_js_string_reports_the_end():
+    text = r'a\x41\/b" tail'
+    decoded, end = decode_js_string(text, 0)
+
+    assert decoded == "aA/b"
+    assert text[end:] == " tail"
+    assert decode_js_string('"unterminated', 1) is None
+
+
+def test_scanner_is_linear_on_unterminated_markers():
+    rng = random.Random(0)
+    junk = "".join(rng.choice("abc ") for _ in range(20000))
+    html = ("WH.Gatherer.addData(3, 1, {" + junk) * 20
+
+    assert scan_page(html).names == {}
+
+
+def test_item_paths_outside_links_are_ignored():
+    html = (
+        '<img data-src="/item=3/not-a-link">'
+        "[item=4/plain] "
+        '<A HREF="/item=5/upper-anchor">x</A>'
+    )
+
+    assert scan_page(html).slugs == {"5": "upper-anchor"}
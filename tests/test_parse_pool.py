@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.synthetic import generate_site
+from wowrn_scraper.domain.models import ItemRegistry
+from wowrn_scraper.infrastructure.http_client import HttpResponse
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.spec_snapshot_store import SpecSnapshotStore
+from wowrn_scraper.infrastructure.wowhead_scraper import (
+    WowheadScraper,
+    parse_guide_page,
+)
+
+CLASS_SPECS = {"mage": ["arcane", "fire"], "priest": ["shadow"]}
+
+
+class SiteHttpClient:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, revalidate=False, allow_redirects=True, timeout=None):
+        path = "/" + url.split("/", 3)[3]
+        return HttpResponse(url=url, status_code=200, text=self.pages[path])
+
+
+@pytest.fixture(scope="module")
+def pages():
+    guides, _, _ = generate_site(CLASS_SPECS, seed=7, pool=60)
+    return guides
+
+
+def scrape_all(pages, parse_pool=None, snapshot_store=None):
+    scraper = WowheadScraper(
+        http_client=SiteHttpClient(pages),
+        snapshot_store=snapshot_store,
+        item_store=ItemStore(":memory:"),
+        item_registry=ItemRegistry(),
+        parse_pool=parse_pool,
+    )
+    scraper.BASE_URL = "https://guides.test/guide/classes"
+    return [
+        scraper.scrape_spec(class_name, spec_name)
+        for class_name, specs in CLASS_SPECS.items()
+        for spec_name in specs
+    ], scraper
+
+
+def test_process_pool_parsing_matches_in_process_parsing(pages):
+    in_process, _ = scrape_all(pages)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pooled, scraper = scrape_all(pages, parse_pool=pool)
+
+    assert [s.to_dict() for s in pooled] == [s.to_dict() for s in in_process]
+    assert all(s.markup_hash for s in pooled)
+    shared = {}
+    for spec_data in pooled:
+        for record in spec_data.iter_records():
+            assert shared.setdefault(record.id, record) is record
+            assert scraper.item_registry.get(record.id) is record
+
+
+def test_worker_returns_an_error_for_pages_without_markup():
+    spec_data = parse_guide_page("mage", "fire", "https://guides.test", "<html/>")
+
+    assert spec_data.error == "No markup found"
+
+
+def test_worker_skips_parsing_a_guide_with_a_known_hash(pages, tmp_path, monkeypatch):
+    store = SpecSnapshotStore(str(tmp_path))
+    first, _ = scrape_all(pages, snapshot_store=store)
+    for spec_data in first:
+        store.save(spec_data)
+
+    def fail_parse(*args):
+        raise AssertionError("unchanged guide must not be parsed")
+
+    monkeypatch.setattr(WowheadScraper, "parse_markup", fail_parse)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        second, _ = scrape_all(pages, parse_pool=pool, snapshot_store=store)
+
+    assert all(spec_data.reused for spec_data in second)
+    assert [s.to_dict() for s in second] == [s.to_dict() for s in first]
@@ -0,0 +1,82 @@
+import pytest
+
+from benchmarks.legacy_parsers import LegacyRegexParsers
+from benchmarks.synthetic import generate_spec
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+HAND_WRITTEN_MARKUPS = [
+    """
+    [tabs name=bis_items]
+    [tab name="Raid"]
+    [tr][td][b]Head[/b][/td][td][item=100][/td][/tr]
+    [/tab]
+    [/tabs]
+    """,
+    '[tabs name="bis_items"][tab name="Overall"][tr][td][color=q4]Main '
+    "Hand[/color][/td][td]none[/td][td][item=7][item=8][/td][/tr][/tab]"
+    '[tab name="Mythic+"][tr][td header]Slot[/td][/tr][/tab][/tabs]',
+    '[h2 toc="Puzzling Cartel Chips"][/h2][h2]Next[/h2][ul][li][item=5][/li][/ul]',
+    "Intro [h2]Puzzling Cartel Chips[/h2] text [item=11] and [item=12][item=11]"
+    "[h1]Done[/h1][item=13]",
+    "Some Cartel Chips advice [ol][li]no link[/li][li][item=21][/li][/ol]"
+    "[ul][li][item=22][/li][li][item=21][/li][/ul]",
+    "cartel chip notes [ul][li][item=31][/li][/ul] Puzzling Cartel Chips[/h2]"
+    '[ol][li][item=32][/li][/ol][h2 toc="Puzzling Cartel Chips"]'
+    "[ul][li][item=33][/li][/ul][h2]End[/h2]",
+    "CARTEL CHIPS first [ul][li][item=41][/li][/ul]"
+    "[h2]Puzzling Cartel Chips[/h2][ol][li][item=42][/li][/ol]",
+    "[tier-list=rows][tier][tier-label]S[/tier-label][tier-content]"
+    "[item=1][url=item=2/two]x[/url][item=1][/tier-content][/tier]"
+    "[tier][tier-label bg=q3]A[/tier-label][/tier]"
+    "[tier][tier-content][item=3][/tier-content][/tier][/tier-list]",
+    "no structure at all",
+]
+
+
+class OfflineScraper(WowheadScraper):
+    def _get_item_name(self, item_id, item_mapping):
+        return item_mapping.get(item_id, f"Item {item_id}")
+
+
+class OfflineLegacyParsers(LegacyRegexParsers):
+    def _get_item_name(self, item_id, item_mapping):
+        return item_mapping.get(item_id, f"Item {item_id}")
+
+
+def parse_all(parser, markup, mapping):
+    return (
+        parser._parse_bis_items(markup, mapping),
+        parser._parse_cartel_chips(markup, mapping),
+        parser._parse_trinkets(markup, mapping),
+    )
+
+
+@pytest.fixture(scope="module")
+def parsers():
+    store = ItemStore(":memory:")
+    return OfflineScraper(item_store=store), OfflineLegacyParsers(item_store=store)
+
+
+@pytest.mark.parametrize("markup", HAND_WRITTEN_MARKUPS)
+def test_hand_written_markup_matches_regex_parsers(parsers, markup):
+    parser, legacy_parser = parsers
+    mapping = {"100": "Raid Helm", "7": "Blade"}
+
+    assert parse_all(parser, markup, mapping) == parse_all(
+        legacy_parser, markup, mapping
+    )
+
+
+@pytest.mark.parametrize("cartel_style", ["toc", "title", "text", None])
+@pytest.mark.parametrize("seed", range(10))
+def test_synthetic_guides_match_regex_parsers(parsers, seed, cartel_style):
+    parser, legacy_parser = parsers
+    markup, mapping = generate_spec(seed, cartel_style=cartel_style)
+
+    result = parse_all(parser, markup, mapping)
+    legacy_result = parse_all(legacy_parser, markup, mapping)
+
+    assert result == legacy_result
+    assert set(result[0]) == {"Overall", "Raid", "Mythic+"}
+    assert all(result[2].tiers.values())
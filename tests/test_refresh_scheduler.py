@@ -0,0 +1,170 @@
+import json
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from wowrn_scraper.application.refresh_scheduler import (
+    HOUR,
+    RefreshPolicy,
+    RefreshScheduler,
+)
+from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.domain.models import BisList, SlotItem, SpecData
+from wowrn_scraper.infrastructure import request_budget
+from wowrn_scraper.infrastructure.json_adapter import JsonStorageAdapter
+from wowrn_scraper.infrastructure.refresh_state_store import RefreshStateStore
+from wowrn_scraper.infrastructure.request_budget import HourlyRequestBudget
+
+CLASS_SPECS = {"mage": ["arcane", "fire"], "priest": ["shadow"]}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class VersionedScraper:
+    def __init__(self) -> None:
+        self.versions = {}
+        self.calls = []
+
+    def scrape_spec(self, class_name: str, spec_name: str) -> SpecData:
+        self.calls.append(f"{class_name}/{spec_name}")
+        version = self.versions.get(f"{class_name}/{spec_name}", 0)
+        item = SlotItem(id=f"{spec_name}-{version}", name="Helm", slot="Head")
+        return SpecData(
+            class_name=class_name,
+            spec_name=spec_name,
+            bis_lists={"Overall": BisList(context="Overall", items=[item])},
+            markup_hash=f"{spec_name}-{version}",
+        )
+
+
+class FakeItems:
+    def __init__(self, history):
+        self.history = history
+        self.refreshed = []
+
+    def loot_history(self, item_ids):
+        return {i: self.history[i] for i in item_ids if i in self.history}
+
+    def refresh_items(self, item_ids):
+        self.refreshed.append(list(item_ids))
+        return {
+            item_id: {"source_type": "raid", "boss_name": "Boss", "location_name": "X"}
+            for item_id in item_ids
+        }
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def make_scheduler(tmp_path, clock, scraper, **options):
+    service = ScraperService(scraper, [JsonStorageAdapter()])
+    return RefreshScheduler(
+        service,
+        CLASS_SPECS,
+        [str(tmp_path / "pve_data.json")],
+        state=RefreshStateStore(str(tmp_path / "refresh_state.json")),
+        policy=RefreshPolicy(min_age=HOUR, max_age=10 * HOUR),
+        clock=clock,
+        sleep=clock.sleep,
+        **options,
+    )
+
+
+def test_volatile_specs_are_due_sooner():
+    policy = RefreshPolicy(min_age=HOUR, max_age=10 * HOUR)
+
+    assert policy.priority(None, 0, 0, 0) == math.inf
+    assert policy.target_age(8, 0) == pytest.approx(9 * HOUR)
+    assert policy.target_age(8, 8) == HOUR
+    assert policy.priority(0, 8, 8, 2 * HOUR) > policy.priority(0, 8, 0, 2 * HOUR)
+
+
+def test_each_unit_writes_the_outputs(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock, VersionedScraper())
+
+    assert scheduler.run(max_units=1) == 1
+    first = json.loads((tmp_path / "pve_data.json").read_text(encoding="utf-8"))
+    assert list(first) == ["mage"] and list(first["mage"]) == ["arcane"]
+
+    scheduler.run(max_units=2)
+    data = json.loads((tmp_path / "pve_data.json").read_text(encoding="utf-8"))
+    assert {c: list(s) for c, s in data.items()} == CLASS_SPECS
+    state = json.loads((tmp_path / "refresh_state.json").read_text(encoding="utf-8"))
+    assert state["specs"]["priest/shadow"]["checks"] == 1
+
+
+def test_stalest_and_most_volatile_specs_go_first(tmp_path, clock):
+    scraper = VersionedScraper()
+    scheduler = make_scheduler(tmp_path, clock, scraper)
+    for check in range(4):
+        scheduler.state.record_success("mage/fire", "same", clock.now - 2 * HOUR)
+        scheduler.state.record_success("mage/arcane", "same", clock.now)
+        scheduler.state.record_success("priest/shadow", f"v{check}", clock.now)
+    assert scheduler.state.get("priest/shadow")["changes"] == 3
+
+    clock.now += 4 * HOUR
+    assert scheduler.due_specs(clock.now) == [("priest", "shadow")]
+
+    clock.now += 6 * HOUR
+    scheduler.run(max_units=3)
+    assert scraper.calls == ["priest/shadow", "mage/fire", "mage/arcane"]
+
+
+def test_recently_attempted_specs_wait_and_the_scheduler_idles(tmp_path, clock):
+    scraper = VersionedScraper()
+    scheduler = make_scheduler(tmp_path, clock, scraper, idle_interval=600)
+    scheduler.run(max_units=3)
+
+    assert scheduler.due_specs(clock.now) == []
+    assert scheduler.run_once() == 600
+
+
+def test_due_items_are_refreshed_once_specs_are_fresh(tmp_path, clock):
+    items = FakeItems({"arcane-0": (None, 0, 0), "fire-0": (clock.now, 1, 0)})
+    scheduler = make_scheduler(
+        tmp_path, clock, VersionedScraper(), item_refresher=items
+    )
+    scheduler.run(max_units=4)
+
+    assert items.refreshed == [["arcane-0", "shadow-0"]]
+    data = json.loads((tmp_path / "pve_data.json").read_text(encoding="utf-8"))
+    assert data["mage"]["arcane"]["bis"]["Overall"][0]["boss_name"] == "Boss"
+    assert data["priest"]["shadow"]["bis"]["Overall"][0]["boss_name"] == "Boss"
+    assert data["mage"]["fire"]["bis"]["Overall"][0]["boss_name"] is None
+    assert scheduler.due_items(clock.now) == []
+
+
+def test_spent_budget_pauses_the_scheduler(tmp_path, clock):
+    budget = HourlyRequestBudget({"www.wowhead.com": 1})
+    budget.acquire("www.wowhead.com")
+    scheduler = make_scheduler(tmp_path, clock, VersionedScraper(), budget=budget)
+
+    wait = scheduler.run_once()
+
+    assert HOUR - 5 < wait <= HOUR
+    assert not (tmp_path / "pve_data.json").exists()
+
+
+def test_hourly_budget_blocks_until_a_slot_frees(clock, monkeypatch):
+    fake_time = SimpleNamespace(monotonic=clock, sleep=clock.sleep)
+    monkeypatch.setattr(request_budget, "time", fake_time)
+    budget = HourlyRequestBudget({"slow.test": 2}, window=0.2)
+
+    waits = [budget.acquire("slow.test") for _ in range(3)]
+
+    assert waits == [0.0, 0.0, pytest.approx(0.2)]
+    assert budget.remaining("slow.test") == 1
+    assert budget.remaining("other.test") is None
+    assert budget.acquire("other.test") == 0.0
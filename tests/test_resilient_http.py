@@ -0,0 +1,183 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from benchmarks.stand_in_server import StandInServer
+from wowrn_scraper.infrastructure import rate_limiter
+from wowrn_scraper.infrastructure.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from wowrn_scraper.infrastructure.http_client import HttpClient, parse_retry_after
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.metrics import RunMetrics
+from wowrn_scraper.infrastructure.rate_limiter import AdaptiveRateLimiter
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    statuses = []
+    requests_seen = 0
+    retry_after = None
+
+    def do_GET(self):
+        FlakyHandler.requests_seen += 1
+        status = FlakyHandler.statuses.pop(0) if FlakyHandler.statuses else 200
+        body = b"ok" if status == 200 else b""
+        self.send_response(status)
+        if status == 429 and FlakyHandler.retry_after is not None:
+            self.send_header("Retry-After", FlakyHandler.retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.statuses = []
+    FlakyHandler.requests_seen = 0
+    FlakyHandler.retry_after = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(**kwargs):
+    kwargs.setdefault("rate_limiter", AdaptiveRateLimiter(min_interval=0.0, floor=0.0))
+    kwargs.setdefault("backoff_base", 0.0)
+    return HttpClient(**kwargs)
+
+
+def test_adaptive_limiter_speeds_up_and_backs_off():
+    limiter = AdaptiveRateLimiter(min_interval=1.0, floor=0.5, step=0.25)
+
+    limiter.record_success("host")
+    limiter.record_success("host")
+    limiter.record_success("host")
+    assert limiter.interval_for("host") == 0.5
+
+    limiter.record_throttle("host")
+    assert limiter.interval_for("host") == 1.0
+    assert limiter.interval_for("other") == 1.0
+
+
+def test_throttle_with_retry_after_pauses_the_host(monkeypatch):
+    sleeps = []
+    fake_time = SimpleNamespace(monotonic=lambda: 100.0, sleep=sleeps.append)
+    monkeypatch.setattr(rate_limiter, "time", fake_time)
+    limiter = AdaptiveRateLimiter(min_interval=0.0, floor=0.0)
+    limiter.record_throttle("127.0.0.1", retry_after=0.2)
+
+    assert limiter.acquire("http://127.0.0.1/page") == pytest.approx(0.2)
+    assert sleeps == [pytest.approx(0.2)]
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_throttled_requests_are_retried_until_they_succeed():
+    pages = {f"/page/{i}": f"page {i}" for i in range(20)}
+    metrics = RunMetrics()
+    with StandInServer(pages, throttle_rate=0.3, retry_after=0, seed=3) as server:
+        client = make_client(metrics=metrics, max_retries=10)
+        bodies = [client.get(server.url + path).text for path in pages]
+        host = client.rate_limiter.host_of(server.url)
+        throttled = server.throttled
+
+    assert bodies == list(pages.values())
+    assert throttled > 0
+    assert metrics.value("http_retries_total", host=host) == throttled
+
+
+def test_server_errors_are_retried_with_backoff(flaky_server):
+    FlakyHandler.statuses = [503, 502]
+    client = make_client()
+
+    response = client.get(flaky_server + "/item")
+
+    assert response.text == "ok"
+    assert FlakyHandler.requests_seen == 3
+
+
+def test_exhausted_retries_raise(flaky_server):
+    FlakyHandler.statuses = [500, 500, 500]
+    client = make_client(max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.get(flaky_server + "/item")
+    assert FlakyHandler.requests_seen == 3
+
+
+def test_circuit_breaker_fails_fast_for_a_dead_host(flaky_server):
+    FlakyHandler.statuses = [503] * 10
+    client = make_client(
+        max_retries=0, circuit_breaker=CircuitBreaker(failure_threshold=2)
+    )
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get(flaky_server + "/item")
+    with pytest.raises(CircuitOpenError):
+        client.get(flaky_server + "/item")
+    assert FlakyHandler.requests_seen == 2
+
+
+def test_long_retry_after_counts_as_a_circuit_failure(flaky_server):
+    FlakyHandler.statuses = [429, 429]
+    FlakyHandler.retry_after = "120"
+    metrics = RunMetrics()
+    client = make_client(
+        metrics=metrics,
+        backoff_max=30.0,
+        circuit_breaker=CircuitBreaker(failure_threshold=1),
+    )
+
+    with pytest.raises(requests.HTTPError):
+        client.get(flaky_server + "/item")
+    with pytest.raises(CircuitOpenError):
+        client.get(flaky_server + "/item")
+    host = client.rate_limiter.host_of(flaky_server)
+    assert FlakyHandler.requests_seen == 1
+    assert metrics.value("http_errors_total", host=host, error="RetryAfterTooLong")
+
+
+def test_wowdb_paces_requests_by_default():
+    limiter = WowdbScraper(item_store=ItemStore(":memory:")).http_client.rate_limiter
+
+    limiter.record_success("www.wowdb.com")
+    assert limiter.interval_for("www.wowdb.com") == WowdbScraper.REQUEST_INTERVAL > 0
+
+
+def test_circuit_breaker_half_opens_after_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    assert breaker.record_failure("host")
+    assert breaker.state("host") == "half_open"
+
+    breaker.before_request("host")
+    breaker.record_success("host")
+    assert breaker.state("host") == "closed"
+
+
+def test_transient_item_failures_are_not_cached(flaky_server):
+    FlakyHandler.statuses = [503]
+    store = ItemStore(":memory:")
+    scraper = WowdbScraper(item_store=store, http_client=make_client(max_retries=0))
+    scraper.BASE_URL = flaky_server + "/items"
+
+    info = scraper.get_item_loot_info("42")
+
+    assert info["source_type"] == "quest, vendor or crafted"
+    assert store.get_loot_info("42") is None
@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.stand_in_server import StandInServer
+from benchmarks.synthetic import generate_site
+from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.config import WOW_CLASSES
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+from wowrn_scraper.run_scrapers import main, parse_args, select_class_specs
+
+
+def test_select_class_specs_keeps_config_order():
+    selected = select_class_specs(["priest"], ["mage/frost", "mage/arcane"])
+
+    assert selected == {
+        "mage": ["arcane", "frost"],
+        "priest": ["discipline", "holy", "shadow"],
+    }
+    assert select_class_specs() == WOW_CLASSES
+
+
+def test_unknown_targets_are_rejected():
+    with pytest.raises(SystemExit):
+        parse_args(["--spec", "mage/fir"])
+    with pytest.raises(SystemExit):
+        parse_args(["--skip-enrichment", "--enrich-only"])
+    assert parse_args(["--class", "mage"]).partial
+    assert not parse_args([]).partial
+
+
+@pytest.fixture
+def site(monkeypatch):
+    guides, items, _ = generate_site(
+        {"mage": WOW_CLASSES["mage"], "priest": WOW_CLASSES["priest"]}, seed=4
+    )
+    with StandInServer({**guides, **items}) as server:
+        monkeypatch.setattr(WowheadScraper, "BASE_URL", f"{server.url}/guide/classes")
+        monkeypatch.setattr(WowheadScraper, "ITEM_URL", f"{server.url}/item")
+        monkeypatch.setattr(WowdbScraper, "BASE_URL", f"{server.url}/items")
+        yield server
+
+
+def run(tmp_path, *options, code=0):
+    with pytest.raises(SystemExit) as exit_info:
+        main(
+            [
+                *options,
+                "--data-dir",
+                str(tmp_path / "data"),
+                "--lua-output",
+                str(tmp_path / "Data.lua"),
+                "--guide-interval",
+                "0",
+                "--item-interval",
+                "0",
+            ]
+        )
+    assert exit_info.value.code == code
+    if code:
+        return None
+    with open(tmp_path / "data" / "pve_data.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_targeted_refresh_merges_into_existing_output(site, tmp_path):
+    first = run(tmp_path, "--class", "mage")
+    assert list(first) == ["mage"]
+
+    fire_path = "/guide/classes/mage/fire/bis-gear"
+    del site.pages[fire_path]
+    merged = run(tmp_path, "--spec", "priest/shadow", "--spec", "mage/fire")
+
+    assert list(merged["mage"]) == ["arcane", "fire", "frost"]
+    assert merged["mage"] == first["mage"]
+    assert list(merged["priest"]) == ["shadow"]
+    assert merged["priest"]["shadow"]["source"] == "wowhead"
+    assert (tmp_path / "Data.lua").read_text(encoding="utf-8").count("shadow") >= 1
+
+
+def test_skip_then_enrich_only(site, tmp_path):
+    skipped = run(tmp_path, "--spec", "mage/fire", "--skip-enrichment")
+    helm = skipped["mage"]["fire"]["bis"]["Overall"][0]
+    assert helm["source_type"] is None
+
+    enriched = run(tmp_path, "--enrich-only")
+    helm = enriched["mage"]["fire"]["bis"]["Overall"][0]
+    assert helm["source_type"] is not None
+
+
+def test_items_missed_while_wowdb_was_down_are_fixed_next_run(
+    site, tmp_path, monkeypatch
+):
+    items_url = WowdbScraper.BASE_URL
+    monkeypatch.setattr(WowdbScraper, "BASE_URL", "http://127.0.0.1:9/items")
+    down = run(tmp_path, "--spec", "mage/fire", "--max-retries", "0")
+    helm = down["mage"]["fire"]["bis"]["Overall"][0]
+    assert helm["source_type"] == "quest, vendor or crafted"
+
+    monkeypatch.setattr(WowdbScraper, "BASE_URL", items_url)
+    up = run(tmp_path, "--spec", "mage/fire")
+
+    assert up == run(tmp_path / "clean", "--spec", "mage/fire")
+    assert up != down
+
+
+def test_reparse_rebuilds_outputs_from_the_archive(site, tmp_path, monkeypatch):
+    scraped = run(tmp_path, "--class", "mage", "--workers", "1")
+    lua = (tmp_path / "Data.lua").read_text(encoding="utf-8")
+    (tmp_path / "Data.lua").unlink()
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("reparse must not touch the network")
+
+    json_path = tmp_path / "data" / "pve_data.json"
+    os.utime(json_path, ns=(1, 1))
+
+    monkeypatch.setattr("requests.Session.get", no_network)
+    reparsed = run(tmp_path, "--class", "mage", "--workers", "1", "--reparse")
+
+    assert reparsed == scraped
+    assert (tmp_path / "Data.lua").read_text(encoding="utf-8") == lua
+    assert json_path.stat().st_mtime_ns == 1
+    delta = json.loads((tmp_path / "data" / "delta.json").read_text(encoding="utf-8"))
+    assert delta == {"changed": False}
+
+
+def test_reparse_reads_loot_of_unarchived_items_from_the_item_store(
+    site, tmp_path, monkeypatch
+):
+    scraped = run(tmp_path, "--spec", "mage/fire")
+    manifest_path = tmp_path / "data" / "archive" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["pages"] = {
+        url: entry for url, entry in manifest["pages"].items() if "/items/" not in url
+    }
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    item_store_path = tmp_path / "data" / "item_store.sqlite3"
+    mtime = item_store_path.stat().st_mtime_ns
+
+    reparsed = run(tmp_path, "--spec", "mage/fire", "--reparse")
+
+    assert reparsed == scraped
+    assert item_store_path.stat().st_mtime_ns == mtime
+
+
+def test_process_pool_run_matches_threaded_run(site, tmp_path):
+    threaded = run(tmp_path / "threaded", "--class", "priest", "--workers", "1")
+    pooled = run(
+        tmp_path / "pooled",
+        "--class",
+        "priest",
+        "--workers",
+        "1",
+        "--parse-workers",
+        "2",
+    )
+
+    assert pooled == threaded
+
+
+def test_daemon_refreshes_one_spec_per_unit(site, tmp_path):
+    data = run(tmp_path, "--class", "mage", "--daemon", "--max-units", "2")
+
+    assert list(data["mage"]) == ["arcane", "fire"]
+    state_path = tmp_path / "data" / "refresh_state.json"
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    assert sorted(state["specs"]) == ["mage/arcane", "mage/fire"]
+
+    data = run(tmp_path, "--class", "mage", "--daemon", "--max-units", "1")
+    assert list(data["mage"]) == ["arcane", "fire", "frost"]
+    assert data["mage"]["frost"]["bis"]["Overall"][0]["source_type"] is not None
+
+
+def test_daemon_restart_keeps_refreshed_loot(site, tmp_path):
+    data = run(tmp_path, "--spec", "mage/fire", "--daemon", "--max-units", "1")
+    helm_id = data["mage"]["fire"]["bis"]["Overall"][0]["id"]
+    loot = {"source_type": "raid", "boss_name": "New Boss", "location_name": "Raid"}
+    item_store = ItemStore(str(tmp_path / "data" / "item_store.sqlite3"))
+    item_store.put_loot_info(helm_id, loot)
+    item_store.close()
+
+    ages = ("--refresh-min-age", "0.000001", "--refresh-max-age", "0.000001")
+    data = run(tmp_path, "--spec", "mage/fire", "--daemon", "--max-units", "1", *ages)
+
+    assert data["mage"]["fire"]["bis"]["Overall"][0]["boss_name"] == "New Boss"
+
+
+def test_interrupted_batch_run_fails(site, tmp_path, monkeypatch):
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ScraperService, "collect", interrupt)
+    run(tmp_path, "--class", "mage", code=130)
+
+    metrics_path = tmp_path / "data" / "metrics" / "run_metrics.json"
+    metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert metrics["counters"]["runs_total"] == [
+        {"labels": {"status": "failed"}, "value": 1}
+    ]
+    assert not (tmp_path / "data" / "pve_data.json").exists()
+
+
+def test_daemon_rejects_batch_only_modes():
+    with pytest.raises(SystemExit):
+        parse_args(["--daemon", "--reparse"])
+
+
+def test_sqlite_export_matches_json_output(site, tmp_path):
+    export = tmp_path / "wowrn.sqlite3"
+    data = run(tmp_path, "--class", "priest", "--sqlite-output", str(export))
+
+    conn = sqlite3.connect(export)
+    specs = conn.execute("SELECT class_name, spec_name FROM specs").fetchall()
+    placements = conn.execute("SELECT COUNT(*) FROM bis_placements").fetchone()[0]
+    conn.close()
+
+    assert specs == [("priest", name) for name in data["priest"]]
+    assert placements == sum(
+        len(items) for spec in data["priest"].values() for items in spec["bis"].values()
+    )
@@ -0,0 +1,274 @@
+import random
+import threading
+import time
+
+import pytest
+
+from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.domain.models import BisList, ScrapingResult, SlotItem, SpecData
+from wowrn_scraper.infrastructure import rate_limiter
+from wowrn_scraper.infrastructure.rate_limiter import HostRateLimiter
+
+CLASS_SPECS = {
+    "mage": ["arcane", "fire", "frost"],
+    "priest": ["discipline", "holy", "shadow"],
+    "warrior": ["arms", "fury"],
+}
+
+
+class FakeScraper:
+    def __init__(self, jitter: float = 0.0) -> None:
+        self.jitter = jitter
+
+    def scrape_spec(self, class_name: str, spec_name: str) -> SpecData:
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        item = SlotItem(id=f"{class_name}-{spec_name}", name="Helm", slot="Head")
+        return SpecData(
+            class_name=class_name,
+            spec_name=spec_name,
+            url=f"https://example.test/{class_name}/{spec_name}",
+            bis_lists={"Overall": BisList(context="Overall", items=[item])},
+        )
+
+
+def test_concurrent_run_matches_sequential_run():
+    sequential = ScraperService(FakeScraper(), []).run(CLASS_SPECS, [])
+    concurrent = ScraperService(FakeScraper(jitter=0.01), [], max_workers=4).run(
+        CLASS_SPECS, []
+    )
+
+    assert concurrent.to_dict() == sequential.to_dict()
+    assert list(concurrent.specs) == list(CLASS_SPECS)
+    for class_name, specs in CLASS_SPECS.items():
+        assert list(concurrent.specs[class_name]) == specs
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_spaces_requests_per_host(monkeypatch):
+    fake_time = FakeTime()
+    monkeypatch.setattr(rate_limiter, "time", fake_time)
+    limiter = HostRateLimiter(min_interval=0.05)
+
+    waits = [limiter.acquire("https://www.wowhead.com/guide") for _ in range(3)]
+    other_wait = limiter.acquire("https://www.wowdb.com/items/1")
+
+    assert waits == pytest.approx([0.0, 0.05, 0.05])
+    assert other_wait == 0.0
+    assert fake_time.sleeps == pytest.approx([0.05, 0.05])
+
+
+class RecordingEnricher:
+    def __init__(self, events):
+        self.events = events
+
+    def enrich_result(self, result):
+        self.events.append("enrich")
+        for specs in result.specs.values():
+            for spec_data in specs.values():
+                for record in spec_data.iter_records():
+                    record.update_loot({"source_type": "raid"})
+
+
+class RecordingAdapter:
+    def __init__(self, events, barrier=None):
+        self.events = events
+        self.barrier = barrier
+        self.written = []
+
+    def save(self, result, output_path):
+        self.write(result.to_dict(), output_path)
+
+    def write(self, data, output_path):
+        if self.barrier:
+            self.barrier.wait()
+        self.events.append(f"write {output_path}")
+        self.written.append(data)
+
+
+def test_pipeline_enriches_then_serializes_once_for_all_adapters(monkeypatch):
+    events = []
+    adapters = [RecordingAdapter(events), RecordingAdapter(events)]
+    service = ScraperService(
+        FakeScraper(), adapters, enricher=RecordingEnricher(events)
+    )
+    serialized = []
+    original_to_dict = ScrapingResult.to_dict
+
+    def counting_to_dict(self):
+        serialized.append(self)
+        return original_to_dict(self)
+
+    monkeypatch.setattr(ScrapingResult, "to_dict", counting_to_dict)
+
+    service.run(CLASS_SPECS, ["a.json", "b.lua"])
+
+    assert events == ["enrich", "write a.json", "write b.lua"]
+    assert len(serialized) == 1
+    assert adapters[0].written[0] is adapters[1].written[0]
+    helm = adapters[0].written[0]["mage"]["fire"]["bis"]["Overall"][0]
+    assert helm["source_type"] == "raid"
+
+
+def test_parallel_writes_overlap_adapters():
+    events = []
+    barrier = threading.Barrier(3, timeout=5)
+    adapters = [RecordingAdapter(events, barrier) for _ in range(3)]
+    service = ScraperService(FakeScraper(), adapters, parallel_writes=True)
+
+    service.run(CLASS_SPECS, ["a", "b", "c"])
+
+    assert sorted(events) == ["write a", "write b", "write c"]
+
+
+class ChattyAdapter:
+    def __init__(self, name, wait_for=None, then_set=None):
+        self.name = name
+        self.wait_for = wait_for
+        self.then_set = then_set
+
+    def save(self, result, output_path):
+        self.write(result.to_dict(), output_path)
+
+    def write(self, data, output_path):
+        print(f"{self.name} started")
+        if self.then_set:
+            self.then_set.set()
+        if self.wait_for:
+            assert self.wait_for.wait(5)
+        print(f"{self.name} finished")
+
+
+def test_parallel_writes_print_each_writer_in_order(capsys):
+    first_started, second_started = threading.Event(), threading.Event()
+    adapters = [
+        ChattyAdapter("json", wait_for=second_started, then_set=first_started),
+        ChattyAdapter("lua", wait_for=first_started, then_set=second_started),
+    ]
+    service = ScraperService(FakeScraper(), adapters, parallel_writes=True)
+
+    service.save(ScrapingResult(), ["a", "b"])
+    print("after save")
+
+    assert capsys.readouterr().out.splitlines()[-5:] == [
+        "json started",
+        "json finished",
+        "lua started",
+        "lua finished",
+        "after save",
+    ]
+
+
+class SlowEnricher:
+    def __init__(self, delay):
+        self.delay = delay
+        self.enriched = []
+
+    def enrich_result(self, result):
+        for specs in result.specs.values():
+            for spec_data in specs.values():
+                self.enrich_spec(spec_data)
+
+    def enrich_spec(self, spec_data):
+        time.sleep(self.delay)
+        self.enriched.append(spec_data.spec_name)
+
+
+class CountingScraper(FakeScraper):
+    def __init__(self, delay, pending):
+        super().__init__()
+        self.delay = delay
+        self.pending = pending
+        self.lock = threading.Lock()
+        self.max_pending = 0
+
+    def scrape_spec(self, class_name, spec_name):
+        time.sleep(self.delay)
+        with self.lock:
+            self.pending.add(spec_name)
+            self.max_pending = max(self.max_pending, len(self.pending))
+        return super().scrape_spec(class_name, spec_name)
+
+
+class GatedScraper(FakeScraper):
+    def __init__(self, gate, last_spec):
+        super().__init__()
+        self.gate = gate
+        self.last_spec = last_spec
+        self.overlapped = None
+
+    def scrape_spec(self, class_name, spec_name):
+        if spec_name == self.last_spec:
+            self.overlapped = self.gate.wait(5)
+        return super().scrape_spec(class_name, spec_name)
+
+
+def test_streaming_overlaps_scraping_and_enrichment():
+    enricher = SlowEnricher(delay=0)
+    gate = threading.Event()
+    original = enricher.enrich_spec
+
+    def enrich_spec(spec_data):
+        original(spec_data)
+        gate.set()
+
+    enricher.enrich_spec = enrich_spec
+    scraper = GatedScraper(gate, last_spec=CLASS_SPECS["warrior"][-1])
+    streaming = ScraperService(
+        scraper, [], enricher=enricher, streaming=True, max_workers=1
+    )
+
+    result = streaming.run(CLASS_SPECS, [])
+
+    sequential = ScraperService(FakeScraper(), []).run(CLASS_SPECS, [])
+    assert result.to_dict() == sequential.to_dict()
+    assert list(result.specs) == list(CLASS_SPECS)
+    assert sorted(enricher.enriched) == sorted(
+        spec for specs in CLASS_SPECS.values() for spec in specs
+    )
+    assert scraper.overlapped
+
+
+def test_streaming_queue_applies_backpressure():
+    pending = set()
+    enricher = SlowEnricher(delay=0.02)
+    original = enricher.enrich_spec
+
+    def drain(spec_data):
+        original(spec_data)
+        pending.discard(spec_data.spec_name)
+
+    enricher.enrich_spec = drain
+    scraper = CountingScraper(delay=0.0, pending=pending)
+    service = ScraperService(
+        scraper, [], enricher=enricher, streaming=True, queue_size=1, max_workers=2
+    )
+
+    service.run(CLASS_SPECS, [])
+
+    assert scraper.max_pending <= 1 + 1 + 2
+
+
+def test_streaming_propagates_enrichment_errors():
+    class FailingEnricher(SlowEnricher):
+        def enrich_spec(self, spec_data):
+            raise RuntimeError("wowdb down")
+
+    service = ScraperService(
+        FakeScraper(), [], enricher=FailingEnricher(0), streaming=True
+    )
+
+    with pytest.raises(RuntimeError, match="wowdb down"):
+        service.run(CLASS_SPECS, [])
@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from wowrn_scraper.application.scraper_service import ScraperService
+from wowrn_scraper.application.source_registry import SourceRegistry
+from wowrn_scraper.domain.models import BisList, ItemRegistry, SlotItem, SpecData
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+
+CLASS_SPECS = {"mage": ["arcane", "fire"], "priest": ["shadow"]}
+DROP_HTML = '<dd class="item-extra">Dropped by <b>Big Boss</b> - Test Raid.</dd>'
+
+
+class GuideSource:
+    def __init__(self, item_ids, registry=None, barrier=None, failing=()):
+        self.item_ids = item_ids
+        self.registry = registry
+        self.barrier = barrier
+        self.failing = set(failing)
+
+    def scrape_spec(self, class_name, spec_name):
+        if self.barrier:
+            self.barrier.wait()
+        if spec_name in self.failing:
+            return SpecData(class_name, spec_name, error="Failed to fetch")
+        items = [
+            SlotItem(
+                slot="Head",
+                record=self.registry.record(item_id, f"Item {item_id}"),
+            )
+            for item_id in self.item_ids
+        ]
+        return SpecData(
+            class_name,
+            spec_name,
+            bis_lists={"Overall": BisList(context="Overall", items=items)},
+        )
+
+
+def test_results_are_tagged_and_merged_in_source_order():
+    registry = ItemRegistry()
+    sources = (
+        SourceRegistry()
+        .register("wowhead", GuideSource(["1"], registry, failing={"shadow"}))
+        .register("icyveins", GuideSource(["2"], registry))
+    )
+
+    result = ScraperService(None, [], sources=sources).run(CLASS_SPECS, [])
+
+    data = result.to_dict()
+    assert data["mage"]["fire"]["source"] == "wowhead"
+    assert data["mage"]["fire"]["bis"]["Overall"][0]["id"] == "1"
+    assert data["priest"]["shadow"]["source"] == "icyveins"
+    assert result.source_spec("icyveins", "mage", "fire").bis_lists["Overall"]
+    assert result.source_spec("wowhead", "priest", "shadow").error
+    assert list(result.by_source) == ["wowhead", "icyveins"]
+
+
+def test_sources_run_concurrently_under_their_own_workers():
+    registry = ItemRegistry()
+    barrier = threading.Barrier(2, timeout=5)
+    sources = (
+        SourceRegistry()
+        .register("slow", GuideSource(["1"], registry, barrier), max_workers=1)
+        .register("other", GuideSource(["1"], registry, barrier), max_workers=1)
+    )
+
+    result = ScraperService(None, [], sources=sources).run(CLASS_SPECS, [])
+
+    assert not barrier.broken
+    assert list(result.by_source) == ["slow", "other"]
+
+
+def test_sources_share_one_enrichment_per_item(monkeypatch):
+    registry = ItemRegistry()
+    sources = (
+        SourceRegistry()
+        .register("wowhead", GuideSource(["1", "2"], registry))
+        .register("icyveins", GuideSource(["2", "3"], registry))
+    )
+    enricher = WowdbScraper(item_store=ItemStore(":memory:"))
+    fetched = []
+    monkeypatch.setattr(
+        enricher, "_fetch_item_page", lambda i: fetched.append(i) or DROP_HTML
+    )
+
+    result = ScraperService(
+        None, [], sources=sources, enricher=enricher, streaming=True
+    ).run(CLASS_SPECS, [])
+
+    assert sorted(fetched) == ["1", "2", "3"]
+    helm = result.source_spec("icyveins", "priest", "shadow").bis_lists["Overall"]
+    assert helm.items[1].boss_name == "Big Boss"
+
+
+def test_duplicate_source_names_are_rejected():
+    registry = SourceRegistry().register("wowhead", GuideSource([]))
+    with pytest.raises(ValueError):
+        registry.register("wowhead", GuideSource([]))
@@ -0,0 +1,131 @@
+import sqlite3
+
+import pytest
+
+from wowrn_scraper.domain.models import ScrapingResult
+from wowrn_scraper.infrastructure.sqlite_adapter import SqliteStorageAdapter
+
+CROWN = {
+    "id": "100",
+    "name": "Crown of Tests",
+    "source_type": "raid",
+    "boss_name": "Test Boss",
+    "location_name": "Test Raid",
+}
+IDOL = {
+    "id": "200",
+    "name": "Idol of Tests",
+    "source_type": None,
+    "boss_name": None,
+    "location_name": None,
+}
+DATA = {
+    "mage": {
+        "fire": {
+            "source": "wowhead",
+            "url": "https://example.test/mage/fire",
+            "bis": {
+                "Overall": [{"slot": "Head", **CROWN}],
+                "Raid": [{"slot": "Head", **CROWN}],
+            },
+            "cartel_chips": [{"id": "300", "name": "Chip", "details": "Pick this one"}],
+            "trinkets": {"S": [IDOL], "A": [CROWN]},
+        },
+        "frost": {"error": "HTTP 404", "source": "wowhead"},
+    },
+    "priest": {
+        "shadow": {
+            "url": "https://example.test/priest/shadow",
+            "bis": {"Overall": [{"slot": "Head", **CROWN}]},
+            "cartel_chips": [],
+            "trinkets": {
+                "S": [{**IDOL, "source_type": "dungeon", "boss_name": "Test Boss"}]
+            },
+        }
+    },
+}
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "wowrn.sqlite3"
+    SqliteStorageAdapter().write(DATA, str(path))
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def test_specs_wanting_an_item(database):
+    rows = database.execute(
+        "SELECT DISTINCT s.class_name, s.spec_name FROM bis_placements b "
+        "JOIN specs s USING (spec_id) WHERE b.item_id = ? ORDER BY s.spec_id",
+        ("100",),
+    ).fetchall()
+
+    assert rows == [("mage", "fire"), ("priest", "shadow")]
+
+
+def test_tier_trinkets_from_a_boss(database):
+    query = (
+        "SELECT s.spec_name, i.name FROM trinket_tiers t "
+        "JOIN items i USING (item_id) JOIN specs s USING (spec_id) "
+        "WHERE t.tier = ? AND i.boss_name = ?"
+    )
+
+    assert database.execute(query, ("S", "Test Boss")).fetchall() == [
+        ("fire", "Idol of Tests"),
+        ("shadow", "Idol of Tests"),
+    ]
+    plan = " ".join(
+        row[-1] for row in database.execute("EXPLAIN QUERY PLAN " + query, ("S", "X"))
+    )
+    assert "INDEX" in plan
+
+
+def test_items_are_normalized_and_loot_is_filled_in(database):
+    assert database.execute("SELECT * FROM items ORDER BY item_id").fetchall() == [
+        ("100", "Crown of Tests", "raid", "Test Boss", "Test Raid"),
+        ("200", "Idol of Tests", "dungeon", "Test Boss", None),
+        ("300", "Chip", None, None, None),
+    ]
+    assert database.execute(
+        "SELECT context, slot FROM bis_placements WHERE spec_id = 1"
+    ).fetchall() == [("Overall", "Head"), ("Raid", "Head")]
+    assert database.execute("SELECT * FROM cartel_chips").fetchall() == [
+        (1, 0, "300", "Pick this one")
+    ]
+    assert database.execute(
+        "SELECT spec_name, source, error FROM specs WHERE class_name = 'mage'"
+    ).fetchall() == [("fire", "wowhead", None), ("frost", "wowhead", "HTTP 404")]
+
+
+def test_lookups_are_indexed(database):
+    indexes = {
+        row[0]
+        for row in database.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        )
+    }
+
+    assert indexes == {
+        "idx_items_boss",
+        "idx_items_location",
+        "idx_bis_item",
+        "idx_trinket_item",
+        "idx_trinket_tier",
+        "idx_cartel_item",
+    }
+
+
+def test_save_matches_write_and_unchanged_exports_are_left_alone(tmp_path):
+    adapter = SqliteStorageAdapter()
+    written = tmp_path / "written.sqlite3"
+    saved = tmp_path / "saved.sqlite3"
+    adapter.write(DATA, str(written))
+    adapter.save(ScrapingResult.from_dict(DATA), str(saved))
+
+    assert saved.read_bytes() == written.read_bytes()
+
+    mtime = written.stat().st_mtime_ns
+    adapter.write(DATA, str(written))
+    assert written.stat().st_mtime_ns == mtime
@@ -1,10 +1,13 @@
 import pytest
-from wowrn_scraper.wowhead.main import (
-    extract_item_mapping,
-    extract_guide_markup,
-    parse_item_link,
-    parse_bis_items
-)
+
+from wowrn_scraper.infrastructure.item_store import ItemStore
+from wowrn_scraper.infrastructure.wowhead_scraper import WowheadScraper
+
+
+@pytest.fixture
+def scraper():
+    return WowheadScraper(item_store=ItemStore(":memory:"))
+
 
 @pytest.fixture
 def sample_html_with_mapping():
@@ -18,26 +21,31 @@ def sample_html_with_mapping():
     </html>
     """
 
+
 @pytest.fixture
 def sample_html_with_markup():
     return """
     WH.markup.printHtml("My [b]Markup[/b] Content", "guide-body");
     """
 
-def test_extract_item_mapping(sample_html_with_mapping):
-    mapping = extract_item_mapping(sample_html_with_mapping)
+
+def test_extract_item_mapping(scraper, sample_html_with_mapping):
+    mapping = scraper._extract_item_mapping(sample_html_with_mapping)
     assert mapping["123"] == "Test Item"
     assert mapping["456"] == "Another Item"
 
-def test_extract_guide_markup(sample_html_with_markup):
-    markup = extract_guide_markup(sample_html_with_markup)
+
+def test_extract_guide_markup(scraper, sample_html_with_markup):
+    markup = scraper._extract_guide_markup(sample_html_with_markup)
     assert markup == "My [b]Markup[/b] Content"
 
-def test_parse_item_link():
-    assert parse_item_link("Some text [item=12345] end") == "12345"
-    assert parse_item_link("No item here") is None
 
-def test_parse_bis_items():
+def test_parse_item_link(scraper):
+    assert scraper._parse_item_link("Some text [item=12345] end") == "12345"
+    assert scraper._parse_item_link("No item here") is None
+
+
+def test_parse_bis_items(scraper):
     markup = """
     [tabs name=bis_items]
     [tab name="Raid"]
@@ -46,10 +54,10 @@ def test_parse_bis_items():
     [/tabs]
     """
     mapping = {"100": "Raid Helm"}
-    result = parse_bis_items(markup, mapping)
-    
+    result = scraper._parse_bis_items(markup, mapping)
+
     assert "Raid" in result
-    assert len(result["Raid"]) == 1
-    assert result["Raid"][0]["id"] == "100"
-    assert result["Raid"][0]["name"] == "Raid Helm"
-    assert result["Raid"][0]["slot"] == "Head"
+    assert len(result["Raid"].items) == 1
+    assert result["Raid"].items[0].id == "100"
+    assert result["Raid"].items[0].name == "Raid Helm"
+    assert result["Raid"].items[0].slot == "Head"
@@ -0,0 +1,102 @@
+import requests
+
+from wowrn_scraper.domain.models import (
+    BisList,
+    ScrapingResult,
+    SlotItem,
+    SpecData,
+    TrinketItem,
+    TrinketTierList,
+)
+from wowrn_scraper.infrastructure.item_store import FALLBACK_LOOT_INFO, ItemStore
+from wowrn_scraper.infrastructure.wowdb_scraper import WowdbScraper
+
+DROP_HTML = '<dd class="item-extra">Dropped by <b>Big Boss</b> - Test Raid.</dd>'
+
+
+def make_spec(class_name, spec_name, bis_ids, trinket_ids):
+    return SpecData(
+        class_name=class_name,
+        spec_name=spec_name,
+        bis_lists={
+            "Raid": BisList(
+                context="Raid",
+                items=[SlotItem(id=i, name=f"Item {i}", slot="Head") for i in bis_ids],
+            )
+        },
+        trinket_tier_list=TrinketTierList(
+            tiers={"S": [TrinketItem(id=i, name=i, tier="S") for i in trinket_ids]}
+        ),
+    )
+
+
+def test_enrich_result_fetches_each_item_once(tmp_path, monkeypatch):
+    scraper = WowdbScraper(
+        item_store=ItemStore(str(tmp_path / "items.sqlite3")),
+        batch_size=2,
+        batch_delay=0,
+    )
+    fetched = []
+
+    def fake_fetch(item_id):
+        fetched.append(item_id)
+        return DROP_HTML
+
+    monkeypatch.setattr(scraper, "_fetch_item_page", fake_fetch)
+
+    result = ScrapingResult()
+    result.add_spec_data(make_spec("mage", "fire", ["1", "2"], ["10", "11"]))
+    result.add_spec_data(make_spec("mage", "frost", ["2", "3"], ["10"]))
+    result.add_spec_data(make_spec("priest", "shadow", ["1"], ["11", "12"]))
+
+    scraper.enrich_result(result)
+
+    assert sorted(fetched) == ["1", "10", "11", "12", "2", "3"]
+    for specs in result.specs.values():
+        for spec_data in specs.values():
+            items = spec_data.bis_lists["Raid"].items
+            items += spec_data.trinket_tier_list.tiers["S"]
+            for item in items:
+                assert item.boss_name == "Big Boss"
+                assert item.location_name == "Test Raid"
+    assert result.specs["mage"]["fire"].trinket_tier_list.tiers["S"][0].tier == "S"
+
+
+def test_enrich_spec_reuses_store_across_specs(tmp_path, monkeypatch):
+    scraper = WowdbScraper(item_store=ItemStore(":memory:"), batch_delay=0)
+    fetched = []
+    monkeypatch.setattr(
+        scraper, "_fetch_item_page", lambda i: fetched.append(i) or DROP_HTML
+    )
+    fire = make_spec("mage", "fire", ["1", "2"], ["10"])
+    frost = make_spec("mage", "frost", ["2"], ["10", "11"])
+    reused = make_spec("mage", "arcane", ["1"], ["11"])
+    reused.reused = True
+
+    for spec_data in (fire, frost, reused):
+        scraper.enrich_spec(spec_data)
+
+    assert fetched == ["1", "2", "10", "11"]
+    assert frost.bis_lists["Raid"].items[0].boss_name == "Big Boss"
+    assert reused.bis_lists["Raid"].items[0].boss_name == "Big Boss"
+
+
+def test_fallback_loot_is_resolved_again(monkeypatch):
+    scraper = WowdbScraper(item_store=ItemStore(":memory:"), batch_delay=0)
+    pages = {"1": DROP_HTML}
+
+    def fetch(item_id):
+        if item_id not in pages:
+            raise requests.ConnectionError("WoWDB is down")
+        return pages[item_id]
+
+    monkeypatch.setattr(scraper, "_fetch_item_page", fetch)
+    spec_data = make_spec("mage", "fire", ["1", "2"], [])
+    scraper.enrich_spec(spec_data)
+    items = spec_data.bis_lists["Raid"].items
+    assert items[1].source_type == FALLBACK_LOOT_INFO["source_type"]
+
+    pages["2"] = DROP_HTML
+    scraper.enrich_spec(spec_data)
+
+    assert [item.boss_name for item in items] == ["Big Boss", "Big Boss"]